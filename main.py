@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 
 from PyQt5.QtWidgets import QApplication
@@ -13,4 +14,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Замеры выполняются в дочерних процессах, собранному exe это нужно для их запуска
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,588 @@
+from concurrent.futures import ThreadPoolExecutor
+from heapq import merge
+
+
+class AVLNode:
+    """Узел с дополнениями поддерева: size - число ключей, total - их сумма (если дерево её ведёт)."""
+
+    __slots__ = ("key", "height", "size", "total", "left", "right")
+
+    def __init__(self, key, total=0):
+        self.key = key
+        self.height = 1
+        self.size = 1
+        self.total = total
+        self.left = None
+        self.right = None
+
+
+def unique_sorted(keys):
+    """Ключи по возрастанию без повторов; уже строго возрастающая последовательность не сортируется."""
+    keys = list(keys)
+    if all(a < b for a, b in zip(keys, keys[1:])):
+        return keys
+    result = []
+    for key in sorted(keys):
+        if not result or result[-1] != key:
+            result.append(key)
+    return result
+
+
+class AVLTree:
+    """
+    AVL-дерево без рекурсии: вставка и удаление запоминают путь от корня в стеке и
+    балансируют предков снизу вверх, останавливаясь на первом, чья высота не изменилась, -
+    выше этого узла баланс не нарушен. rotation_count считает одиночные повороты
+    (двойной поворот - два), как и раньше.
+
+    Каждый узел хранит размер поддерева, а при track_sum=True и сумму его ключей: на них
+    основаны rank, select, count_range и sum_range за O(log n).
+    """
+
+    def __init__(self, keys=(), track_sum=False):
+        self.root = None
+        self.rotation_count = 0
+        self.count = 0
+        self.track_sum = track_sum
+        if keys:
+            self.insert_many(keys)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def new_node(self, key):
+        return AVLNode(key, key if self.track_sum else 0)
+
+    def contains(self, key):
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return True
+        return False
+
+    __contains__ = contains
+
+    def count_less(self, key, inclusive=False):
+        """Число ключей меньше key (при inclusive=True - не больше key)."""
+        result = 0
+        node = self.root
+        while node is not None:
+            if key < node.key or (key == node.key and not inclusive):
+                node = node.left
+            else:
+                result += 1 + (node.left.size if node.left else 0)
+                node = node.right
+        return result
+
+    def sum_less(self, key, inclusive=False):
+        """Сумма ключей меньше key (при inclusive=True - не больше key)."""
+        if not self.track_sum:
+            raise ValueError("Суммы поддеревьев не ведутся: создайте дерево с track_sum=True")
+        result = 0
+        node = self.root
+        while node is not None:
+            if key < node.key or (key == node.key and not inclusive):
+                node = node.left
+            else:
+                result += node.key + (node.left.total if node.left else 0)
+                node = node.right
+        return result
+
+    def rank(self, key):
+        """Число ключей меньше key, то есть позиция key в отсортированном порядке, если он есть в дереве."""
+        return self.count_less(key)
+
+    def select(self, index):
+        """Ключ с номером index (с нуля) в порядке возрастания."""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("Номер ключа вне дерева")
+        node = self.root
+        while True:
+            left_size = node.left.size if node.left else 0
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node.key
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    def count_range(self, low, high):
+        """Число ключей в отрезке [low, high]."""
+        if high < low:
+            return 0
+        return self.count_less(high, inclusive=True) - self.count_less(low)
+
+    def sum_range(self, low, high):
+        """Сумма ключей в отрезке [low, high]; требует track_sum=True."""
+        if high < low:
+            return 0
+        return self.sum_less(high, inclusive=True) - self.sum_less(low)
+
+    def iter_range(self, low=None, high=None):
+        """
+        Ключи из [low, high] по возрастанию (None - без границы), лениво: стек хранит
+        только путь до текущего узла, и поддеревья вне отрезка не посещаются.
+        """
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if low is not None and node.key < low:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if high is not None and node.key > high:
+                return
+            yield node.key
+            node = node.right
+
+    def height(self):
+        return self.root.height if self.root else 0
+
+    def get_height(self, node):
+        return node.height if node else 0
+
+    def update_height(self, node):
+        if node:
+            node.height = max(self.get_height(node.left), self.get_height(node.right)) + 1
+
+    def update_node(self, node):
+        """Пересчитывает высоту и дополнения узла по его сыновьям."""
+        left, right = node.left, node.right
+        left_height = left.height if left else 0
+        right_height = right.height if right else 0
+        node.height = (left_height if left_height > right_height else right_height) + 1
+        node.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+        if self.track_sum:
+            node.total = node.key + (left.total if left else 0) + (right.total if right else 0)
+
+    def get_balance(self, node):
+        return self.get_height(node.left) - self.get_height(node.right) if node else 0
+
+    def left_rotate(self, z):
+        y = z.right
+        T2 = y.left
+        y.left = z
+        z.right = T2
+        self.update_node(z)
+        self.update_node(y)
+        self.rotation_count += 1
+        return y
+
+    def right_rotate(self, z):
+        y = z.left
+        T3 = y.right
+        y.right = z
+        z.left = T3
+        self.update_node(z)
+        self.update_node(y)
+        self.rotation_count += 1
+        return y
+
+    def balance(self, node):
+        self.update_node(node)
+        balance = self.get_balance(node)
+
+        if balance > 1 and self.get_balance(node.left) >= 0:
+            return self.right_rotate(node)
+
+        if balance > 1 and self.get_balance(node.left) < 0:
+            node.left = self.left_rotate(node.left)
+            return self.right_rotate(node)
+
+        if balance < -1 and self.get_balance(node.right) <= 0:
+            return self.left_rotate(node)
+
+        if balance < -1 and self.get_balance(node.right) > 0:
+            node.right = self.right_rotate(node.right)
+            return self.left_rotate(node)
+
+        return node
+
+    def rebalance_path(self, path):
+        """
+        Восстанавливает высоты и баланс узлов path (от корня к месту изменения) снизу вверх.
+        Как только высота поддерева не изменилась, предки уже сбалансированы: у оставшихся
+        узлов пути пересчитываются только дополнения (размер и сумма).
+        """
+        index = len(path) - 1
+        while index >= 0:
+            node = path[index]
+            old_height = node.height
+            left_height = node.left.height if node.left else 0
+            right_height = node.right.height if node.right else 0
+            index -= 1
+
+            if -1 <= left_height - right_height <= 1:
+                self.update_node(node)
+                if node.height == old_height:
+                    break
+                continue
+
+            subtree = self.balance(node)
+            if index < 0:
+                self.root = subtree
+            elif path[index].left is node:
+                path[index].left = subtree
+            else:
+                path[index].right = subtree
+            if subtree.height == old_height:
+                break
+
+        for node in reversed(path[:index + 1]):
+            left, right = node.left, node.right
+            node.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+            if self.track_sum:
+                node.total = node.key + (left.total if left else 0) + (right.total if right else 0)
+
+    def insert_key(self, key):
+        node = self.root
+        if node is None:
+            self.root = self.new_node(key)
+            self.count = 1
+            return
+
+        path = []
+        while node is not None:
+            path.append(node)
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return
+
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = self.new_node(key)
+        else:
+            parent.right = self.new_node(key)
+        self.count += 1
+        self.rebalance_path(path)
+
+    def find_min(self, node):
+        current = node
+        while current.left is not None:
+            current = current.left
+        return current
+
+    def delete_key(self, key):
+        path = []
+        node = self.root
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        if node is None:
+            return
+
+        if node.left is not None and node.right is not None:
+            # Ключ заменяется преемником, а удаляется узел преемника - у него нет левого сына
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.key = successor.key
+            node = successor
+
+        child = node.left if node.left is not None else node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self.count -= 1
+        self.rebalance_path(path)
+
+    def build_sorted(self, keys):
+        """Заменяет содержимое идеально сбалансированным деревом из строго возрастающих keys за O(n), без поворотов."""
+        def build(low, high):
+            if low >= high:
+                return None
+            middle = (low + high) // 2
+            node = self.new_node(keys[middle])
+            node.left = build(low, middle)
+            node.right = build(middle + 1, high)
+            self.update_node(node)
+            return node
+
+        # Глубина рекурсии - высота дерева, то есть O(log n)
+        self.root = build(0, len(keys))
+        self.count = len(keys)
+
+    def prefers_rebuild(self, batch):
+        """Перестройка за O(n + m) выгоднее m операций по O(log(n + m)), если пакет не слишком мал."""
+        total = self.count + batch
+        return batch * total.bit_length() >= total
+
+    def insert_many(self, keys):
+        """
+        Пакетная вставка. Пустое дерево или крупный пакет строятся слиянием отсортированных
+        ключей дерева и пакета за O(n + m) (для уже отсортированного пакета - без сортировки);
+        небольшой пакет вставляется по одному ключу.
+        """
+        keys = unique_sorted(keys)
+        if not self.prefers_rebuild(len(keys)):
+            for key in keys:
+                self.insert_key(key)
+            return
+        if self.root is not None:
+            keys = unique_sorted(merge(self, keys))
+        self.build_sorted(keys)
+
+    def delete_many(self, keys):
+        """Пакетное удаление: крупный пакет - отбором оставшихся ключей и перестройкой за O(n + m)."""
+        keys = unique_sorted(keys)
+        if not self.prefers_rebuild(len(keys)):
+            for key in keys:
+                self.delete_key(key)
+            return
+
+        remaining = []
+        index = 0
+        for key in self:
+            while index < len(keys) and keys[index] < key:
+                index += 1
+            if index == len(keys) or keys[index] != key:
+                remaining.append(key)
+        self.build_sorted(remaining)
+
+    # Операции над множествами на основе join (Blelloch, Ferizovic, Sun: "Just Join for Parallel
+    # Ordered Sets"): всё сводится к слиянию двух деревьев через разделяющий узел, и объединение
+    # деревьев размеров m <= n стоит O(m log(n/m + 1)). Операции переиспользуют узлы деревьев-
+    # аргументов, поэтому забирают их содержимое: после вызова второе дерево пусто.
+
+    def join_nodes(self, left, node, right):
+        """Дерево из left, узла node и right, если все ключи left < node.key < все ключи right."""
+        left_height = left.height if left else 0
+        right_height = right.height if right else 0
+        if left_height > right_height + 1:
+            return self._join_right(left, node, right)
+        if right_height > left_height + 1:
+            return self._join_left(left, node, right)
+        node.left = left
+        node.right = right
+        self.update_node(node)
+        return node
+
+    def _join_right(self, left, node, right):
+        """Спуск по правому краю более высокого left до поддерева высоты right (+1)."""
+        child = left.right
+        if self.get_height(child) <= self.get_height(right) + 1:
+            node.left = child
+            node.right = right
+            self.update_node(node)
+            if node.height <= self.get_height(left.left) + 1:
+                left.right = node
+                self.update_node(left)
+                return left
+            left.right = self.right_rotate(node)
+            return self.left_rotate(left)
+
+        left.right = self._join_right(child, node, right)
+        if left.right.height <= self.get_height(left.left) + 1:
+            self.update_node(left)
+            return left
+        return self.left_rotate(left)
+
+    def _join_left(self, left, node, right):
+        child = right.left
+        if self.get_height(child) <= self.get_height(left) + 1:
+            node.left = left
+            node.right = child
+            self.update_node(node)
+            if node.height <= self.get_height(right.right) + 1:
+                right.left = node
+                self.update_node(right)
+                return right
+            right.left = self.left_rotate(node)
+            return self.right_rotate(right)
+
+        right.left = self._join_left(left, node, child)
+        if right.left.height <= self.get_height(right.right) + 1:
+            self.update_node(right)
+            return right
+        return self.right_rotate(right)
+
+    def split_nodes(self, node, key):
+        """(ключи < key, узел с key или None, ключи > key); глубина рекурсии - высота дерева."""
+        if node is None:
+            return None, None, None
+        left, right = node.left, node.right
+        if key == node.key:
+            return left, node, right
+        if key < node.key:
+            low, found, high = self.split_nodes(left, key)
+            return low, found, self.join_nodes(high, node, right)
+        low, found, high = self.split_nodes(right, key)
+        return self.join_nodes(left, node, low), found, high
+
+    def split_last(self, node):
+        """(дерево без наибольшего ключа, узел наибольшего ключа)."""
+        if node.right is None:
+            return node.left, node
+        rest, last = self.split_last(node.right)
+        return self.join_nodes(node.left, node, rest), last
+
+    def join_pair(self, left, right):
+        """Слияние деревьев без разделяющего ключа: все ключи left меньше ключей right."""
+        if left is None:
+            return right
+        rest, last = self.split_last(left)
+        return self.join_nodes(rest, last, right)
+
+    def union_nodes(self, first, second):
+        if first is None:
+            return second
+        if second is None:
+            return first
+        low, _, high = self.split_nodes(first, second.key)
+        left = self.union_nodes(low, second.left)
+        right = self.union_nodes(high, second.right)
+        return self.join_nodes(left, second, right)
+
+    def intersection_nodes(self, first, second):
+        if first is None or second is None:
+            return None
+        low, found, high = self.split_nodes(first, second.key)
+        left = self.intersection_nodes(low, second.left)
+        right = self.intersection_nodes(high, second.right)
+        if found is None:
+            return self.join_pair(left, right)
+        return self.join_nodes(left, found, right)
+
+    def difference_nodes(self, first, second):
+        if first is None or second is None:
+            return first
+        low, _, high = self.split_nodes(first, second.key)
+        left = self.difference_nodes(low, second.left)
+        right = self.difference_nodes(high, second.right)
+        return self.join_pair(left, right)
+
+    def with_root(self, root):
+        """Новое дерево с теми же настройками и корнем root."""
+        tree = AVLTree(track_sum=self.track_sum)
+        tree.root = root
+        tree.count = root.size if root else 0
+        return tree
+
+    def take_root(self, other):
+        """Забирает корень other (other становится пустым), проверив совместимость деревьев."""
+        if other.track_sum != self.track_sum:
+            raise ValueError("Деревья должны одинаково вести суммы поддеревьев (track_sum)")
+        root = other.root
+        other.root = None
+        other.count = 0
+        return root
+
+    def set_root(self, root):
+        self.root = root
+        self.count = root.size if root else 0
+
+    def join(self, key, other):
+        """Дописывает key и ключи other к дереву за O(|h1 - h2| + 1); требует self < key < other."""
+        if (self.root is not None and self.select(-1) >= key) or (other.root is not None and other.select(0) <= key):
+            raise ValueError("join требует, чтобы ключи дерева были меньше key, а ключи other - больше")
+        right = self.take_root(other)
+        self.set_root(self.join_nodes(self.root, self.new_node(key), right))
+
+    def split(self, key):
+        """(дерево ключей < key, есть ли key, дерево ключей > key) за O(log n); само дерево становится пустым."""
+        low, found, high = self.split_nodes(self.take_root(self), key)
+        return self.with_root(low), found is not None, self.with_root(high)
+
+    def operate_nodes(self, operation, first, second):
+        if operation != "difference" and first is not None and second is not None and first.size < second.size:
+            # Объединение и пересечение симметричны: рекурсия идёт по узлам второго дерева,
+            # и оно должно быть меньшим - тогда большее делится всего m раз
+            first, second = second, first
+        return getattr(self, SET_OPERATIONS[operation])(first, second)
+
+    def set_operation(self, other, operation, workers=None):
+        """
+        self = self <operation> other, где operation - "union", "intersection" или "difference".
+        При workers > 1 независимые части деревьев обрабатываются параллельно (см. parallel_set_operation).
+        """
+        if operation not in SET_OPERATIONS:
+            raise ValueError(f"Неизвестная операция над множествами: {operation}")
+        if workers is not None and workers > 1:
+            parallel_set_operation(self, other, operation, workers)
+            return
+        second = self.take_root(other)
+        self.set_root(self.operate_nodes(operation, self.take_root(self), second))
+
+    def union_update(self, other, workers=None):
+        self.set_operation(other, "union", workers)
+
+    def intersection_update(self, other, workers=None):
+        self.set_operation(other, "intersection", workers)
+
+    def difference_update(self, other, workers=None):
+        self.set_operation(other, "difference", workers)
+
+
+SET_OPERATIONS = {"union": "union_nodes", "intersection": "intersection_nodes", "difference": "difference_nodes"}
+
+
+def pivot_node(operation, first_found, second_found):
+    """Узел разделителя, если его ключ входит в результат операции, иначе None."""
+    if operation == "union":
+        return first_found or second_found
+    if operation == "intersection":
+        return first_found if second_found is not None else None
+    return first_found if second_found is None else None
+
+
+def parallel_set_operation(first, second, operation, workers):
+    """
+    Параллельная операция: workers - 1 разделителей (квантили большего дерева) режут оба
+    дерева split-ами за O(workers log n) на независимые пары поддеревьев, пары обрабатываются
+    в пуле из workers потоков, а результаты сшиваются join-ами через разделители.
+    Узлы не копируются и не сериализуются. Под GIL потоки чистого Python не ускоряют работу;
+    выигрыш появляется в сборках CPython без GIL (3.13t). Пул процессов здесь проигрывает:
+    передача частей между процессами стоит O(n) и дороже самой операции.
+    """
+    larger = first if len(first) >= len(second) else second
+    if len(larger) < workers:
+        first.set_operation(second, operation)
+        return
+    pivots = sorted({larger.select(len(larger) * index // workers) for index in range(1, workers)})
+
+    first_root = first.take_root(first)
+    second_root = first.take_root(second)
+    parts = []
+    pivot_nodes = []
+    for pivot in pivots:
+        first_low, first_found, first_root = first.split_nodes(first_root, pivot)
+        second_low, second_found, second_root = first.split_nodes(second_root, pivot)
+        parts.append((first_low, second_low))
+        pivot_nodes.append(pivot_node(operation, first_found, second_found))
+    parts.append((first_root, second_root))
+
+    # У каждой задачи своё вспомогательное дерево, чтобы счётчики поворотов не делились между потоками
+    helpers = [AVLTree(track_sum=first.track_sum) for _ in parts]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda helper, part: helper.operate_nodes(operation, *part), helpers, parts
+        ))
+
+    root = results[0]
+    for node, part_root in zip(pivot_nodes, results[1:]):
+        root = first.join_nodes(root, node, part_root) if node is not None else first.join_pair(root, part_root)
+    first.rotation_count += sum(helper.rotation_count for helper in helpers)
+    first.set_root(root)
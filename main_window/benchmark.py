@@ -0,0 +1,138 @@
+import gc
+import tracemalloc
+from statistics import median, quantiles
+from time import perf_counter_ns
+
+NANOSECONDS = 1_000_000_000
+
+
+class Measurement:
+    """Результат замера: время одного вызова в секундах для каждого повтора."""
+
+    def __init__(self, samples, loops=1):
+        self.samples = sorted(samples)
+        self.loops = loops
+
+    @property
+    def min(self):
+        return self.samples[0]
+
+    @property
+    def median(self):
+        return median(self.samples)
+
+    @property
+    def quartiles(self):
+        if len(self.samples) < 2:
+            return self.samples[0], self.samples[0]
+        first, _, third = quantiles(self.samples, n=4, method="inclusive")
+        return first, third
+
+    @property
+    def iqr(self):
+        first, third = self.quartiles
+        return third - first
+
+    def __str__(self):
+        return (
+            f"{format_time(self.median)} (мин. {format_time(self.min)}, IQR {format_time(self.iqr)}, "
+            f"повторов {len(self.samples)} x {self.loops})"
+        )
+
+
+def format_time(seconds):
+    for unit, scale in (("с", 1), ("мс", 1e-3), ("мкс", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds * NANOSECONDS:.0f} нс"
+
+
+def time_loops(function, arguments, loops):
+    """Время loops вызовов function(*arguments) в наносекундах."""
+    start = perf_counter_ns()
+    for _ in range(loops):
+        function(*arguments)
+    return perf_counter_ns() - start
+
+
+def calibrate_loops(function, arguments=(), min_time=0.01, max_loops=1_000_000):
+    """Число вызовов в одном повторе, при котором повтор длится не меньше min_time секунд."""
+    loops = 1
+    while loops < max_loops:
+        elapsed = time_loops(function, arguments, loops)
+        if elapsed >= min_time * NANOSECONDS:
+            break
+        if elapsed > 0:
+            loops = min(max_loops, max(loops * 2, int(loops * min_time * NANOSECONDS / elapsed * 1.2)))
+        else:
+            loops *= 10
+    return loops
+
+
+def prepare_arguments(setup, arguments):
+    if setup is None:
+        return arguments
+    prepared = setup()
+    return arguments if prepared is None else prepared
+
+
+def measure(function, arguments=(), setup=None, warmup=1, repeat=5, min_time=0.01, time_budget=10.0):
+    """
+    Замер function(*arguments): warmup прогревочных вызовов, затем repeat повторов с выключенным GC.
+    Для быстрых функций число вызовов в повторе подбирается через calibrate_loops.
+    Если задан setup, он вызывается перед каждым повтором вне замера (и может вернуть новые
+    аргументы вместо arguments), а повтор состоит из одного вызова.
+    Повторы, не помещающиеся в time_budget секунд, отбрасываются; если даже прогревочный вызов
+    длиннее time_budget, он и становится единственным замером.
+    """
+    gc_enabled = gc.isenabled()
+    try:
+        elapsed = None
+        for _ in range(warmup):
+            warmup_arguments = prepare_arguments(setup, arguments)
+            gc.disable()
+            elapsed = time_loops(function, warmup_arguments, 1)
+            if gc_enabled:
+                gc.enable()
+
+        if elapsed is not None and elapsed >= time_budget * NANOSECONDS:
+            return Measurement([elapsed / NANOSECONDS])
+
+        loops = 1
+        if setup is None and (elapsed is None or elapsed < min_time * NANOSECONDS):
+            loops = calibrate_loops(function, arguments, min_time)
+        if elapsed is not None:
+            repeat = max(1, min(repeat, int(time_budget * NANOSECONDS // max(elapsed * loops, 1))))
+
+        samples = []
+        for _ in range(repeat):
+            sample_arguments = prepare_arguments(setup, arguments)
+            gc.collect()
+            gc.disable()
+            samples.append(time_loops(function, sample_arguments, loops) / loops / NANOSECONDS)
+            if gc_enabled:
+                gc.enable()
+        return Measurement(samples, loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def measure_memory(function, arguments=()):
+    """
+    Прирост выделенной памяти в байтах после function(*arguments) по данным tracemalloc:
+    учитывается только то, что осталось занятым после вызова, а не пиковое потребление.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        before, _ = tracemalloc.get_traced_memory()
+        function(*arguments)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+        return after - before
+    finally:
+        if started:
+            tracemalloc.stop()
@@ -0,0 +1,211 @@
+import multiprocessing
+import os
+import signal
+import time
+from time import perf_counter_ns
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from .benchmark import NANOSECONDS, Measurement, measure
+
+
+class BenchmarkJob:
+    """
+    Один замер: function(*arguments) для точки size на кривой series.
+    prepare(*arguments), если задан, выполняется перед замером и возвращает аргументы для function.
+    При return_value=True function вызывается один раз, а её значение передаётся обратно:
+    так запускаются функции, которые сами проводят замеры и возвращают отчёт.
+    """
+
+    def __init__(self, series, size, function, arguments=(), prepare=None, return_value=False):
+        self.series = series
+        self.size = size
+        self.function = function
+        self.arguments = arguments
+        self.prepare = prepare
+        self.return_value = return_value
+
+
+class BenchmarkResult:
+    def __init__(self, job, measurement=None, value=None, error=None):
+        self.job = job
+        self.measurement = measurement
+        self.value = value
+        self.error = error
+
+
+TIMEOUT_ERROR = "превышено время ожидания"
+CANCELLED_ERROR = "отменено"
+CRASH_ERROR = "процесс замера завершился аварийно"
+
+
+def run_job(job, repeat):
+    """Выполнение замера в дочернем процессе. Возвращает (Measurement, значение, ошибка)."""
+    try:
+        arguments = job.prepare(*job.arguments) if job.prepare else job.arguments
+        if job.return_value:
+            start = perf_counter_ns()
+            value = job.function(*arguments)
+            return Measurement([(perf_counter_ns() - start) / NANOSECONDS]), value, None
+        return measure(job.function, arguments, repeat=repeat), None, None
+    except Exception as error:
+        return None, None, f"{type(error).__name__}: {error}"
+
+
+def serve_jobs(connection):
+    """
+    Цикл дочернего процесса: получает пары (задание, число повторов), пока не придёт None
+    или не закроется канал. Процесс становится лидером своей группы, чтобы при таймауте
+    вместе с ним завершались и запущенные замером процессы (например, пул ProcessPoolExecutor).
+    """
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        connection.send(run_job(*task))
+
+
+class BenchmarkWorker(QObject):
+    """
+    Выполняет задания по очереди в отдельном процессе, чтобы зависший замер можно было прервать.
+    Процесс переиспользуется между заданиями и перезапускается только после таймаута или отмены.
+    """
+
+    result_ready = pyqtSignal(object)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, jobs, timeout=None, repeat=5):
+        super().__init__()
+        self.jobs = jobs
+        self.timeout = timeout
+        self.repeat = repeat
+        self.cancelled = False
+        self.context = multiprocessing.get_context("spawn")
+        self.process = None
+        self.connection = None
+
+    def cancel(self):
+        self.cancelled = True
+
+    def start_process(self):
+        connection, child_connection = self.context.Pipe()
+        # Не демон: демоническим процессам нельзя запускать свои дочерние процессы
+        process = self.context.Process(target=serve_jobs, args=(child_connection,))
+        try:
+            process.start()
+        finally:
+            child_connection.close()
+        self.process, self.connection = process, connection
+
+    def stop_process(self, kill=False):
+        if self.process is None:
+            return
+        if not kill:
+            try:
+                self.connection.send(None)
+            except OSError:
+                kill = True
+        if kill:
+            self.kill_process()
+        self.process.join()
+        self.connection.close()
+        self.process = None
+        self.connection = None
+
+    def kill_process(self):
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+                return
+            except OSError:
+                # Группа ещё не создана: процесс не успел вызвать setpgrp
+                pass
+        self.process.terminate()
+
+    def wait_for_result(self):
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        while not self.cancelled:
+            try:
+                if self.connection.poll(self.POLL_INTERVAL):
+                    return self.connection.recv()
+            except (EOFError, OSError):
+                return None, None, CRASH_ERROR
+            if not self.process.is_alive():
+                return None, None, CRASH_ERROR
+            if deadline is not None and time.monotonic() > deadline:
+                return None, None, TIMEOUT_ERROR
+        return None, None, CANCELLED_ERROR
+
+    def run(self):
+        try:
+            for index, job in enumerate(self.jobs):
+                if self.cancelled:
+                    break
+                try:
+                    if self.process is None:
+                        self.start_process()
+                    self.connection.send((job, self.repeat))
+                except Exception as error:
+                    self.result_ready.emit(BenchmarkResult(job, error=f"{type(error).__name__}: {error}"))
+                    self.stop_process(kill=True)
+                    break
+
+                measurement, value, error = self.wait_for_result()
+                if error in (TIMEOUT_ERROR, CANCELLED_ERROR, CRASH_ERROR):
+                    self.stop_process(kill=True)
+
+                self.result_ready.emit(BenchmarkResult(job, measurement, value, error))
+                self.progress.emit(index + 1, len(self.jobs))
+        finally:
+            self.stop_process(kill=self.cancelled)
+            self.finished.emit()
+
+
+class BenchmarkExecutor(QObject):
+    """
+    Запуск замеров в фоновом потоке с передачей результатов в интерфейс через сигналы.
+    Одновременно выполняется только один набор заданий.
+    """
+
+    result_ready = pyqtSignal(object)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread = None
+        self.worker = None
+
+    def is_running(self):
+        return self.thread is not None and self.thread.isRunning()
+
+    def start(self, jobs, timeout=None, repeat=5):
+        if self.is_running():
+            return False
+
+        self.thread = QThread()
+        self.worker = BenchmarkWorker(jobs, timeout, repeat)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.result_ready.connect(self.result_ready)
+        self.worker.progress.connect(self.progress)
+        self.worker.finished.connect(self.thread.quit)
+        self.thread.finished.connect(self.finished)
+        self.thread.start()
+        return True
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def wait(self):
+        if self.thread is not None:
+            self.thread.wait()
@@ -0,0 +1,431 @@
+from time import perf_counter
+
+import numpy as np
+
+# Числа хранятся как массивы NumPy uint8 с лимбами по основанию 2**8, младший лимб первый.
+# Промежуточные результаты - свёртки лимбов (коэффициенты int64 без переносов):
+# при 8-битных лимбах они не переполняют int64 даже для чисел в десятки миллионов цифр.
+# Переносы выполняются один раз, при обратном преобразовании в int.
+LIMB_BITS = 8
+# Размер коэффициента свёртки (int64), а не лимба
+COEFFICIENT_BYTES = np.dtype(np.int64).itemsize
+KARATSUBA_LIMB_CUTOFF = 256
+# Пороги автоматического выбора алгоритма (в лимбах меньшего множителя), см. tune_multiplication_thresholds
+TOOM3_LIMB_THRESHOLD = 2000
+NTT_LIMB_THRESHOLD = 8000
+
+
+def int_to_limbs(x):
+    """Неотрицательное целое в массив лимбов (без копирования байтов)."""
+    return np.frombuffer(x.to_bytes(max(1, (x.bit_length() + 7) // 8), "little"), dtype=np.uint8)
+
+
+def limbs_to_int(limbs):
+    return int.from_bytes(np.ascontiguousarray(limbs, dtype=np.uint8).tobytes(), "little")
+
+
+def coefficients_to_int(coefficients, digit_bytes=1):
+    """
+    Перевод свёртки цифр по основанию 2**(8 * digit_bytes) в int с выполнением всех переносов.
+    Каждый коэффициент раскладывается на байты; группы байтов одного разряда образуют обычное число,
+    и результат - сумма нескольких таких чисел со сдвигами, то есть линейное время.
+    Коэффициенты должны быть неотрицательными.
+    """
+    planes = np.ascontiguousarray(coefficients, dtype="<i8").view(np.uint8).reshape(-1, COEFFICIENT_BYTES)
+    result = 0
+    for byte in range(0, COEFFICIENT_BYTES, digit_bytes):
+        plane = np.ascontiguousarray(planes[:, byte:byte + digit_bytes])
+        result += int.from_bytes(plane.tobytes(), "little") << (LIMB_BITS * byte)
+    return result
+
+
+def schoolbook_limbs(a, b):
+    """Умножение «в столбик»: свёртка лимбов a и b."""
+    return np.convolve(a.astype(np.int64), b.astype(np.int64))
+
+
+def add_polynomials(x, y):
+    if len(x) < len(y):
+        x, y = y, x
+    result = x.astype(np.int64)
+    result[:len(y)] += y
+    return result
+
+
+def karatsuba_limbs(a, b, cutoff=KARATSUBA_LIMB_CUTOFF):
+    """
+    Алгоритм Карацубы над срезами массивов лимбов.
+    Возвращает свёртку a и b; блоки короче cutoff лимбов умножаются schoolbook_limbs.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) <= cutoff:
+        return schoolbook_limbs(a, b)
+
+    m = len(a) // 2
+    a0, a1 = a[:m], a[m:]
+    if len(b) <= m:
+        low = karatsuba_limbs(a0, b, cutoff)
+        high = karatsuba_limbs(a1, b, cutoff)
+        result = np.zeros(len(a) + len(b) - 1, dtype=np.int64)
+        result[:len(low)] += low
+        result[m:m + len(high)] += high
+        return result
+
+    b0, b1 = b[:m], b[m:]
+    z0 = karatsuba_limbs(a0, b0, cutoff)
+    z2 = karatsuba_limbs(a1, b1, cutoff)
+    z1 = karatsuba_limbs(add_polynomials(a0, a1), add_polynomials(b0, b1), cutoff)
+    return combine_karatsuba(z0, z1, z2, m, len(a) + len(b) - 1)
+
+
+def karatsuba_square_limbs(a, cutoff=KARATSUBA_LIMB_CUTOFF):
+    """
+    Возведение в квадрат алгоритмом Карацубы: три квадрата половин вместо трёх произведений,
+    без разбиения и сложения второго множителя.
+    """
+    if len(a) <= cutoff:
+        return schoolbook_limbs(a, a)
+    m = len(a) // 2
+    a0, a1 = a[:m], a[m:]
+    z0 = karatsuba_square_limbs(a0, cutoff)
+    z2 = karatsuba_square_limbs(a1, cutoff)
+    z1 = karatsuba_square_limbs(add_polynomials(a0, a1), cutoff)
+    return combine_karatsuba(z0, z1, z2, m, 2 * len(a) - 1)
+
+
+def combine_karatsuba(z0, z1, z2, m, length):
+    """Сборка свёртки длины length из произведений z0 = a0*b0, z1 = (a0+a1)*(b0+b1), z2 = a1*b1."""
+    result = np.zeros(length, dtype=np.int64)
+    result[:len(z0)] += z0
+    result[2 * m:2 * m + len(z2)] += z2
+    result[m:m + len(z1)] += z1[:length - m]
+    result[m:m + len(z0)] -= z0
+    result[m:m + len(z2)] -= z2
+    return result
+
+
+def signed_product(x, y, multiply_limbs):
+    if x == 0 or y == 0:
+        return 0
+    product = coefficients_to_int(multiply_limbs(int_to_limbs(abs(x)), int_to_limbs(abs(y))))
+    return -product if (x < 0) != (y < 0) else product
+
+
+def limb_schoolbook_multiplication(x, y):
+    """Умножение «в столбик» над лимбами; int преобразуются в лимбы и обратно только здесь."""
+    return signed_product(x, y, schoolbook_limbs)
+
+
+def limb_karatsuba_multiplication(x, y):
+    """Алгоритм Карацубы над лимбами; int преобразуются в лимбы и обратно только здесь."""
+    return signed_product(x, y, karatsuba_limbs)
+
+
+def limb_karatsuba_square(x):
+    return coefficients_to_int(karatsuba_square_limbs(int_to_limbs(abs(x)))) if x else 0
+
+
+def toom3_product(x, y, threshold=None):
+    """
+    Алгоритм Тоома-Кука 3: 5 умножений третей вместо 9. Точки 0, 1, -1, -2, бесконечность,
+    интерполяция по схеме Бодрато. Части выделяются сдвигами и масками, а вычисление в точках
+    и интерполяция выполняются над int за линейное время: деление на 2 и 3 здесь точное для чисел,
+    но не для отдельных коэффициентов свёртки. Множители короче threshold лимбов (и сильно
+    несбалансированные) умножаются алгоритмом Карацубы над лимбами.
+    """
+    if threshold is None:
+        threshold = TOOM3_LIMB_THRESHOLD
+    if x < 0 or y < 0:
+        product = toom3_product(abs(x), abs(y), threshold)
+        return -product if (x < 0) != (y < 0) else product
+    if x.bit_length() < y.bit_length():
+        x, y = y, x
+    k = (x.bit_length() + 2) // 3
+    if y.bit_length() < threshold * LIMB_BITS or y.bit_length() <= 2 * k:
+        return signed_product(x, y, karatsuba_limbs)
+
+    x_points = toom3_evaluate(x, k)
+    y_points = toom3_evaluate(y, k)
+    products = [toom3_product(x_point, y_point, threshold) for x_point, y_point in zip(x_points, y_points)]
+    return toom3_interpolate(products, k)
+
+
+def toom3_square(x, threshold=None):
+    """Квадрат по схеме toom3_product: значения в точках вычисляются один раз и возводятся в квадрат."""
+    if threshold is None:
+        threshold = TOOM3_LIMB_THRESHOLD
+    x = abs(x)
+    if x.bit_length() < threshold * LIMB_BITS:
+        return limb_karatsuba_square(x)
+    k = (x.bit_length() + 2) // 3
+    return toom3_interpolate([toom3_square(point, threshold) for point in toom3_evaluate(x, k)], k)
+
+
+def toom3_evaluate(x, k):
+    """Трети x (по k бит) как многочлен, вычисленный в точках 0, 1, -1, -2, бесконечность."""
+    mask = (1 << k) - 1
+    x0, x1, x2 = x & mask, (x >> k) & mask, x >> (2 * k)
+    p0 = x0 + x2
+    m1 = p0 - x1
+    return x0, p0 + x1, m1, ((m1 + x2) << 1) - x0, x2
+
+
+def toom3_interpolate(products, k):
+    """Интерполяция по схеме Бодрато: произведение из значений в тех же пяти точках."""
+    r0, r1, rm1, rm2, rinf = products
+    r3 = (rm2 - r1) // 3
+    r1 = (r1 - rm1) >> 1
+    r2 = rm1 - r0
+    r3 = ((r2 - r3) >> 1) + (rinf << 1)
+    r2 = r2 + r1 - rinf
+    r1 = r1 - r3
+    return r0 + (r1 << k) + (r2 << (2 * k)) + (r3 << (3 * k)) + (rinf << (4 * k))
+
+
+# Простые вида c * 2**k + 1 и их первообразные корни для теоретико-числового преобразования:
+# 469762049 = 7 * 2**26 + 1 и 167772161 = 5 * 2**25 + 1. Их произведение (~2**56) помещается в int64
+NTT_PRIMES = ((469762049, 3), (167772161, 3))
+NTT_DIGIT_BYTES = 2
+# Наибольшая длина преобразования: корень порядка n по модулю p существует, только если n делит p - 1
+NTT_MAX_SIZE = min((prime - 1) & -(prime - 1) for prime, _ in NTT_PRIMES)
+# Наибольшая длина меньшего множителя в цифрах: коэффициенты свёртки не больше
+# min(len(a), len(b)) * (2**16 - 1)**2 и должны быть меньше произведения модулей
+NTT_MAX_DIGITS = (NTT_PRIMES[0][0] * NTT_PRIMES[1][0] - 1) // ((1 << (8 * NTT_DIGIT_BYTES)) - 1) ** 2
+_ntt_twiddles = {}
+
+
+def ntt_twiddles(prime, root, half, inverse):
+    """Степени корня порядка 2 * half по модулю prime (кешируются)."""
+    key = (prime, half, inverse)
+    if key not in _ntt_twiddles:
+        w = pow(root, (prime - 1) // (2 * half), prime)
+        if inverse:
+            w = pow(w, prime - 2, prime)
+        powers = np.ones(1, dtype=np.int64)
+        while len(powers) < half:
+            step = pow(w, len(powers), prime)
+            powers = np.concatenate((powers, powers * step % prime))
+        _ntt_twiddles[key] = powers[:half]
+    return _ntt_twiddles[key]
+
+
+def ntt(values, prime, root, inverse=False):
+    """
+    Векторизованное преобразование длины 2**k по модулю prime.
+    Прямое - прореживание по частоте (результат в бит-обратном порядке),
+    обратное - прореживание по времени (вход в бит-обратном порядке), поэтому
+    перестановка не нужна: между ними выполняется только поэлементное умножение.
+    """
+    values = values.copy()
+    n = len(values)
+    halves = []
+    half = n // 2
+    while half:
+        halves.append(half)
+        half //= 2
+    if inverse:
+        halves.reverse()
+
+    for half in halves:
+        blocks = values.reshape(-1, 2, half)
+        u = blocks[:, 0, :].copy()
+        v = blocks[:, 1, :]
+        w = ntt_twiddles(prime, root, half, inverse)
+        if inverse:
+            v = v * w % prime
+            blocks[:, 0, :] = (u + v) % prime
+            blocks[:, 1, :] = (u - v) % prime
+        else:
+            blocks[:, 0, :] = (u + v) % prime
+            blocks[:, 1, :] = (u - v) % prime * w % prime
+
+    if inverse:
+        values = values * pow(n, prime - 2, prime) % prime
+    return values
+
+
+def ntt_digits(limbs):
+    """Лимбы, сгруппированные по NTT_DIGIT_BYTES байтов в одну цифру."""
+    padded = np.zeros(-(-len(limbs) // NTT_DIGIT_BYTES) * NTT_DIGIT_BYTES, dtype=np.uint8)
+    padded[:len(limbs)] = limbs
+    return padded.view(f"<u{NTT_DIGIT_BYTES}").astype(np.int64)
+
+
+def ntt_size(length):
+    size = 1
+    while size < length:
+        size *= 2
+    return size
+
+
+def ntt_convolution(a, b):
+    """
+    Точная свёртка цифр a и b (не больше 2**16) через преобразования по двум простым модулям и
+    китайскую теорему об остатках. Длины ограничены NTT_MAX_SIZE и NTT_MAX_DIGITS (см. ntt_fits):
+    за их пределами результат был бы неверным, поэтому выбрасывается ValueError.
+    """
+    size = ntt_size(len(a) + len(b) - 1)
+    if min(len(a), len(b)) > NTT_MAX_DIGITS:
+        raise ValueError("Коэффициенты свёртки не помещаются в произведение модулей NTT")
+
+    residues = []
+    for prime, root in NTT_PRIMES:
+        if (prime - 1) % size:
+            raise ValueError(f"Длина преобразования {size} не делит {prime} - 1")
+        fa = np.zeros(size, dtype=np.int64)
+        fa[:len(a)] = a
+        fa = ntt(fa, prime, root)
+        if b is a:
+            # Квадрат: два преобразования вместо трёх
+            fb = fa
+        else:
+            fb = np.zeros(size, dtype=np.int64)
+            fb[:len(b)] = b
+            fb = ntt(fb, prime, root)
+        product = fa * fb % prime
+        residues.append(ntt(product, prime, root, inverse=True)[:len(a) + len(b) - 1])
+
+    (p1, _), (p2, _) = NTT_PRIMES
+    r1, r2 = residues
+    t = (r2 - r1) % p2 * pow(p1, p2 - 2, p2) % p2
+    return r1 + p1 * t
+
+
+def ntt_digit_count(x):
+    return max(1, -(-((x.bit_length() + 7) // 8) // NTT_DIGIT_BYTES))
+
+
+def ntt_fits(x, y):
+    """Можно ли умножить неотрицательные x и y одной свёрткой ntt_convolution."""
+    a, b = ntt_digit_count(x), ntt_digit_count(y)
+    return ntt_size(a + b - 1) <= NTT_MAX_SIZE and min(a, b) <= NTT_MAX_DIGITS
+
+
+def split_product(x, y, multiply):
+    """
+    Один шаг Карацубы над int для неотрицательных x и y: три (для несбалансированных - два)
+    вызова multiply от половин. Так NTT умножает числа длиннее своего предела.
+    """
+    if x.bit_length() < y.bit_length():
+        x, y = y, x
+    k = x.bit_length() // 2
+    x0, x1 = x & ((1 << k) - 1), x >> k
+    if y.bit_length() <= k:
+        return multiply(x0, y) + (multiply(x1, y) << k)
+    y0, y1 = y & ((1 << k) - 1), y >> k
+    z0 = multiply(x0, y0)
+    z2 = multiply(x1, y1)
+    z1 = multiply(x0 + x1, y0 + y1) - z0 - z2
+    return z0 + (z1 << k) + (z2 << (2 * k))
+
+
+def split_square(x, square):
+    k = x.bit_length() // 2
+    x0, x1 = x & ((1 << k) - 1), x >> k
+    z0 = square(x0)
+    z2 = square(x1)
+    z1 = square(x0 + x1) - z0 - z2
+    return z0 + (z1 << k) + (z2 << (2 * k))
+
+
+def ntt_product(x, y):
+    """Произведение неотрицательных x и y через NTT; слишком длинные множители сначала делятся пополам."""
+    if not ntt_fits(x, y):
+        return split_product(x, y, ntt_product)
+    return coefficients_to_int(ntt_limb_product(int_to_limbs(x), int_to_limbs(y)), NTT_DIGIT_BYTES)
+
+
+def ntt_square(x):
+    if not ntt_fits(x, x):
+        return split_square(x, ntt_square)
+    return coefficients_to_int(ntt_square_limbs(int_to_limbs(x)), NTT_DIGIT_BYTES)
+
+
+def ntt_limb_product(a, b):
+    """Произведение массивов лимбов через NTT; возвращает свёртку цифр по основанию 2**16."""
+    return ntt_convolution(ntt_digits(a), ntt_digits(b))
+
+
+def ntt_square_limbs(a):
+    digits = ntt_digits(a)
+    return ntt_convolution(digits, digits)
+
+
+def signed_ntt_product(x, y):
+    if x == 0 or y == 0:
+        return 0
+    product = ntt_product(abs(x), abs(y))
+    return -product if (x < 0) != (y < 0) else product
+
+
+def limb_toom3_multiplication(x, y):
+    """Алгоритм Тоома-Кука 3 с алгоритмом Карацубы над лимбами для коротких частей."""
+    return toom3_product(x, y)
+
+
+def limb_ntt_multiplication(x, y):
+    """Умножение через теоретико-числовое преобразование (точная модульная арифметика)."""
+    return signed_ntt_product(x, y)
+
+
+def limb_ntt_square(x):
+    return ntt_square(abs(x)) if x else 0
+
+
+def auto_multiplication(x, y):
+    """
+    Умножение с выбором алгоритма по длине меньшего множителя:
+    Карацуба (со «столбиком» для коротких блоков), Тоом-Кук 3 или NTT.
+    """
+    limbs = (min(x.bit_length(), y.bit_length()) + 7) // 8
+    if limbs >= NTT_LIMB_THRESHOLD:
+        return limb_ntt_multiplication(x, y)
+    if limbs >= TOOM3_LIMB_THRESHOLD:
+        return limb_toom3_multiplication(x, y)
+    return limb_karatsuba_multiplication(x, y)
+
+
+def auto_square(x):
+    """Возведение в квадрат с выбором алгоритма по тем же порогам, что и auto_multiplication."""
+    limbs = (x.bit_length() + 7) // 8
+    if limbs >= NTT_LIMB_THRESHOLD:
+        return limb_ntt_square(x)
+    if limbs >= TOOM3_LIMB_THRESHOLD:
+        return toom3_square(x)
+    return limb_karatsuba_square(x)
+
+
+THRESHOLD_CANDIDATES = (500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+
+def random_limbs_number(limbs):
+    return int.from_bytes(np.random.randint(0, 256, limbs, dtype=np.uint8).tobytes(), "little") | (1 << (8 * limbs - 1))
+
+
+def _crossover(slower, faster, candidates):
+    """Наименьшая длина из candidates (в лимбах), начиная с которой faster обгоняет slower."""
+    for limbs in candidates:
+        x = random_limbs_number(limbs)
+        y = random_limbs_number(limbs)
+        times = []
+        for function in (slower, faster):
+            start_time = perf_counter()
+            function(x, y)
+            times.append(perf_counter() - start_time)
+        if times[1] < times[0]:
+            return limbs
+    return candidates[-1]
+
+
+def tune_multiplication_thresholds(candidates=THRESHOLD_CANDIDATES):
+    """
+    Подбор порогов auto_multiplication: замеряет соседние алгоритмы на длинах из candidates
+    и запоминает точки, где более сложный алгоритм становится быстрее.
+    """
+    global TOOM3_LIMB_THRESHOLD, NTT_LIMB_THRESHOLD
+    TOOM3_LIMB_THRESHOLD = _crossover(
+        limb_karatsuba_multiplication, lambda x, y: toom3_product(x, y, candidates[0]), candidates
+    )
+    NTT_LIMB_THRESHOLD = _crossover(limb_toom3_multiplication, limb_ntt_multiplication, candidates)
+    return TOOM3_LIMB_THRESHOLD, NTT_LIMB_THRESHOLD
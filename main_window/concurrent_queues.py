@@ -0,0 +1,236 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+
+from .benchmark import measure
+from .queue_stack import Node, QueueArray
+
+DEFAULT_CAPACITY = 1024
+
+
+class TwoLockQueue:
+    """
+    Очередь Майкла-Скотта с двумя блокировками: голова всегда указывает на фиктивный узел,
+    поэтому вставка меняет только хвост, извлечение - только голову, и производители
+    не конкурируют с потребителями за одну блокировку.
+    """
+
+    def __init__(self):
+        dummy = Node(None)
+        self.head = dummy
+        self.tail = dummy
+        self.head_lock = threading.Lock()
+        self.tail_lock = threading.Lock()
+
+    def enqueue(self, item):
+        node = Node(item)
+        with self.tail_lock:
+            self.tail.next = node
+            self.tail = node
+
+    def dequeue(self):
+        """Первый элемент или None, если очередь пуста; не блокируется."""
+        with self.head_lock:
+            first = self.head.next
+            if first is None:
+                return None
+            item = first.value
+            # Извлечённый узел становится новым фиктивным и не должен удерживать значение
+            first.value = None
+            self.head = first
+            return item
+
+    def is_empty(self):
+        return self.head.next is None
+
+
+class BoundedBlockingQueue:
+    """
+    Ограниченная блокирующая очередь на кольцевом буфере QueueArray.
+    put ждёт свободного места, get - элемента; при истечении timeout секунд
+    выбрасываются queue.Full и queue.Empty, как у queue.Queue.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, typecode=None, dtype=None):
+        if capacity <= 0:
+            raise ValueError("Ёмкость очереди должна быть положительной")
+        self.capacity = capacity
+        # Начальная ёмкость буфера равна ограничению, поэтому он никогда не перераспределяется
+        self.storage = QueueArray(capacity, typecode, dtype)
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def put(self, item, timeout=None):
+        with self.not_full:
+            full = self.storage.size() >= self.capacity
+            if full and not self.not_full.wait_for(lambda: self.storage.size() < self.capacity, timeout):
+                raise queue.Full
+            self.storage.enqueue(item)
+            self.not_empty.notify()
+
+    def get(self, timeout=None):
+        with self.not_empty:
+            empty = self.storage.size() == 0
+            if empty and not self.not_empty.wait_for(lambda: self.storage.size() > 0, timeout):
+                raise queue.Empty
+            item = self.storage.dequeue()
+            self.not_full.notify()
+            return item
+
+    def put_nowait(self, item):
+        self.put(item, timeout=0)
+
+    def get_nowait(self):
+        return self.get(timeout=0)
+
+    def size(self):
+        with self.lock:
+            return self.storage.size()
+
+    def is_empty(self):
+        return self.size() == 0
+
+
+class AsyncQueue:
+    """
+    Очередь для сопрограмм одного цикла событий поверх любого хранилища с enqueue/dequeue
+    (по умолчанию QueueArray). maxsize > 0 ограничивает длину: put ждёт места, get - элемента;
+    ожидающие будятся по одному через futures, как в asyncio.Queue.
+    """
+
+    def __init__(self, maxsize=0, storage=None):
+        self.storage = QueueArray() if storage is None else storage
+        self.maxsize = maxsize
+        self.count = 0
+        self.getters = deque()
+        self.putters = deque()
+
+    def full(self):
+        return 0 < self.maxsize <= self.count
+
+    def empty(self):
+        return self.count == 0
+
+    def qsize(self):
+        return self.count
+
+    @staticmethod
+    def _wake_next(waiters):
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def _wait(self, waiters, ready):
+        while not ready():
+            waiter = asyncio.get_running_loop().create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                # Отменённый ожидающий мог уже получить пробуждение - передаём его следующему
+                if ready() and not waiter.cancelled():
+                    self._wake_next(waiters)
+                raise
+
+    async def put(self, item):
+        if self.full():
+            await self._wait(self.putters, lambda: not self.full())
+        self.put_nowait(item)
+
+    async def get(self):
+        if self.empty():
+            await self._wait(self.getters, lambda: not self.empty())
+        return self.get_nowait()
+
+    def put_nowait(self, item):
+        if self.full():
+            raise asyncio.QueueFull
+        self.storage.enqueue(item)
+        self.count += 1
+        self._wake_next(self.getters)
+
+    def get_nowait(self):
+        if self.empty():
+            raise asyncio.QueueEmpty
+        item = self.storage.dequeue()
+        self.count -= 1
+        self._wake_next(self.putters)
+        return item
+
+
+def split_evenly(total, parts):
+    share, extra = divmod(total, parts)
+    return [share + (1 if index < extra else 0) for index in range(parts)]
+
+
+def run_threads(work_queue, items, producers, consumers):
+    """
+    Передаёт items элементов от producers потоков-производителей consumers потокам-потребителям.
+    Очереди с put/get используются как блокирующие, у остальных потребитель повторяет dequeue,
+    уступая GIL, пока очередь пуста.
+    """
+    if hasattr(work_queue, "put"):
+        put, get = work_queue.put, work_queue.get
+    else:
+        put = work_queue.enqueue
+
+        def get():
+            while True:
+                item = work_queue.dequeue()
+                if item is not None:
+                    return item
+                time.sleep(0)
+
+    def produce(count):
+        for item in range(1, count + 1):
+            put(item)
+
+    def consume(count):
+        for _ in range(count):
+            get()
+
+    threads = [threading.Thread(target=produce, args=(count,)) for count in split_evenly(items, producers)]
+    threads += [threading.Thread(target=consume, args=(count,)) for count in split_evenly(items, consumers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+async def run_coroutines(queue_class, items, producers, consumers, maxsize):
+    work_queue = queue_class(maxsize)
+
+    async def produce(count):
+        for item in range(1, count + 1):
+            await work_queue.put(item)
+
+    async def consume(count):
+        for _ in range(count):
+            await work_queue.get()
+
+    await asyncio.gather(
+        *(produce(count) for count in split_evenly(items, producers)),
+        *(consume(count) for count in split_evenly(items, consumers)),
+    )
+
+
+def mpmc_throughput(queue_class, items, producers=4, consumers=4):
+    """Замер передачи items элементов через новый экземпляр queue_class между потоками."""
+    return measure(run_threads, setup=lambda: (queue_class(), items, producers, consumers), repeat=3)
+
+
+def async_mpmc_throughput(queue_class, items, producers=4, consumers=4, maxsize=DEFAULT_CAPACITY):
+    """То же для сопрограмм: queue_class(maxsize) с асинхронными put/get, например AsyncQueue."""
+    return measure(
+        lambda: asyncio.run(run_coroutines(queue_class, items, producers, consumers, maxsize)), repeat=3
+    )
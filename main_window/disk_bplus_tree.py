@@ -0,0 +1,553 @@
+import mmap
+import os
+import random
+import struct
+import tempfile
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+import numpy as np
+
+from .avl_tree import AVLTree
+from .benchmark import measure, measure_memory
+from .search_trees import BPlusNode
+
+MAGIC = b"BPTREE01"
+PAGE_SIZE = 4096
+DEFAULT_CACHE_PAGES = 1024
+INITIAL_PAGES = 16
+# Страница 0 - заголовок файла: сигнатура, размер страницы, число страниц, корень, число ключей
+# и голова списка свободных страниц
+FILE_HEADER = struct.Struct("<8sqqqqq")
+# Заголовок страницы: вид, число ключей, следующий лист (у свободной страницы - следующая свободная)
+PAGE_HEADER = struct.Struct("<iiq")
+LEAF = 0
+INTERNAL = 1
+FREE = 2
+# Страница 0 занята заголовком файла, поэтому её номер означает "нет страницы"
+NO_PAGE = 0
+KEY_MIN = -(1 << 63)
+KEY_MAX = (1 << 63) - 1
+
+
+class DiskPage(BPlusNode):
+    """Страница в кеше: узел BPlusNode, у которого children и next - номера страниц, а не узлы."""
+
+    __slots__ = ("number", "dirty")
+
+    def __init__(self, number, keys=None, children=None, next_page=NO_PAGE):
+        super().__init__(keys, children)
+        self.number = number
+        self.next = next_page
+        self.dirty = False
+
+
+class DiskBPlusTree:
+    """
+    B+-дерево целых ключей (int64) в файле из страниц page_size байт, отображённом в память через mmap.
+    Лист вмещает (page_size - 16) // 8 ключей, внутренний узел - (page_size - 8) // 16 сыновей;
+    вставка и удаление устроены как у BPlusTree, а освобождённые слиянием страницы
+    переиспользуются через список свободных страниц.
+
+    Прочитанные страницы разбираются в DiskPage и хранятся в LRU-кеше не больше чем из
+    cache_pages страниц; изменённые страницы записываются в отображение при вытеснении
+    и в flush(), который вызывается и из close(). Просмотр диапазона читает листья мимо кеша,
+    чтобы длинный просмотр не вытеснял внутренние узлы, нужные поиску.
+    Существующий файл открывается с прежним содержимым, иначе создаётся пустое дерево.
+    """
+
+    def __init__(self, path, cache_pages=DEFAULT_CACHE_PAGES, page_size=PAGE_SIZE):
+        if cache_pages < 1:
+            raise ValueError("Кеш должен вмещать хотя бы одну страницу")
+        self.path = path
+        self.cache_pages = cache_pages
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.page_writes = 0
+        self.split_count = 0
+        self.merge_count = 0
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "r+b" if exists else "w+b")
+        try:
+            if exists:
+                self.open_existing()
+            else:
+                self.create(page_size)
+        except BaseException:
+            self.file.close()
+            raise
+
+    def set_page_size(self, page_size):
+        if page_size < 64 or page_size % 8:
+            raise ValueError("Размер страницы должен быть кратен 8 и не меньше 64 байт")
+        self.page_size = page_size
+        self.leaf_capacity = (page_size - PAGE_HEADER.size) // 8
+        self.max_children = (page_size - PAGE_HEADER.size + 8) // 16
+        # Как в BPlusTree: после слияния двух неполных узлов получается не больше максимума
+        self.min_leaf_keys = (self.leaf_capacity + 1) // 2
+        self.min_children = (self.max_children + 1) // 2
+
+    def create(self, page_size):
+        self.set_page_size(page_size)
+        self.file.truncate(INITIAL_PAGES * page_size)
+        self.map = mmap.mmap(self.file.fileno(), INITIAL_PAGES * page_size)
+        self.page_count = 1
+        self.free_head = NO_PAGE
+        self.count = 0
+        self.root = self.allocate_page([]).number
+        self.write_header()
+
+    def open_existing(self):
+        header = self.file.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Файл {self.path} не является индексом B+-дерева")
+        _, page_size, self.page_count, self.root, self.count, self.free_head = FILE_HEADER.unpack(header)
+        self.set_page_size(page_size)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    def write_header(self):
+        FILE_HEADER.pack_into(
+            self.map, 0, MAGIC, self.page_size, self.page_count, self.root, self.count, self.free_head
+        )
+
+    def ensure_pages(self, pages):
+        """Увеличивает файл (не меньше чем вдвое), если в нём меньше pages страниц."""
+        size = pages * self.page_size
+        if size <= len(self.map):
+            return
+        size = max(size, 2 * len(self.map))
+        self.map.close()
+        self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), size)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def read_page(self, number):
+        offset = number * self.page_size
+        kind, size, next_page = PAGE_HEADER.unpack_from(self.map, offset)
+        offset += PAGE_HEADER.size
+        keys = list(struct.unpack_from(f"<{size}q", self.map, offset))
+        if kind == LEAF:
+            return DiskPage(number, keys, None, next_page)
+        children = list(struct.unpack_from(f"<{size + 1}q", self.map, offset + 8 * size))
+        return DiskPage(number, keys, children)
+
+    def write_page(self, page):
+        offset = page.number * self.page_size
+        size = len(page.keys)
+        if page.is_leaf():
+            PAGE_HEADER.pack_into(self.map, offset, LEAF, size, page.next)
+            struct.pack_into(f"<{size}q", self.map, offset + PAGE_HEADER.size, *page.keys)
+        else:
+            PAGE_HEADER.pack_into(self.map, offset, INTERNAL, size, NO_PAGE)
+            struct.pack_into(
+                f"<{2 * size + 1}q", self.map, offset + PAGE_HEADER.size, *page.keys, *page.children
+            )
+        page.dirty = False
+        self.page_writes += 1
+
+    def get_page(self, number):
+        page = self.cache.get(number)
+        if page is not None:
+            self.cache.move_to_end(number)
+            self.cache_hits += 1
+            return page
+        self.cache_misses += 1
+        page = self.read_page(number)
+        self.cache[number] = page
+        self.trim_cache()
+        return page
+
+    def scan_page(self, number):
+        """Страница для просмотра: из кеша, если она там есть, иначе прочитанная без помещения в кеш."""
+        page = self.cache.get(number)
+        return page if page is not None else self.read_page(number)
+
+    def trim_cache(self):
+        while len(self.cache) > self.cache_pages:
+            _, page = self.cache.popitem(last=False)
+            if page.dirty:
+                self.write_page(page)
+
+    def mark_dirty(self, page):
+        """
+        Вызывается после каждого изменения страницы: страница, вытесненная, пока её держала
+        операция, возвращается в кеш и будет записана, а вытеснение записывает только целые узлы.
+        """
+        page.dirty = True
+        self.cache[page.number] = page
+        self.cache.move_to_end(page.number)
+        self.trim_cache()
+
+    def allocate_page(self, keys, children=None, next_page=NO_PAGE):
+        if self.free_head != NO_PAGE:
+            number = self.free_head
+            _, _, self.free_head = PAGE_HEADER.unpack_from(self.map, number * self.page_size)
+        else:
+            number = self.page_count
+            self.page_count += 1
+            self.ensure_pages(self.page_count)
+        page = DiskPage(number, keys, children, next_page)
+        self.mark_dirty(page)
+        return page
+
+    def free_page(self, page):
+        self.cache.pop(page.number, None)
+        PAGE_HEADER.pack_into(self.map, page.number * self.page_size, FREE, 0, self.free_head)
+        self.free_head = page.number
+
+    def find_leaf(self, key, path=None):
+        page = self.get_page(self.root)
+        while not page.is_leaf():
+            index = bisect_right(page.keys, key)
+            if path is not None:
+                path.append((page, index))
+            page = self.get_page(page.children[index])
+        return page
+
+    def contains(self, key):
+        leaf = self.find_leaf(key)
+        index = bisect_left(leaf.keys, key)
+        return index < len(leaf.keys) and leaf.keys[index] == key
+
+    __contains__ = contains
+
+    def iter_range(self, low=None, high=None):
+        """Ключи из [low, high] по возрастанию: спуск к первому листу и проход по списку листьев."""
+        if low is None:
+            leaf = self.get_page(self.root)
+            while not leaf.is_leaf():
+                leaf = self.get_page(leaf.children[0])
+            index = 0
+        else:
+            leaf = self.find_leaf(low)
+            index = bisect_left(leaf.keys, low)
+        while True:
+            keys = leaf.keys
+            while index < len(keys):
+                if high is not None and keys[index] > high:
+                    return
+                yield keys[index]
+                index += 1
+            if leaf.next == NO_PAGE:
+                return
+            leaf = self.scan_page(leaf.next)
+            index = 0
+
+    def height(self):
+        height = 1
+        page = self.get_page(self.root)
+        while not page.is_leaf():
+            page = self.get_page(page.children[0])
+            height += 1
+        return height
+
+    def insert_key(self, key):
+        if not KEY_MIN <= key <= KEY_MAX:
+            raise ValueError("Ключ не помещается в int64")
+        path = []
+        leaf = self.find_leaf(key, path)
+        index = bisect_left(leaf.keys, key)
+        if index < len(leaf.keys) and leaf.keys[index] == key:
+            return
+        leaf.keys.insert(index, key)
+        self.count += 1
+        if len(leaf.keys) <= self.leaf_capacity:
+            self.mark_dirty(leaf)
+            return
+
+        # Переполненный узел укорачивается до выделения новой страницы, которое может его вытеснить
+        middle = len(leaf.keys) // 2
+        right_keys = leaf.keys[middle:]
+        del leaf.keys[middle:]
+        right = self.allocate_page(right_keys, None, leaf.next)
+        leaf.next = right.number
+        self.mark_dirty(leaf)
+        separator = right_keys[0]
+        self.split_count += 1
+
+        while path:
+            parent, index = path.pop()
+            parent.keys.insert(index, separator)
+            parent.children.insert(index + 1, right.number)
+            if len(parent.children) <= self.max_children:
+                self.mark_dirty(parent)
+                return
+            middle = len(parent.keys) // 2
+            separator = parent.keys[middle]
+            right_keys = parent.keys[middle + 1:]
+            right_children = parent.children[middle + 1:]
+            del parent.keys[middle:]
+            del parent.children[middle + 1:]
+            right = self.allocate_page(right_keys, right_children)
+            self.mark_dirty(parent)
+            self.split_count += 1
+
+        self.root = self.allocate_page([separator], [self.root, right.number]).number
+
+    def delete_key(self, key):
+        path = []
+        leaf = self.find_leaf(key, path)
+        index = bisect_left(leaf.keys, key)
+        if index == len(leaf.keys) or leaf.keys[index] != key:
+            return
+        leaf.keys.pop(index)
+        self.count -= 1
+        self.mark_dirty(leaf)
+
+        page = leaf
+        while path and self.underflows(page):
+            parent, index = path.pop()
+            self.rebalance_child(parent, index, page)
+            page = parent
+
+        root = self.get_page(self.root)
+        if not root.is_leaf() and len(root.children) == 1:
+            self.root = root.children[0]
+            self.free_page(root)
+
+    def underflows(self, page):
+        if page.is_leaf():
+            return len(page.keys) < self.min_leaf_keys
+        return len(page.children) < self.min_children
+
+    def rebalance_child(self, parent, index, child):
+        """Как BPlusTree.rebalance_child; сам сын передаётся, чтобы не читать его страницу повторно."""
+        left = self.get_page(parent.children[index - 1]) if index > 0 else None
+        right = self.get_page(parent.children[index + 1]) if index + 1 < len(parent.children) else None
+
+        if child.is_leaf():
+            if left is not None and len(left.keys) > self.min_leaf_keys:
+                child.keys.insert(0, left.keys.pop())
+                parent.keys[index - 1] = child.keys[0]
+                self.mark_dirty(left)
+                self.mark_dirty(child)
+                self.mark_dirty(parent)
+                return
+            if right is not None and len(right.keys) > self.min_leaf_keys:
+                child.keys.append(right.keys.pop(0))
+                parent.keys[index] = right.keys[0]
+                self.mark_dirty(right)
+                self.mark_dirty(child)
+                self.mark_dirty(parent)
+                return
+            if left is not None:
+                child, right, index = left, child, index - 1
+            child.keys.extend(right.keys)
+            child.next = right.next
+        else:
+            if left is not None and len(left.children) > self.min_children:
+                child.keys.insert(0, parent.keys[index - 1])
+                parent.keys[index - 1] = left.keys.pop()
+                child.children.insert(0, left.children.pop())
+                self.mark_dirty(left)
+                self.mark_dirty(child)
+                self.mark_dirty(parent)
+                return
+            if right is not None and len(right.children) > self.min_children:
+                child.keys.append(parent.keys[index])
+                parent.keys[index] = right.keys.pop(0)
+                child.children.append(right.children.pop(0))
+                self.mark_dirty(right)
+                self.mark_dirty(child)
+                self.mark_dirty(parent)
+                return
+            if left is not None:
+                child, right, index = left, child, index - 1
+            child.keys.append(parent.keys[index])
+            child.keys.extend(right.keys)
+            child.children.extend(right.children)
+
+        parent.keys.pop(index)
+        parent.children.pop(index + 1)
+        self.mark_dirty(child)
+        self.mark_dirty(parent)
+        self.free_page(right)
+        self.merge_count += 1
+
+    def build_sorted(self, keys):
+        """
+        Заменяет содержимое деревом из строго возрастающих keys (последовательность или массив NumPy):
+        листья записываются в файл подряд, без кеша и разбора страниц, затем по уровням строятся
+        внутренние узлы. Ключи делятся между узлами поровну, поэтому ни один узел не оказывается неполным.
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        if len(keys) > 1 and not np.all(keys[1:] > keys[:-1]):
+            raise ValueError("Ключи для build_sorted должны строго возрастать")
+        self.cache.clear()
+        self.page_count = 1
+        self.free_head = NO_PAGE
+        self.count = len(keys)
+        if not len(keys):
+            self.root = self.allocate_page([]).number
+            self.write_header()
+            return
+
+        leaves = -(-len(keys) // self.leaf_capacity)
+        bounds = [len(keys) * index // leaves for index in range(leaves + 1)]
+        first = self.page_count
+        self.page_count += leaves
+        self.ensure_pages(self.page_count)
+        data = keys.astype("<i8", copy=False)
+        for index in range(leaves):
+            start, end = bounds[index], bounds[index + 1]
+            offset = (first + index) * self.page_size
+            next_page = first + index + 1 if index + 1 < leaves else NO_PAGE
+            PAGE_HEADER.pack_into(self.map, offset, LEAF, end - start, next_page)
+            offset += PAGE_HEADER.size
+            self.map[offset:offset + 8 * (end - start)] = data[start:end].tobytes()
+        self.page_writes += leaves
+
+        # Уровень - пары (номер страницы, наименьший ключ поддерева); наименьший ключ сына - его разделитель
+        level = [(first + index, int(keys[bounds[index]])) for index in range(leaves)]
+        while len(level) > 1:
+            nodes = -(-len(level) // self.max_children)
+            bounds = [len(level) * index // nodes for index in range(nodes + 1)]
+            upper = []
+            for index in range(nodes):
+                children = level[bounds[index]:bounds[index + 1]]
+                page = DiskPage(self.page_count, [key for _, key in children[1:]], [number for number, _ in children])
+                self.page_count += 1
+                self.ensure_pages(self.page_count)
+                self.write_page(page)
+                upper.append((page.number, children[0][1]))
+            level = upper
+        self.root = level[0][0]
+        self.write_header()
+
+    def to_array(self):
+        return np.fromiter(self, dtype=np.int64, count=self.count)
+
+    def prefers_rebuild(self, batch):
+        """Та же оценка, что у AVLTree: перестройка за O(n + m) против m операций по O(log(n + m))."""
+        total = self.count + batch
+        return batch * total.bit_length() >= total
+
+    def insert_many(self, keys):
+        """Пакетная вставка: крупный пакет сливается с ключами дерева через NumPy и загружается build_sorted."""
+        keys = np.unique(np.asarray(keys, dtype=np.int64))
+        if not self.prefers_rebuild(len(keys)):
+            for key in keys.tolist():
+                self.insert_key(key)
+            return
+        if self.count:
+            keys = np.union1d(self.to_array(), keys)
+        self.build_sorted(keys)
+
+    def delete_many(self, keys):
+        keys = np.unique(np.asarray(keys, dtype=np.int64))
+        if not self.prefers_rebuild(len(keys)):
+            for key in keys.tolist():
+                self.delete_key(key)
+            return
+        self.build_sorted(np.setdiff1d(self.to_array(), keys, assume_unique=True))
+
+    def flush(self):
+        """Записывает изменённые страницы и заголовок в отображение и сбрасывает его на диск."""
+        for page in self.cache.values():
+            if page.dirty:
+                self.write_page(page)
+        self.write_header()
+        self.map.flush()
+
+    def close(self):
+        if self.map is None:
+            return
+        self.flush()
+        self.cache.clear()
+        self.map.close()
+        self.map = None
+        self.file.close()
+
+
+def lookup_keys(tree, keys):
+    for key in keys:
+        tree.contains(key)
+
+
+def insert_keys(tree, keys):
+    for key in keys:
+        tree.insert_key(key)
+
+
+def delete_keys(tree, keys):
+    for key in keys:
+        tree.delete_key(key)
+
+
+def scan_ranges(tree, ranges):
+    for low, high in ranges:
+        for _ in tree.iter_range(low, high):
+            pass
+
+
+def benchmark_disk_index(size, operations=10000, cache_budgets=(64, 4096), repeat=3, seed=0):
+    """
+    AVLTree в памяти против DiskBPlusTree с кешем из каждого числа страниц cache_budgets на size ключах:
+    заполнение из отсортированных ключей, operations поисков, вставок и удалений и 100 просмотров
+    диапазонов шириной 1% пространства ключей. Файл после заполнения остаётся в кеше ОС, так что
+    замер показывает цену разбора страниц и промахов LRU-кеша, а не задержки самого диска.
+    Возвращает (замеры {структура: {операция: Measurement}}, {структура: байты Python-объектов
+    после заполнения и поиска}, размер файла индекса в байтах).
+    """
+    rng = random.Random(seed)
+    key_space = 4 * size
+    initial = sorted(rng.sample(range(0, key_space, 2), size))
+    initial_array = np.array(initial, dtype=np.int64)
+    inserted = rng.sample(range(1, key_space, 2), min(operations, size))
+    deleted = rng.sample(initial, min(operations, size))
+    lookups = [rng.randrange(key_space) for _ in range(operations)]
+    width = max(1, key_space // 100)
+    ranges = [(low, low + width) for low in (rng.randrange(key_space) for _ in range(100))]
+
+    times = {}
+    memory = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.bpt")
+        opened = []
+
+        def open_disk_tree(cache_pages):
+            while opened:
+                opened.pop().close()
+            tree = DiskBPlusTree(path, cache_pages)
+            tree.build_sorted(initial_array)
+            opened.append(tree)
+            return tree
+
+        builders = [("AVLTree в памяти", lambda: AVLTree(initial))]
+        for cache_pages in cache_budgets:
+            label = f"DiskBPlusTree, кеш {cache_pages} стр. ({cache_pages * PAGE_SIZE // 1024} КБ)"
+            builders.append((label, lambda cache_pages=cache_pages: open_disk_tree(cache_pages)))
+
+        try:
+            for label, build in builders:
+                cases = (
+                    ("поиск", lookup_keys, lookups),
+                    ("insert_key", insert_keys, inserted),
+                    ("delete_key", delete_keys, deleted),
+                    ("просмотр диапазонов", scan_ranges, ranges),
+                )
+                times[label] = {"заполнение": measure(build, repeat=repeat)}
+                for operation, function, arguments in cases:
+                    times[label][operation] = measure(
+                        function, setup=lambda: (build(), arguments), repeat=repeat
+                    )
+                held = []
+
+                def fill_and_search():
+                    tree = build()
+                    lookup_keys(tree, lookups)
+                    held.append(tree)
+
+                memory[label] = measure_memory(fill_and_search)
+                held.clear()
+            file_bytes = os.path.getsize(path)
+        finally:
+            while opened:
+                opened.pop().close()
+    return times, memory, file_bytes
@@ -1,26 +1,109 @@
-def classic_large_multiplication(a, b):
-    a = str(str(a)[::-1])
-    b = str(str(b)[::-1])
+import random
+from time import perf_counter
+
+from .radix_conversion import decimal_length, decimal_power, decimal_to_int, int_to_decimal, native_multiplication
+
+
+def decimal_digits(x):
+    """Список десятичных цифр неотрицательного x, младшая первая."""
+    return list(map(int, reversed(int_to_decimal(x))))
+
+
+def digits_to_int(digits):
+    return decimal_to_int(''.join(map(str, reversed(digits))))
 
+
+def decimal_digit_operands(a, b):
+    """Подготовка операндов для classic_digit_multiplication вне замера времени."""
+    return decimal_digits(a), decimal_digits(b)
+
+
+def classic_digit_multiplication(a, b):
+    """Умножение «в столбик» списков десятичных цифр (младшая первая); возвращает цифры произведения."""
     result = [0] * (len(a) + len(b))
     for i in range(len(a)):
         for j in range(len(b)):
-            result[i + j] += int(a[i]) * int(b[j])
+            result[i + j] += a[i] * b[j]
             if result[i + j] >= 10:
                 result[i + j + 1] += result[i + j] // 10
                 result[i + j] %= 10
     while len(result) > 1 and result[-1] == 0:
         result.pop()
-    return int(''.join(map(str, result[::-1])))
+    return result
+
+
+def classic_large_multiplication(a, b):
+    return digits_to_int(classic_digit_multiplication(decimal_digits(a), decimal_digits(b)))
 
 
 def karatsuba(x, y):
     if x < 10 or y < 10:
         return x * y
-    m = max(len(str(x)), len(str(y))) // 2
-    high1, low1 = divmod(x, 10 ** m)
-    high2, low2 = divmod(y, 10 ** m)
+    m = max(decimal_length(x), decimal_length(y)) // 2
+    high1, low1 = divmod(x, decimal_power(m))
+    high2, low2 = divmod(y, decimal_power(m))
     z0 = karatsuba(low1, low2)
     z1 = karatsuba((low1 + high1), (low2 + high2))
     z2 = karatsuba(high1, high2)
-    return (z2 * 10 ** (2 * m)) + ((z1 - z2 - z0) * 10 ** m) + z0
+    return (z2 * decimal_power(2 * m)) + ((z1 - z2 - z0) * decimal_power(m)) + z0
+
+
+# Кандидаты порога (в битах), ниже которого karatsuba_fast переходит на базовый алгоритм
+KARATSUBA_CUTOFF_CANDIDATES = (1024, 2048, 4096, 8192, 16384, 32768, 65536)
+KARATSUBA_BIT_CUTOFF = 16384
+
+
+def _karatsuba_fast(x, y, cutoff, base_case):
+    """Неотрицательные x и y; разбиение по битовой длине сдвигами и масками."""
+    if x < y:
+        x, y = y, x
+    x_bits, y_bits = x.bit_length(), y.bit_length()
+    if y_bits <= cutoff:
+        return base_case(x, y)
+
+    if 2 * y_bits <= x_bits:
+        # Сильно несбалансированные множители: длинный режется на куски длины короткого,
+        # чтобы не умножать нулевые старшие половины
+        mask = (1 << y_bits) - 1
+        result = 0
+        for shift in range(0, x_bits, y_bits):
+            result += _karatsuba_fast((x >> shift) & mask, y, cutoff, base_case) << shift
+        return result
+
+    m = x_bits // 2
+    mask = (1 << m) - 1
+    high1, low1 = x >> m, x & mask
+    high2, low2 = y >> m, y & mask
+    z0 = _karatsuba_fast(low1, low2, cutoff, base_case)
+    z2 = _karatsuba_fast(high1, high2, cutoff, base_case)
+    z1 = _karatsuba_fast(low1 + high1, low2 + high2, cutoff, base_case) - z2 - z0
+    return (z2 << (2 * m)) + (z1 << m) + z0
+
+
+def karatsuba_fast(x, y, cutoff=None, base_case=native_multiplication):
+    """
+    Алгоритм Карацубы для практического применения.
+    Части выделяются сдвигами и масками по битовой длине (без str и степеней 10),
+    множители короче cutoff бит умножаются base_case (встроенное умножение или
+    limb_schoolbook_multiplication), а длинный множитель при сильной несбалансированности
+    режется на куски длины короткого. cutoff по умолчанию - KARATSUBA_BIT_CUTOFF.
+    """
+    if cutoff is None:
+        cutoff = KARATSUBA_BIT_CUTOFF
+    product = _karatsuba_fast(abs(x), abs(y), cutoff, base_case)
+    return -product if (x < 0) != (y < 0) else product
+
+
+def tune_karatsuba_cutoff(base_case=native_multiplication, sample_bits=200_000, candidates=KARATSUBA_CUTOFF_CANDIDATES):
+    """Подбор порога karatsuba_fast на случайных множителях длины sample_bits; результат запоминается."""
+    global KARATSUBA_BIT_CUTOFF
+    x = random.getrandbits(sample_bits)
+    y = random.getrandbits(sample_bits)
+    best_time = None
+    for cutoff in candidates:
+        start_time = perf_counter()
+        karatsuba_fast(x, y, cutoff, base_case)
+        elapsed = perf_counter() - start_time
+        if best_time is None or elapsed < best_time:
+            KARATSUBA_BIT_CUTOFF, best_time = cutoff, elapsed
+    return KARATSUBA_BIT_CUTOFF
@@ -0,0 +1,293 @@
+from .bignum import (
+    auto_multiplication,
+    auto_square,
+    limb_karatsuba_multiplication,
+    limb_karatsuba_square,
+    limb_ntt_multiplication,
+    limb_ntt_square,
+    limb_toom3_multiplication,
+    toom3_square,
+)
+from .radix_conversion import (
+    RECIPROCAL_CUTOFF_BITS,
+    barrett_divmod,
+    int_to_decimal,
+    native_multiplication,
+    reciprocal,
+)
+
+
+class ArithmeticBackend:
+    """Ядро длинной арифметики: умножение и возведение в квадрат, на которых строятся остальные операции."""
+
+    def __init__(self, name, label, multiply, square):
+        self.name = name
+        self.label = label
+        self.multiply = multiply
+        self.square = square
+
+
+ARITHMETIC_BACKENDS = {}
+
+
+def register_arithmetic_backend(backend):
+    ARITHMETIC_BACKENDS[backend.name] = backend
+    return backend
+
+
+def native_square(x):
+    return x * x
+
+
+register_arithmetic_backend(ArithmeticBackend("native", "Встроенное умножение", native_multiplication, native_square))
+register_arithmetic_backend(
+    ArithmeticBackend("karatsuba", "Карацуба (лимбы)", limb_karatsuba_multiplication, limb_karatsuba_square)
+)
+register_arithmetic_backend(ArithmeticBackend("toom3", "Тоом-Кук 3", limb_toom3_multiplication, toom3_square))
+register_arithmetic_backend(ArithmeticBackend("ntt", "NTT", limb_ntt_multiplication, limb_ntt_square))
+register_arithmetic_backend(ArithmeticBackend("auto", "Автовыбор", auto_multiplication, auto_square))
+
+
+def get_arithmetic_backend(backend):
+    """Ядро по имени из ARITHMETIC_BACKENDS или уже готовый ArithmeticBackend."""
+    if isinstance(backend, ArithmeticBackend):
+        return backend
+    if backend not in ARITHMETIC_BACKENDS:
+        raise ValueError(f"Неизвестное ядро длинной арифметики: {backend}")
+    return ARITHMETIC_BACKENDS[backend]
+
+
+def square(x, backend="auto"):
+    return get_arithmetic_backend(backend).square(x)
+
+
+def multiply(x, y, backend="auto"):
+    return get_arithmetic_backend(backend).multiply(x, y)
+
+
+def _newton_divmod(a, b, multiply_function):
+    """divmod для неотрицательных a и b > 0 через обратную к b по Ньютону."""
+    if a < b:
+        return 0, a
+    n = b.bit_length()
+    if n <= RECIPROCAL_CUTOFF_BITS:
+        return divmod(a, b)
+    # reciprocal(b << t) = floor(2**(2n + t) / b): точности хватает для любого a < 2**(2n + t)
+    t = max(0, a.bit_length() - 2 * n)
+    inverse = reciprocal(b << t, multiply_function)
+    quotient = multiply_function(a, inverse) >> (2 * n + t)
+    remainder = a - multiply_function(quotient, b)
+    while remainder < 0:
+        quotient -= 1
+        remainder += b
+    while remainder >= b:
+        quotient += 1
+        remainder -= b
+    return quotient, remainder
+
+
+def newton_divmod(a, b, backend="auto"):
+    """
+    Деление с остатком через обратную по Ньютону, вычисленную умножениями ядра backend.
+    Знаки - как у встроенного divmod: остаток имеет знак делителя.
+    """
+    if b == 0:
+        raise ZeroDivisionError("деление на ноль")
+    quotient, remainder = _newton_divmod(abs(a), abs(b), get_arithmetic_backend(backend).multiply)
+    if (a < 0) != (b < 0):
+        if remainder:
+            quotient += 1
+            remainder = abs(b) - remainder
+        quotient = -quotient
+    return quotient, -remainder if b < 0 else remainder
+
+
+class BarrettReducer:
+    """Приведение по модулю: два умножения на заранее вычисленную обратную к модулю."""
+
+    def __init__(self, modulus, backend):
+        self.modulus = modulus
+        self.multiply = backend.multiply
+        self.inverse = reciprocal(modulus, self.multiply)
+
+    def to_domain(self, x):
+        return self.reduce(x)
+
+    def from_domain(self, x):
+        return x
+
+    def reduce(self, x):
+        """x mod modulus для 0 <= x < modulus**2."""
+        return barrett_divmod(x, self.modulus, self.inverse, self.multiply)[1]
+
+
+class MontgomeryReducer:
+    """
+    Приведение Монтгомери для нечётного модуля: числа хранятся как x * 2**k mod modulus,
+    и приведение обходится умножениями, маской и сдвигом, без деления.
+    """
+
+    def __init__(self, modulus, backend):
+        if modulus % 2 == 0:
+            raise ValueError("Приведение Монтгомери требует нечётного модуля")
+        self.modulus = modulus
+        self.multiply = backend.multiply
+        self.bits = modulus.bit_length()
+        self.mask = (1 << self.bits) - 1
+        self.factor = -pow(modulus, -1, 1 << self.bits) & self.mask
+
+    def to_domain(self, x):
+        return _newton_divmod(x << self.bits, self.modulus, self.multiply)[1]
+
+    def from_domain(self, x):
+        return self.reduce(x)
+
+    def reduce(self, x):
+        """x * 2**(-k) mod modulus для 0 <= x < modulus**2."""
+        u = self.multiply(x & self.mask, self.factor) & self.mask
+        x = (x + self.multiply(u, self.modulus)) >> self.bits
+        return x - self.modulus if x >= self.modulus else x
+
+
+REDUCERS = {"barrett": BarrettReducer, "montgomery": MontgomeryReducer}
+
+
+def modular_pow(base, exponent, modulus, backend="auto", reduction=None):
+    """
+    base ** exponent mod modulus возведением в квадрат слева направо.
+    reduction - "montgomery" или "barrett"; по умолчанию Монтгомери для нечётного модуля.
+    """
+    backend = get_arithmetic_backend(backend)
+    if modulus <= 0:
+        raise ValueError("Модуль должен быть положительным")
+    if exponent < 0:
+        raise ValueError("Показатель степени должен быть неотрицательным")
+    if modulus == 1:
+        return 0
+    if reduction is None:
+        reduction = "montgomery" if modulus % 2 else "barrett"
+    if reduction not in REDUCERS:
+        raise ValueError(f"Неизвестный способ приведения: {reduction}")
+
+    reducer = REDUCERS[reduction](modulus, backend)
+    base = reducer.to_domain(newton_divmod(base, modulus, backend)[1])
+    result = reducer.to_domain(1)
+    for bit in bin(exponent)[2:]:
+        result = reducer.reduce(backend.square(result))
+        if bit == "1":
+            result = reducer.reduce(backend.multiply(result, base))
+    return reducer.from_domain(result)
+
+
+def power(base, exponent, backend="auto"):
+    """base ** exponent возведением в квадрат."""
+    backend = get_arithmetic_backend(backend)
+    if exponent < 0:
+        raise ValueError("Показатель степени должен быть неотрицательным")
+    result = 1
+    for bit in bin(exponent)[2:]:
+        result = backend.square(result)
+        if bit == "1":
+            result = backend.multiply(result, base)
+    return result
+
+
+class BigInt:
+    """
+    Длинное целое с выбираемым ядром умножения: операторы *, //, %, divmod и pow (в том числе
+    по модулю) выполняются функциями этого модуля, сложение и сравнение - встроенными int.
+    """
+
+    def __init__(self, value, backend="auto"):
+        self.value = int(value)
+        self.backend = get_arithmetic_backend(backend)
+
+    def _wrap(self, value):
+        return BigInt(value, self.backend)
+
+    @staticmethod
+    def _int(other):
+        return other.value if isinstance(other, BigInt) else other
+
+    def square(self):
+        return self._wrap(self.backend.square(self.value))
+
+    def __add__(self, other):
+        return self._wrap(self.value + self._int(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._wrap(self.value - self._int(other))
+
+    def __rsub__(self, other):
+        return self._wrap(self._int(other) - self.value)
+
+    def __neg__(self):
+        return self._wrap(-self.value)
+
+    def __mul__(self, other):
+        other = self._int(other)
+        if other is self.value:
+            return self.square()
+        return self._wrap(self.backend.multiply(self.value, other))
+
+    __rmul__ = __mul__
+
+    def __divmod__(self, other):
+        quotient, remainder = newton_divmod(self.value, self._int(other), self.backend)
+        return self._wrap(quotient), self._wrap(remainder)
+
+    def __rdivmod__(self, other):
+        quotient, remainder = newton_divmod(self._int(other), self.value, self.backend)
+        return self._wrap(quotient), self._wrap(remainder)
+
+    def __floordiv__(self, other):
+        return divmod(self, other)[0]
+
+    def __rfloordiv__(self, other):
+        return self.__rdivmod__(other)[0]
+
+    def __mod__(self, other):
+        return divmod(self, other)[1]
+
+    def __rmod__(self, other):
+        return self.__rdivmod__(other)[1]
+
+    def __pow__(self, exponent, modulus=None):
+        exponent = self._int(exponent)
+        if modulus is None:
+            return self._wrap(power(self.value, exponent, self.backend))
+        return self._wrap(modular_pow(self.value, exponent, self._int(modulus), self.backend))
+
+    def __eq__(self, other):
+        return self.value == self._int(other)
+
+    def __lt__(self, other):
+        return self.value < self._int(other)
+
+    def __le__(self, other):
+        return self.value <= self._int(other)
+
+    def __gt__(self, other):
+        return self.value > self._int(other)
+
+    def __ge__(self, other):
+        return self.value >= self._int(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __int__(self):
+        return self.value
+
+    __index__ = __int__
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __str__(self):
+        return int_to_decimal(self.value)
+
+    def __repr__(self):
+        return f"BigInt({self}, backend={self.backend.name!r})"
@@ -1,6 +1,7 @@
-import random
-import time
+import asyncio
+import os
 from pathlib import Path
+from queue import Queue
 
 import numpy as np
 from matplotlib import pyplot as plt
@@ -10,6 +11,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QDoubleValidator, QIcon, QIntValidator
 from PyQt5.QtWidgets import (
     QCheckBox,
+    QComboBox,
     QFormLayout,
     QFrame,
     QGroupBox,
@@ -17,6 +19,8 @@ from PyQt5.QtWidgets import (
     QLabel,
     QLineEdit,
     QMainWindow,
+    QMessageBox,
+    QProgressBar,
     QPushButton,
     QScrollArea,
     QTabWidget,
@@ -25,21 +29,43 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
-from .large_miltiplication import karatsuba, classic_large_multiplication
-from .matrix_calculations import (
-    classic_multiplication,
-    custom_strassen_multiplication,
-    numpy_multiplication,
-    scipy_multiplication,
-    strassen_multiplication,
-    sympy_multiplication,
-    tensorflow_multiplication,
+from .benchmark import measure, measure_memory
+from .benchmark_executor import BenchmarkExecutor, BenchmarkJob
+from .bignum import (
+    auto_multiplication,
+    limb_karatsuba_multiplication,
+    limb_ntt_multiplication,
+    limb_schoolbook_multiplication,
+    limb_toom3_multiplication,
 )
-from .queue_stack import QueueArray, QueueLinkedList, StackArray, StackLinkedList
+from .concurrent_queues import AsyncQueue, BoundedBlockingQueue, TwoLockQueue, async_mpmc_throughput, mpmc_throughput
+from .large_miltiplication import classic_digit_multiplication, decimal_digit_operands, karatsuba, karatsuba_fast
+from .long_arithmetic import ARITHMETIC_BACKENDS, modular_pow, multiply, newton_divmod, square
+from .matrix_backends import MATRIX_BACKENDS
+from .parallel_multiplication import parallel_karatsuba_multiplication
+from .queue_stack import (
+    NodePool,
+    QueueArray,
+    QueueLinkedList,
+    QueueUnrolledList,
+    StackArray,
+    StackLinkedList,
+    StackUnrolledList,
+)
+from .radix_conversion import random_operand
+from .shared_ring_buffer import compare_with_multiprocessing_queue
 from .tree_widget import TreesTabWidget
 
 
 class MainWindow(QMainWindow):
+    ASYMMETRY_RATIO = 10
+    LIMB_KARATSUBA_SERIES = 'Алгоритм Карацубы (лимбы)'
+    PARALLEL_KARATSUBA_SERIES = 'Параллельный алгоритм Карацубы (лимбы)'
+    # Показатель в замерах степени по модулю: все биты единичные, то есть худший случай
+    MODEXP_EXPONENT_BITS = 64
+    MPMC_WORKERS = 4
+    SHARED_RING_BLOCK_SIZE = 1024
+
     def __init__(self):
         super().__init__()
         self.main_widget = QWidget()
@@ -48,6 +74,9 @@ class MainWindow(QMainWindow):
         self.current_lm_length = 10
         self.double_validator = QDoubleValidator()
         self.int_validator = QIntValidator()
+        self.benchmark_executor = BenchmarkExecutor(self)
+        self.benchmark_result_handler = None
+        self.benchmark_finished_handler = None
         self.initUI()
         self.show()
 
@@ -67,13 +96,89 @@ class MainWindow(QMainWindow):
         tab1 = self.create_matrix_input_tab()
         tab2 = self.create_data_structures_tab()
         tab3 = self.create_large_multiplication_tab()
-        tab4 = TreesTabWidget()
+        tab4 = TreesTabWidget(start_benchmark=self.start_benchmark)
         self.tabs.addTab(tab1, "1. Исследование производительности алгоритмов")
         self.tabs.addTab(tab2, "2. Исследование программной реализации структур данных")
         self.tabs.addTab(tab3, "3. Алгоритмы длинной арифметики")
         self.tabs.addTab(tab4, "4. Реализация и исследование деревьев")
         self.tabs.setTabsClosable(False)
 
+    def create_benchmark_panel(self):
+        layout = QHBoxLayout()
+
+        self.benchmark_progress = QProgressBar()
+        self.benchmark_progress.setValue(0)
+        layout.addWidget(self.benchmark_progress)
+
+        layout.addWidget(QLabel("Таймаут замера (сек):"))
+        self.benchmark_timeout_input = QLineEdit()
+        self.benchmark_timeout_input.setValidator(self.int_validator)
+        self.benchmark_timeout_input.setText("60")
+        self.benchmark_timeout_input.setFixedWidth(80)
+        layout.addWidget(self.benchmark_timeout_input)
+
+        layout.addWidget(QLabel("Повторов:"))
+        self.benchmark_repeat_input = QLineEdit()
+        self.benchmark_repeat_input.setValidator(self.int_validator)
+        self.benchmark_repeat_input.setText("5")
+        self.benchmark_repeat_input.setFixedWidth(60)
+        layout.addWidget(self.benchmark_repeat_input)
+
+        self.benchmark_cancel_button = QPushButton("Отменить")
+        self.benchmark_cancel_button.setEnabled(False)
+        self.benchmark_cancel_button.clicked.connect(self.benchmark_executor.cancel)
+        layout.addWidget(self.benchmark_cancel_button)
+
+        self.benchmark_executor.result_ready.connect(self.handle_benchmark_result)
+        self.benchmark_executor.progress.connect(self.handle_benchmark_progress)
+        self.benchmark_executor.finished.connect(self.handle_benchmark_finished)
+
+        return layout
+
+    def start_benchmark(self, jobs, on_result, on_finished=None):
+        """Запуск замеров в фоне; on_result вызывается для каждого готового BenchmarkResult."""
+        if self.benchmark_executor.is_running():
+            QMessageBox.warning(self, "Ошибка", "Дождитесь окончания текущих замеров или отмените их")
+            return False
+
+        timeout_text = self.benchmark_timeout_input.text()
+        timeout = int(timeout_text) if timeout_text.isdigit() and int(timeout_text) > 0 else None
+        repeat_text = self.benchmark_repeat_input.text()
+        repeat = int(repeat_text) if repeat_text.isdigit() and int(repeat_text) > 0 else 1
+
+        self.benchmark_result_handler = on_result
+        self.benchmark_finished_handler = on_finished
+        self.benchmark_progress.setMaximum(max(len(jobs), 1))
+        self.benchmark_progress.setValue(0)
+        self.benchmark_cancel_button.setEnabled(True)
+        return self.benchmark_executor.start(jobs, timeout, repeat)
+
+    def handle_benchmark_result(self, result):
+        if self.benchmark_result_handler:
+            self.benchmark_result_handler(result)
+
+    def handle_benchmark_progress(self, done, total):
+        self.benchmark_progress.setMaximum(total)
+        self.benchmark_progress.setValue(done)
+
+    def handle_benchmark_finished(self):
+        self.benchmark_cancel_button.setEnabled(False)
+        if self.benchmark_finished_handler:
+            self.benchmark_finished_handler()
+
+    @staticmethod
+    def plot_measurements(ax, x_values, measurements, label):
+        """Кривая медиан с интерквартильным размахом в виде планок погрешностей."""
+        medians = [measurement.median for measurement in measurements]
+        lower = [median - measurement.quartiles[0] for median, measurement in zip(medians, measurements)]
+        upper = [measurement.quartiles[1] - median for median, measurement in zip(medians, measurements)]
+        ax.errorbar(x_values, medians, yerr=[lower, upper], label=label, marker="o", capsize=3)
+
+    def closeEvent(self, event):
+        self.benchmark_executor.cancel()
+        self.benchmark_executor.wait()
+        super().closeEvent(event)
+
     def create_large_multiplication_tab(self):
         layout = QVBoxLayout()
 
@@ -101,6 +206,24 @@ class MainWindow(QMainWindow):
         calculate_button.clicked.connect(self.run_calculations)
         button_container_layout.addWidget(calculate_button)
 
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Процессов для параллельного умножения:"))
+        self.lm_workers_input = QLineEdit()
+        self.lm_workers_input.setValidator(self.int_validator)
+        self.lm_workers_input.setText(str(os.cpu_count() or 1))
+        self.lm_workers_input.setFixedWidth(60)
+        workers_layout.addWidget(self.lm_workers_input)
+        button_container_layout.addLayout(workers_layout)
+
+        backend_layout = QHBoxLayout()
+        backend_layout.addWidget(QLabel("Ядро для операций BigInt:"))
+        self.lm_backend_combo = QComboBox()
+        for backend in ARITHMETIC_BACKENDS.values():
+            self.lm_backend_combo.addItem(backend.label, backend.name)
+        self.lm_backend_combo.setCurrentIndex(self.lm_backend_combo.findData("auto"))
+        backend_layout.addWidget(self.lm_backend_combo)
+        button_container_layout.addLayout(backend_layout)
+
         button_layout.addLayout(button_container_layout)
         layout.addLayout(button_layout)
 
@@ -135,40 +258,109 @@ class MainWindow(QMainWindow):
                 if text.isdigit() and int(text) > 0:
                     lengths.append(int(text))
 
-        times_classic = []
-        times_karatsuba = []
+        workers_text = self.lm_workers_input.text().strip()
+        workers = int(workers_text) if workers_text.isdigit() and int(workers_text) > 0 else None
+
+        backend = ARITHMETIC_BACKENDS[self.lm_backend_combo.currentData()]
+        exponent = (1 << self.MODEXP_EXPONENT_BITS) - 1
 
+        jobs = []
         for length in lengths:
             num1 = self.generate_large_number(length)
             num2 = self.generate_large_number(length)
-
-            start_time = time.time()
-            classic_large_multiplication(num1, num2)
-            classic_time = time.time() - start_time
-            times_classic.append(classic_time)
-
-            start_time = time.time()
-            karatsuba(num1, num2)
-            karatsuba_time = time.time() - start_time
-            times_karatsuba.append(karatsuba_time)
-
-        self.plot_lm_graph(lengths, times_classic, times_karatsuba)
+            jobs.append(
+                BenchmarkJob(
+                    'Классический алгоритм',
+                    length,
+                    classic_digit_multiplication,
+                    (num1, num2),
+                    prepare=decimal_digit_operands,
+                )
+            )
+            jobs.append(BenchmarkJob('Алгоритм Карацубы', length, karatsuba, (num1, num2)))
+            jobs.append(
+                BenchmarkJob('Классический алгоритм (лимбы)', length, limb_schoolbook_multiplication, (num1, num2))
+            )
+            jobs.append(BenchmarkJob(self.LIMB_KARATSUBA_SERIES, length, limb_karatsuba_multiplication, (num1, num2)))
+            jobs.append(
+                BenchmarkJob(
+                    self.PARALLEL_KARATSUBA_SERIES, length, parallel_karatsuba_multiplication, (num1, num2, workers)
+                )
+            )
+            jobs.append(BenchmarkJob('Алгоритм Тоома-Кука 3', length, limb_toom3_multiplication, (num1, num2)))
+            jobs.append(BenchmarkJob('Умножение через NTT', length, limb_ntt_multiplication, (num1, num2)))
+            jobs.append(BenchmarkJob('Автовыбор алгоритма', length, auto_multiplication, (num1, num2)))
+            jobs.append(BenchmarkJob('Алгоритм Карацубы (оптимизированный)', length, karatsuba_fast, (num1, num2)))
+
+            # Несимметричные множители: второй в ASYMMETRY_RATIO раз короче
+            short = self.generate_large_number(max(1, length // self.ASYMMETRY_RATIO))
+            jobs.append(BenchmarkJob(f'Алгоритм Карацубы, 1:{self.ASYMMETRY_RATIO}', length, karatsuba, (num1, short)))
+            jobs.append(
+                BenchmarkJob(
+                    f'Алгоритм Карацубы (оптимизированный), 1:{self.ASYMMETRY_RATIO}',
+                    length,
+                    karatsuba_fast,
+                    (num1, short),
+                )
+            )
+
+            # Операции BigInt на выбранном ядре; делимое вдвое длиннее делителя, модуль нечётный
+            dividend = self.generate_large_number(2 * length)
+            operations = (
+                ('Умножение', multiply, (num1, num2, backend.name)),
+                ('Возведение в квадрат', square, (num1, backend.name)),
+                ('Деление (обратная по Ньютону)', newton_divmod, (dividend, num1, backend.name)),
+                ('Степень по модулю (Монтгомери)', modular_pow, (num2, exponent, num1 | 1, backend.name, 'montgomery')),
+                ('Степень по модулю (Барретт)', modular_pow, (num2, exponent, num1 | 1, backend.name, 'barrett')),
+            )
+            for operation, function, arguments in operations:
+                jobs.append(BenchmarkJob(f'{operation}, BigInt ({backend.label})', length, function, arguments))
+
+        self.lm_times = {}
+        self.start_benchmark(jobs, self.add_lm_result)
+
+    def add_lm_result(self, result):
+        if result.error is None:
+            self.lm_times.setdefault(result.job.series, {})[result.job.size] = result.measurement
+        self.plot_lm_graph(self.lm_times)
 
     @staticmethod
     def generate_large_number(length):
-        return random.randint(10 ** (length - 1), 10 ** length - 1)
+        """Случайное число из length цифр без построения десятичной записи."""
+        return random_operand(length)
 
-    def plot_lm_graph(self, lengths, times_classic, times_karatsuba):
+    def plot_lm_graph(self, times):
         self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.plot(lengths, times_classic, label='Классический алгоритм', marker='o')
-        ax.plot(lengths, times_karatsuba, label='Алгоритм Карацубы', marker='o')
+        speedup = self.parallel_speedup(times)
+        ax = self.figure.add_subplot(211 if speedup else 111)
+        for label, series_times in times.items():
+            self.plot_measurements(ax, list(series_times), list(series_times.values()), label)
         ax.set_xlabel('Длина числа')
-        ax.set_ylabel('Время (сек.)')
+        ax.set_ylabel('Медиана времени (сек.)')
         ax.set_title('Сравнение времени выполнения алгоритмов')
-        ax.legend()
+        if ax.lines:
+            ax.legend()
+
+        if speedup:
+            speedup_ax = self.figure.add_subplot(212)
+            speedup_ax.plot(list(speedup), list(speedup.values()), marker='o')
+            speedup_ax.axhline(1, color='gray', linestyle='--')
+            speedup_ax.set_xlabel('Длина числа')
+            speedup_ax.set_ylabel('Ускорение')
+            speedup_ax.set_title('Ускорение параллельного алгоритма Карацубы')
+            self.figure.tight_layout()
         self.canvas.draw()
 
+    def parallel_speedup(self, times):
+        """Отношение медиан последовательного и параллельного алгоритма Карацубы по длинам чисел."""
+        sequential = times.get(self.LIMB_KARATSUBA_SERIES, {})
+        parallel = times.get(self.PARALLEL_KARATSUBA_SERIES, {})
+        return {
+            length: sequential[length].median / parallel[length].median
+            for length in sorted(parallel)
+            if length in sequential and parallel[length].median > 0
+        }
+
     def create_data_structures_tab(self):
         tab2 = QWidget()
 
@@ -237,10 +429,6 @@ class MainWindow(QMainWindow):
             else 0
         )
 
-        stack_array = StackArray()
-        queue_array = QueueArray(array_size)
-        array_result = self.test_stack_and_queue(stack_array, queue_array, array_size)
-
         stack_array_elements = [i for i in range(array_size)]
         queue_array_elements = [i for i in range(array_size)]
         array_graphic_text = (
@@ -249,12 +437,6 @@ class MainWindow(QMainWindow):
         )
         self.array_display.setText(array_graphic_text)
 
-        stack_linked = StackLinkedList()
-        queue_linked = QueueLinkedList()
-        linked_result = self.test_stack_and_queue(
-            stack_linked, queue_linked, linked_list_size
-        )
-
         stack_linked_elements = [i for i in range(linked_list_size)]
         queue_linked_elements = [i for i in range(linked_list_size)]
         linked_list_graphic_text = (
@@ -263,43 +445,141 @@ class MainWindow(QMainWindow):
         )
         self.linked_list_display.setText(linked_list_graphic_text)
 
-        result = f"Тестирование производительности для массива:\n{array_result}\n\n"
-        result += (
-            f"Тестирование производительности для связного списка:\n{linked_result}\n"
+        jobs = [
+            BenchmarkJob(
+                "массива", array_size, self.test_stack_and_queue,
+                (StackArray(), QueueArray(array_size), array_size), return_value=True,
+            ),
+            BenchmarkJob(
+                "массива (хранилище array('q'))", array_size, self.test_stack_and_queue,
+                (StackArray(), QueueArray(array_size, typecode="q"), array_size), return_value=True,
+            ),
+            BenchmarkJob(
+                "связного списка", linked_list_size, self.test_stack_and_queue,
+                (StackLinkedList(), QueueLinkedList(), linked_list_size), return_value=True,
+            ),
+            BenchmarkJob(
+                "связного списка с пулом узлов", linked_list_size, self.test_stack_and_queue,
+                (StackLinkedList(NodePool()), QueueLinkedList(NodePool()), linked_list_size), return_value=True,
+            ),
+            BenchmarkJob(
+                "развёрнутого связного списка", linked_list_size, self.test_stack_and_queue,
+                (StackUnrolledList(), QueueUnrolledList(), linked_list_size), return_value=True,
+            ),
+        ]
+        jobs.append(
+            BenchmarkJob(
+                f"очередей между потоками ({self.MPMC_WORKERS} производителя, {self.MPMC_WORKERS} потребителя)",
+                array_size, self.test_concurrent_queues, (array_size, self.MPMC_WORKERS), return_value=True,
+            )
         )
+        jobs.append(
+            BenchmarkJob(
+                "межпроцессного кольцевого буфера", array_size, self.test_shared_ring_buffer,
+                (array_size,), return_value=True,
+            )
+        )
+        self.output_area.clear()
+        self.start_benchmark(jobs, self.add_data_structures_result)
 
-        self.output_area.setText(result)
+    def add_data_structures_result(self, result):
+        text = result.value if result.error is None else f"  Ошибка: {result.error}\n"
+        self.output_area.append(f"Тестирование производительности для {result.job.series}:\n{text}")
 
     @staticmethod
     def test_stack_and_queue(stack, queue, n):
         result = ""
 
-        start_time = time.time()
-        for i in range(n):
-            stack.push(i)
-        push_time = time.time() - start_time
+        def push_all():
+            for i in range(n):
+                stack.push(i)
+
+        def pop_all():
+            for i in range(n):
+                stack.pop()
+
+        def enqueue_all():
+            for i in range(n):
+                queue.enqueue(i)
+
+        def dequeue_all():
+            for i in range(n):
+                queue.dequeue()
+
+        # Память считается до замеров времени, пока структуры (и пулы узлов) пусты;
+        # элементы создаются заранее, чтобы в прирост попала только сама структура
+        items = list(range(n))
+
+        def push_items():
+            for item in items:
+                stack.push(item)
+
+        def enqueue_items():
+            for item in items:
+                queue.enqueue(item)
+
+        stack_memory = measure_memory(push_items)
+        queue_memory = measure_memory(enqueue_items)
+        pop_all()
+        dequeue_all()
+
+        # Каждый повтор начинается с одинакового состояния: setup опустошает или заполняет структуру
+        push_time = measure(push_all, setup=pop_all)
+        pop_time = measure(pop_all, setup=push_all)
 
-        start_time = time.time()
-        for i in range(n):
-            stack.pop()
-        pop_time = time.time() - start_time
+        result += f"  Стек (push): {push_time}\n"
+        result += f"  Стек (pop): {pop_time}\n"
 
-        result += f"  Стек (push): {push_time:.6f} с\n"
-        result += f"  Стек (pop): {pop_time:.6f} с\n"
+        enqueue_time = measure(enqueue_all, setup=dequeue_all)
+        dequeue_time = measure(dequeue_all, setup=enqueue_all)
 
-        start_time = time.time()
-        for i in range(n):
-            queue.enqueue(i)
-        enqueue_time = time.time() - start_time
+        result += f"  Очередь (enqueue): {enqueue_time}\n"
+        result += f"  Очередь (dequeue): {dequeue_time}\n"
+        if n:
+            result += f"  Память стека: {stack_memory / n:.1f} байт на элемент\n"
+            result += f"  Память очереди: {queue_memory / n:.1f} байт на элемент\n"
 
-        start_time = time.time()
-        for i in range(n):
-            queue.dequeue()
-        dequeue_time = time.time() - start_time
+        if hasattr(queue, "enqueue_many"):
+            items = list(range(n))
 
-        result += f"  Очередь (enqueue): {enqueue_time:.6f} с\n"
-        result += f"  Очередь (dequeue): {dequeue_time:.6f} с\n"
+            def enqueue_bulk():
+                queue.enqueue_many(items)
 
+            def dequeue_bulk():
+                queue.dequeue_many(n)
+
+            enqueue_many_time = measure(enqueue_bulk, setup=dequeue_bulk)
+            dequeue_many_time = measure(dequeue_bulk, setup=enqueue_bulk)
+
+            result += f"  Очередь (enqueue_many): {enqueue_many_time}\n"
+            result += f"  Очередь (dequeue_many): {dequeue_many_time}\n"
+
+        return result
+
+    @staticmethod
+    def test_concurrent_queues(n, workers):
+        """Пропускная способность очередей: n элементов от workers производителей к workers потребителям."""
+        result = ""
+        for label, queue_class in (
+            ("TwoLockQueue", TwoLockQueue),
+            ("BoundedBlockingQueue", BoundedBlockingQueue),
+            ("queue.Queue", Queue),
+        ):
+            measurement = mpmc_throughput(queue_class, n, workers, workers)
+            result += f"  {label} (потоки): {measurement}, {n / measurement.median:.0f} элементов/с\n"
+        for label, queue_class in (("AsyncQueue", AsyncQueue), ("asyncio.Queue", asyncio.Queue)):
+            measurement = async_mpmc_throughput(queue_class, n, workers, workers)
+            result += f"  {label} (сопрограммы): {measurement}, {n / measurement.median:.0f} элементов/с\n"
+        return result
+
+    @classmethod
+    def test_shared_ring_buffer(cls, n):
+        """Передача n записей из дочернего процесса: SharedRingBuffer против multiprocessing.Queue."""
+        result = ""
+        for label, shape in (("числа", ()), (f"блоки по {cls.SHARED_RING_BLOCK_SIZE} чисел", cls.SHARED_RING_BLOCK_SIZE)):
+            ring_time, queue_time = compare_with_multiprocessing_queue(n, shape)
+            result += f"  SharedRingBuffer ({label}): {ring_time}, {n / ring_time.median:.0f} записей/с\n"
+            result += f"  multiprocessing.Queue ({label}): {queue_time}, {n / queue_time.median:.0f} записей/с\n"
         return result
 
     def create_matrix_input_tab(self):
@@ -316,21 +596,14 @@ class MainWindow(QMainWindow):
         checkbox_group = QGroupBox("Выберите алгоритмы")
         checkbox_layout = QVBoxLayout(checkbox_group)
 
-        self.classic_checkbox = QCheckBox("Классическое умножение")
-        self.strassen_checkbox = QCheckBox("Умножение Штрассена")
-        self.custom_strassen_checkbox = QCheckBox("Свой Штрассен")
-        self.numpy_strassen_checkbox = QCheckBox("Умножение Numpy")
-        self.scipy_checkbox = QCheckBox("Умножение Scipy")
-        self.sumpy_checkbox = QCheckBox("Умножение Sumpy")
-        self.tensorflow_checkbox = QCheckBox("Умножение TensorFlow")
-
-        checkbox_layout.addWidget(self.classic_checkbox)
-        checkbox_layout.addWidget(self.strassen_checkbox)
-        checkbox_layout.addWidget(self.custom_strassen_checkbox)
-        checkbox_layout.addWidget(self.numpy_strassen_checkbox)
-        checkbox_layout.addWidget(self.scipy_checkbox)
-        checkbox_layout.addWidget(self.sumpy_checkbox)
-        checkbox_layout.addWidget(self.tensorflow_checkbox)
+        self.matrix_backend_checkboxes = {}
+        for backend in MATRIX_BACKENDS.values():
+            checkbox = QCheckBox(backend.label)
+            if not backend.is_available():
+                checkbox.setEnabled(False)
+                checkbox.setToolTip(f"Не установлено: {', '.join(backend.requires)}")
+            self.matrix_backend_checkboxes[backend.name] = checkbox
+            checkbox_layout.addWidget(checkbox)
 
         left_layout.addWidget(checkbox_group)
 
@@ -414,19 +687,16 @@ class MainWindow(QMainWindow):
         self.matrix_size_fields.addLayout(matrix_input_layout)
 
     def calculate_matrices(self):
-        sizes = []
-        classic_times = []
-        strassen_times = []
-        numpy_times = []
-        custom_strassen_times = []
-        scipy_times = []
-        sumpy_times = []
-        tensorflow_times = []
-
-        self.graph_canvas.figure.clear()
-
-        results_text = ""
-
+        selected_backends = [
+            backend
+            for backend in MATRIX_BACKENDS.values()
+            if self.matrix_backend_checkboxes[backend.name].isChecked()
+        ]
+        self.matrix_sizes = []
+        self.matrix_times = {backend.name: {} for backend in selected_backends}
+        self.matrix_results_text = ""
+
+        jobs = []
         for layout in self.matrix_size_fields.children():
             if isinstance(layout, QHBoxLayout):
                 rows_input = layout.itemAt(1).widget()
@@ -434,117 +704,66 @@ class MainWindow(QMainWindow):
                 rows = int(rows_input.text() or "0")
                 cols = int(cols_input.text() or "0")
 
-                if rows == cols and rows > 0:
+                if rows > 0 and cols > 0:
                     matrix = np.random.randint(0, 10, (rows, cols))
-                    results_text += f"Матрица {rows}x{cols}:\n"
-
-                    if self.classic_checkbox.isChecked():
-                        start_time = time.time()
-                        classic_multiplication(matrix, matrix)
-                        classic_time = time.time() - start_time
-                        classic_times.append(classic_time)
-                        results_text += (
-                            f"Классическое умножение: {classic_time:.4f} сек\n"
-                        )
-
-                    if self.strassen_checkbox.isChecked():
-                        start_time = time.time()
-                        strassen_multiplication(list(matrix), list(matrix))
-                        strassen_time = time.time() - start_time
-                        strassen_times.append(strassen_time)
-                        results_text += (
-                            f"Умножение Штрассена: {strassen_time:.4f} сек\n"
+                    second_matrix = np.random.randint(0, 10, (cols, rows))
+                    size = f"{rows}x{cols}"
+                    self.matrix_sizes.append(size)
+
+                    for backend in selected_backends:
+                        jobs.append(
+                            BenchmarkJob(
+                                backend.name, size, backend.function,
+                                (matrix, second_matrix), prepare=backend.arguments,
+                            )
                         )
 
-                    if self.custom_strassen_checkbox.isChecked():
-                        start_time = time.time()
-                        custom_strassen_multiplication(matrix, matrix)
-                        custom_strassen_time = time.time() - start_time
-                        custom_strassen_times.append(custom_strassen_time)
-                        results_text += (
-                            f"Написанный Штрассен: {custom_strassen_time:.4f} сек\n"
-                        )
+                else:
+                    self.matrix_results_text += f"Пропуск пустой матрицы {rows}x{cols}\n\n"
 
-                    if self.numpy_strassen_checkbox.isChecked():
-                        start_time = time.time()
-                        numpy_multiplication(matrix, matrix)
-                        numpy_time = time.time() - start_time
-                        numpy_times.append(numpy_time)
-                        results_text += f"Умножение Numpy: {numpy_time:.4f} сек\n"
-
-                    if self.scipy_checkbox.isChecked():
-                        start_time = time.time()
-                        scipy_multiplication(matrix, matrix)
-                        scipy_time = time.time() - start_time
-                        scipy_times.append(scipy_time)
-                        results_text += f"Умножение Scipy: {scipy_time:.4f} сек\n"
-
-                    if self.sumpy_checkbox.isChecked():
-                        start_time = time.time()
-                        sympy_multiplication(matrix, matrix)
-                        sumpy_time = time.time() - start_time
-                        sumpy_times.append(sumpy_time)
-                        results_text += f"Умножение Sumpy: {sumpy_time:.4f} сек\n"
-
-                    if self.tensorflow_checkbox.isChecked():
-                        start_time = time.time()
-                        tensorflow_multiplication(matrix, matrix)
-                        tensorflow_time = time.time() - start_time
-                        tensorflow_times.append(tensorflow_time)
-                        results_text += (
-                            f"Умножение TensorFlow: {tensorflow_time:.4f} сек\n"
-                        )
+        self.graph_canvas.figure.clear()
+        self.graph_canvas.draw()
+        self.explanation_text_edit.setText(self.matrix_results_text)
+        self.last_matrix_size = None
+        self.start_benchmark(jobs, self.add_matrix_result)
+
+    def add_matrix_result(self, result):
+        job = result.job
+        if job.size != self.last_matrix_size:
+            if self.last_matrix_size is not None:
+                self.matrix_results_text += "\n"
+            self.matrix_results_text += f"Матрица {job.size}:\n"
+            self.last_matrix_size = job.size
+
+        label = MATRIX_BACKENDS[job.series].label
+        if result.error is None:
+            self.matrix_times[job.series][job.size] = result.measurement
+            self.matrix_results_text += f"{label}: {result.measurement}\n"
+        else:
+            self.matrix_results_text += f"{label}: {result.error}\n"
 
-                    sizes.append(rows)
-                    results_text += "\n"
+        self.explanation_text_edit.setText(self.matrix_results_text)
+        self.graph_canvas.figure.clear()
+        self.plot_graph(self.matrix_sizes, self.matrix_times)
 
-                else:
-                    results_text += f"Пропуск неквадратной матрицы {rows}x{cols}\n\n"
-
-        self.plot_graph(
-            sizes,
-            classic_times,
-            strassen_times,
-            custom_strassen_times,
-            scipy_times,
-            sumpy_times,
-            tensorflow_times,
-            numpy_times,
-        )
-        self.explanation_text_edit.setText(results_text)
-
-    def plot_graph(
-            self,
-            sizes,
-            classic_times,
-            strassen_times,
-            custom_strassen_times,
-            scipy_times,
-            sumpy_times,
-            tensorflow_times,
-            numpy_times,
-    ):
+    def plot_graph(self, sizes, times):
         ax = self.graph_canvas.figure.add_subplot(111)
 
-        if sizes and classic_times:
-            ax.plot(sizes, classic_times, label="Классическое умножение", marker="o")
-        if sizes and strassen_times:
-            ax.plot(sizes, strassen_times, label="Умножение Штрассена", marker="o")
-        if sizes and custom_strassen_times:
-            ax.plot(sizes, custom_strassen_times, label="Свой Штрассен", marker="o")
-        if sizes and numpy_times:
-            ax.plot(sizes, numpy_times, label="Умножение Numpy", marker="o")
-        if sizes and scipy_times:
-            ax.plot(sizes, scipy_times, label="Умножение Scipy", marker="o")
-        if sizes and sumpy_times:
-            ax.plot(sizes, sumpy_times, label="Умножение Sumpy", marker="o")
-        if sizes and tensorflow_times:
-            ax.plot(sizes, tensorflow_times, label="Умножение TensorFlow", marker="o")
+        for name, backend_times in times.items():
+            measured_sizes = [size for size in sizes if size in backend_times]
+            if measured_sizes:
+                self.plot_measurements(
+                    ax,
+                    measured_sizes,
+                    [backend_times[size] for size in measured_sizes],
+                    MATRIX_BACKENDS[name].label,
+                )
 
         ax.set_xlabel("Размер матрицы")
-        ax.set_ylabel("Время выполнения (сек)")
+        ax.set_ylabel("Медиана времени выполнения (сек)")
         ax.set_title("Сравнение времени выполнения алгоритмов умножения матриц")
-        ax.legend()
+        if ax.lines:
+            ax.legend()
 
         self.graph_canvas.draw()
 
@@ -552,6 +771,7 @@ class MainWindow(QMainWindow):
         self.init_window()
         self.init_tabs()
         self.main_layout.addWidget(self.tabs, 1)
+        self.main_layout.addLayout(self.create_benchmark_panel())
         self.setCentralWidget(self.main_widget)
 
         self.init_stylesheet()
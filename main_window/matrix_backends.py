@@ -0,0 +1,96 @@
+from importlib import import_module
+from importlib.util import find_spec
+
+from .matrix_calculations import (
+    TensorFlowMultiplier,
+    blocked_multiplication,
+    classic_multiplication,
+    custom_strassen_multiplication,
+    numpy_multiplication,
+    parallel_strassen_multiplication,
+    scipy_multiplication,
+    strassen_multiplication,
+    sympy_multiplication,
+    tensorflow_multiplier,
+)
+
+
+class MatrixBackend:
+    """
+    Алгоритм умножения матриц для вкладки сравнения.
+    requires - модули, без которых алгоритм не работает: при регистрации они только проверяются
+    на наличие, а импортируются в arguments перед первым запуском, вне замера времени.
+    prepare(a, b) готовит операнды, тоже вне замера.
+    """
+
+    def __init__(self, name, label, function, requires=(), prepare=None):
+        self.name = name
+        self.label = label
+        self.function = function
+        self.requires = requires
+        self.prepare = prepare
+
+    def is_available(self):
+        return all(find_spec(module) is not None for module in self.requires)
+
+    def arguments(self, a_matrix, b_matrix):
+        for module in self.requires:
+            import_module(module)
+        if self.prepare is None:
+            return a_matrix, b_matrix
+        return self.prepare(a_matrix, b_matrix)
+
+
+MATRIX_BACKENDS = {}
+
+
+def register_matrix_backend(backend):
+    MATRIX_BACKENDS[backend.name] = backend
+    return backend
+
+
+def as_lists(a_matrix, b_matrix):
+    return a_matrix.tolist(), b_matrix.tolist()
+
+
+def tensorflow_cold_multiplication(a_matrix, b_matrix):
+    """Умножение новым TensorFlowMultiplier: в замер входят трассировка, загрузка и копирование результата."""
+    return TensorFlowMultiplier().multiply(a_matrix, b_matrix)
+
+
+def upload_tensors(a_matrix, b_matrix):
+    a_tensor = tensorflow_multiplier.upload(a_matrix)
+    b_tensor = tensorflow_multiplier.upload(b_matrix)
+    tensorflow_multiplier.warm_up(a_tensor, b_tensor)
+    return a_tensor, b_tensor
+
+
+def tensorflow_warm_multiplication(a_tensor, b_tensor):
+    """Умножение уже загруженных тензоров скомпилированным ядром без копирования результата."""
+    return tensorflow_multiplier.multiply(a_tensor, b_tensor, to_numpy=False)
+
+
+register_matrix_backend(MatrixBackend("classic", "Классическое умножение", classic_multiplication))
+register_matrix_backend(MatrixBackend("blocked", "Блочное умножение", blocked_multiplication))
+register_matrix_backend(MatrixBackend("strassen", "Умножение Штрассена", strassen_multiplication, prepare=as_lists))
+register_matrix_backend(MatrixBackend("custom_strassen", "Свой Штрассен", custom_strassen_multiplication))
+register_matrix_backend(
+    MatrixBackend("parallel_strassen", "Параллельный Штрассен", parallel_strassen_multiplication)
+)
+register_matrix_backend(MatrixBackend("numpy", "Умножение Numpy", numpy_multiplication))
+register_matrix_backend(MatrixBackend("scipy", "Умножение Scipy", scipy_multiplication, requires=("scipy.linalg",)))
+register_matrix_backend(MatrixBackend("sympy", "Умножение Sumpy", sympy_multiplication, requires=("sympy",)))
+register_matrix_backend(
+    MatrixBackend(
+        "tensorflow_cold", "TensorFlow (холодный запуск)", tensorflow_cold_multiplication, requires=("tensorflow",)
+    )
+)
+register_matrix_backend(
+    MatrixBackend(
+        "tensorflow_warm",
+        "TensorFlow (прогретый запуск)",
+        tensorflow_warm_multiplication,
+        requires=("tensorflow",),
+        prepare=upload_tensors,
+    )
+)
@@ -1,9 +1,15 @@
-from math import ceil, log
+import os
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, repeat
+from numbers import Integral
+from operator import add, mul, sub
+from time import perf_counter
 
 import numpy as np
-from scipy import linalg
-from sympy import Matrix
-import tensorflow as tf
+
+# SciPy, SymPy и TensorFlow импортируются внутри функций, которым они нужны:
+# импорт TensorFlow занимает секунды, и платить за него стоит только при выборе этого алгоритма.
 
 
 def classic_multiplication(a, b):
@@ -24,14 +30,157 @@ def classic_multiplication(a, b):
     return result
 
 
+BLOCK_SIZE_CANDIDATES = (32, 64, 128, 256)
+STRASSEN_LEAF_CANDIDATES = (32, 64, 128, 256)
+_tuned_block_sizes = {}
+_tuned_leaf_sizes = {}
+
+
+def _fastest_parameter(function, sample, candidates):
+    """Возвращает параметр из candidates, с которым function(sample, sample, parameter) работает быстрее всего."""
+    best_parameter, best_time = candidates[0], None
+    for parameter in candidates:
+        start_time = perf_counter()
+        function(sample, sample, parameter)
+        elapsed = perf_counter() - start_time
+        if best_time is None or elapsed < best_time:
+            best_parameter, best_time = parameter, elapsed
+    return best_parameter
+
+
+def tune_block_size(dtype=np.int64, sample_size=256, candidates=BLOCK_SIZE_CANDIDATES):
+    """
+    Подбор размера блока для blocked_multiplication.
+    Замеряет каждый кандидат на тестовой матрице и запоминает лучший для типа данных.
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in _tuned_block_sizes:
+        sample = np.ones((sample_size, sample_size), dtype=dtype)
+        _tuned_block_sizes[dtype] = _fastest_parameter(blocked_multiplication, sample, candidates)
+    return _tuned_block_sizes[dtype]
+
+
+def tune_strassen_leaf_size(dtype=np.int64, sample_size=512, candidates=STRASSEN_LEAF_CANDIDATES):
+    """
+    Подбор размера листа, начиная с которого custom_strassen_multiplication переходит на BLAS.
+    Результат запоминается для типа данных.
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in _tuned_leaf_sizes:
+        sample = np.ones((sample_size, sample_size), dtype=dtype)
+        _tuned_leaf_sizes[dtype] = _fastest_parameter(custom_strassen_multiplication, sample, candidates)
+    return _tuned_leaf_sizes[dtype]
+
+
+def blocked_multiplication(a_matrix, b_matrix, block_size=None):
+    """
+    Блочное (тайловое) умножение матриц.
+    Операнды разбиваются на блоки размера block_size, чтобы они помещались в кэш,
+    ссылки на полосы строк вынесены из внутреннего цикла, а каждый блок
+    накапливается векторизованным ядром NumPy.
+    Если block_size не задан, он подбирается через tune_block_size.
+    """
+    a_matrix = np.asarray(a_matrix)
+    b_matrix = np.asarray(b_matrix)
+    rows_a, cols_a = a_matrix.shape
+    rows_b, cols_b = b_matrix.shape
+
+    if cols_a != rows_b:
+        raise ValueError("Число столбцов первой матрицы должно быть равно числу строк второй матрицы.")
+
+    if block_size is None:
+        block_size = tune_block_size(np.result_type(a_matrix, b_matrix))
+
+    result = np.zeros((rows_a, cols_b), dtype=np.result_type(a_matrix, b_matrix))
+    for i in range(0, rows_a, block_size):
+        a_rows = a_matrix[i:i + block_size]
+        c_rows = result[i:i + block_size]
+        for k in range(0, cols_a, block_size):
+            a_block = a_rows[:, k:k + block_size]
+            b_rows = b_matrix[k:k + block_size]
+            for j in range(0, cols_b, block_size):
+                c_rows[:, j:j + block_size] += a_block @ b_rows[:, j:j + block_size]
+
+    return result
+
+
 def numpy_multiplication(a_matrix, b_matrix):
     return np.dot(a_matrix, b_matrix)
 
 
-def scipy_multiplication(A, B):
-    """Умножение матриц с использованием библиотеки SciPy."""
-    result = linalg.blas.sgemm(1.0, A, B)
-    return 1
+BLAS_DTYPES = tuple(np.dtype(char) for char in "fdFD")
+# Наибольшее целое, до которого все целые числа точно представимы в float64
+EXACT_FLOAT64_INTEGER = 2 ** 53
+
+
+def _blas_gemm(a, b, out=None):
+    """
+    Вызов sgemm/dgemm/cgemm/zgemm по типу операндов без скрытых копий.
+    Для C-упорядоченных матриц считается C^T = B^T A^T: транспонированные
+    представления уже Fortran-упорядочены, а результат получается C-упорядоченным.
+    """
+    transposed = a.flags.c_contiguous and b.flags.c_contiguous and not (a.flags.f_contiguous and b.flags.f_contiguous)
+    if transposed:
+        a, b = b.T, a.T
+        target = out.T if out is not None else None
+    else:
+        a, b = np.asfortranarray(a), np.asfortranarray(b)
+        target = out
+
+    from scipy.linalg import blas
+
+    gemm = blas.get_blas_funcs("gemm", (a, b))
+    if target is None:
+        result = gemm(1.0, a, b)
+        return result.T if transposed else result
+
+    result = gemm(1.0, a, b, beta=0.0, c=target, overwrite_c=True)
+    if result is not target:
+        np.copyto(target, result)
+    return out
+
+
+def _integer_blas_multiplication(a, b, out=None):
+    """
+    Точное умножение целочисленных матриц.
+    Если все промежуточные суммы помещаются в мантиссу float64, считается через dgemm,
+    иначе - через целочисленный np.matmul.
+    """
+    dtype = np.result_type(a, b)
+    max_a = int(np.abs(a).max(initial=0))
+    max_b = int(np.abs(b).max(initial=0))
+    if max_a * max_b * a.shape[1] > EXACT_FLOAT64_INTEGER:
+        return np.matmul(a, b, out=out)
+
+    result = _blas_gemm(a.astype(np.float64), b.astype(np.float64))
+    if out is None:
+        return result.astype(dtype)
+    np.copyto(out, result, casting="unsafe")
+    return out
+
+
+def scipy_multiplication(A, B, out=None):
+    """
+    Умножение матриц через BLAS из библиотеки SciPy.
+    Функция gemm выбирается по типу данных (sgemm/dgemm/cgemm/zgemm),
+    целые матрицы умножаются точно, а типы без своей функции BLAS (например, float16)
+    повышаются до float32. Если передан out, результат пишется в него.
+    """
+    a = np.asarray(A)
+    b = np.asarray(B)
+    if a.shape[1] != b.shape[0]:
+        raise ValueError("Число столбцов первой матрицы должно быть равно числу строк второй матрицы.")
+
+    dtype = np.result_type(a, b)
+    if dtype.kind in "biu":
+        return _integer_blas_multiplication(a, b, out)
+
+    if dtype not in BLAS_DTYPES:
+        dtype = np.result_type(dtype, np.float32)
+        if dtype not in BLAS_DTYPES:
+            return np.matmul(a, b, out=out)
+
+    return _blas_gemm(a.astype(dtype, copy=False), b.astype(dtype, copy=False), out)
 
 
 def sympy_multiplication(A, B):
@@ -39,77 +188,252 @@ def sympy_multiplication(A, B):
     Умножение матриц с использованием библиотеки SymPy.
     Символьное умножение
     """
+    from sympy import Matrix
+
     A_matrix = Matrix(A)
     B_matrix = Matrix(B)
     result = A_matrix * B_matrix
     return result
 
 
+class TensorFlowMultiplier:
+    """
+    Умножение матриц через TensorFlow с переиспользованием скомпилированных ядер.
+    Для каждой сигнатуры (форма A, форма B, тип) один раз трассируется tf.function,
+    операнды можно заранее загрузить в тензоры через upload и переиспользовать между запусками.
+    """
+
+    def __init__(self):
+        self.kernels = {}
+
+    def kernel(self, shape_a, shape_b, dtype):
+        import tensorflow as tf
+
+        signature = (tuple(shape_a), tuple(shape_b), tf.as_dtype(dtype))
+        if signature not in self.kernels:
+            matmul = tf.function(
+                lambda a, b: tf.linalg.matmul(a, b),
+                input_signature=(tf.TensorSpec(shape_a, signature[2]), tf.TensorSpec(shape_b, signature[2])),
+            )
+            self.kernels[signature] = matmul.get_concrete_function()
+        return self.kernels[signature]
+
+    @staticmethod
+    def upload(matrix):
+        """Загрузка матрицы в тензор, который можно передавать в multiply повторно без копирования."""
+        import tensorflow as tf
+
+        return matrix if isinstance(matrix, tf.Tensor) else tf.convert_to_tensor(matrix)
+
+    def multiply(self, A, B, to_numpy=True):
+        """
+        Умножение A на B. Если to_numpy=False, результат остаётся тензором
+        и не копируется обратно в память NumPy.
+        """
+        import tensorflow as tf
+
+        a_tensor = self.upload(A)
+        b_tensor = self.upload(B)
+        if a_tensor.dtype != b_tensor.dtype:
+            b_tensor = tf.cast(b_tensor, a_tensor.dtype)
+        result = self.kernel(a_tensor.shape, b_tensor.shape, a_tensor.dtype)(a_tensor, b_tensor)
+        return result.numpy() if to_numpy else result
+
+    def warm_up(self, A, B):
+        """Трассировка ядра и один прогон, чтобы последующие замеры не включали компиляцию."""
+        self.multiply(A, B, to_numpy=False)
+
+
+tensorflow_multiplier = TensorFlowMultiplier()
+
+
 def tensorflow_multiplication(A, B):
     """
     Умножение матриц с использованием библиотеки TensorFlow.
     Оптимизированное умножение на GPU/CPU
     """
-    A_tensor = tf.constant(A)
-    B_tensor = tf.constant(B)
-    result = tf.matmul(A_tensor, B_tensor)
-    return result.numpy()
-
+    return tensorflow_multiplier.multiply(A, B)
 
-def pad_matrix(a_matrix):
-    (rows, cols) = a_matrix.shape
-    new_size = max(rows, cols)
 
-    # Если матрица уже имеет чётные размеры, возвратим её как есть
-    if rows % 2 == 0 and cols % 2 == 0:
+def pad_matrix(a_matrix, rows, cols):
+    """Дополнение матрицы нулями до размера rows x cols (без копии, если размер уже подходит)."""
+    if a_matrix.shape == (rows, cols):
         return a_matrix
 
-    # Если размер нечётный, увеличиваем до чётного
-    if new_size % 2 != 0:
-        new_size += 1
-
-    # Создаём новую матрицу с увеличенным размером и заполняем нулями
-    padded_matrix = np.zeros((new_size, new_size), dtype=a_matrix.dtype)
-    padded_matrix[:rows, :cols] = a_matrix  # Копируем исходную матрицу
-
+    padded_matrix = np.zeros((rows, cols), dtype=a_matrix.dtype)
+    padded_matrix[:a_matrix.shape[0], :a_matrix.shape[1]] = a_matrix
     return padded_matrix
 
 
-def custom_strassen_multiplication(a_matrix, b_matrix):
-    original_size = a_matrix.shape
+def strassen_levels(rows, inner, cols, leaf_size):
+    """Число уровней рекурсии Штрассена, после которых наименьшая сторона блока не больше leaf_size."""
+    levels = 0
+    while min(rows, inner, cols) > leaf_size:
+        rows, inner, cols = (rows + 1) // 2, (inner + 1) // 2, (cols + 1) // 2
+        levels += 1
+    return levels
 
-    if len(a_matrix) % 2 != 0 or len(a_matrix[0]) % 2 != 0:
-        a_matrix = pad_matrix(a_matrix)
-        b_matrix = pad_matrix(b_matrix)
 
-    n = len(b_matrix)
+def _strassen_winograd(a, b, c, workspace, depth):
+    """
+    Один уровень Штрассена-Винограда (7 умножений, 15 сложений).
+    Результат пишется в c через представления квадрантов, временные матрицы
+    берутся из workspace[depth] и переиспользуются всеми вызовами этого уровня.
+    """
+    if depth == len(workspace):
+        np.matmul(a, b, out=c)
+        return
+
+    m, k = a.shape[0] // 2, a.shape[1] // 2
+    n = b.shape[1] // 2
+    a11, a12, a21, a22 = a[:m, :k], a[:m, k:], a[m:, :k], a[m:, k:]
+    b11, b12, b21, b22 = b[:k, :n], b[:k, n:], b[k:, :n], b[k:, n:]
+    c11, c12, c21, c22 = c[:m, :n], c[:m, n:], c[m:, :n], c[m:, n:]
+    x, y, z = workspace[depth]
+
+    np.subtract(a11, a21, out=x)                       # S3
+    np.subtract(b22, b12, out=y)                       # T3
+    _strassen_winograd(x, y, c21, workspace, depth + 1)  # M7
+    np.add(a21, a22, out=x)                            # S1
+    np.subtract(b12, b11, out=y)                       # T1
+    _strassen_winograd(x, y, c22, workspace, depth + 1)  # M5
+    np.subtract(x, a11, out=x)                         # S2 = S1 - A11
+    np.subtract(b22, y, out=y)                         # T2 = B22 - T1
+    _strassen_winograd(x, y, c12, workspace, depth + 1)  # M6
+    np.subtract(a12, x, out=x)                         # S4 = A12 - S2
+    _strassen_winograd(x, b22, c11, workspace, depth + 1)  # M3
+    _strassen_winograd(a11, b11, z, workspace, depth + 1)  # M1
+
+    c12 += z                                           # U2 = M1 + M6
+    c21 += c12                                         # U3 = U2 + M7
+    c12 += c22                                         # U4 = U2 + M5
+    c22 += c21                                         # C22 = U3 + M5
+    c12 += c11                                         # C12 = U4 + M3
+
+    np.subtract(y, b21, out=y)                         # T4 = T2 - B21
+    _strassen_winograd(a22, y, c11, workspace, depth + 1)  # M4
+    c21 -= c11                                         # C21 = U3 - M4
+    _strassen_winograd(a12, b21, c11, workspace, depth + 1)  # M2
+    c11 += z                                           # C11 = M1 + M2
+
+
+def custom_strassen_multiplication(a_matrix, b_matrix, leaf_size=None):
+    """
+    Гибридный алгоритм Штрассена-Винограда.
+    Матрицы дополняются нулями один раз до размера, делящегося на 2**levels,
+    рекурсия идёт без промежуточных vstack/hstack, а блоки не больше leaf_size
+    умножаются через BLAS. Если leaf_size не задан, он подбирается через tune_strassen_leaf_size.
+    """
+    a_matrix = np.asarray(a_matrix)
+    b_matrix = np.asarray(b_matrix)
+    rows, inner = a_matrix.shape
+    if inner != b_matrix.shape[0]:
+        raise ValueError("Число столбцов первой матрицы должно быть равно числу строк второй матрицы.")
+    cols = b_matrix.shape[1]
+    dtype = np.result_type(a_matrix, b_matrix)
 
-    if n == 1:
-        return a_matrix * b_matrix
+    if leaf_size is None:
+        leaf_size = tune_strassen_leaf_size(dtype)
 
-    if n <= 2:
+    levels = strassen_levels(rows, inner, cols, leaf_size)
+    if levels == 0:
         return numpy_multiplication(a_matrix, b_matrix)
 
-    mid = n // 2
-    A11, A12, A21, A22 = a_matrix[:mid, :mid], a_matrix[:mid, mid:], a_matrix[mid:, :mid], a_matrix[mid:, mid:]
-    B11, B12, B21, B22 = b_matrix[:mid, :mid], b_matrix[:mid, mid:], b_matrix[mid:, :mid], b_matrix[mid:, mid:]
+    step = 2 ** levels
+    padded_rows, padded_inner, padded_cols = (-(-size // step) * step for size in (rows, inner, cols))
+    a_padded = pad_matrix(a_matrix.astype(dtype, copy=False), padded_rows, padded_inner)
+    b_padded = pad_matrix(b_matrix.astype(dtype, copy=False), padded_inner, padded_cols)
+
+    workspace = []
+    for depth in range(1, levels + 1):
+        m, k, n = padded_rows >> depth, padded_inner >> depth, padded_cols >> depth
+        workspace.append((np.empty((m, k), dtype), np.empty((k, n), dtype), np.empty((m, n), dtype)))
+
+    result = np.empty((padded_rows, padded_cols), dtype)
+    _strassen_winograd(a_padded, b_padded, result, workspace, 0)
+    return result[:rows, :cols]
+
+
+def _submit_strassen_products(a, b, executor, depth, leaf_size):
+    """
+    Раскладывает произведение на 7 независимых произведений Штрассена depth раз подряд
+    и отправляет листья в executor. Возвращает дерево futures для _collect_strassen_products.
+    """
+    if depth == 0:
+        return executor.submit(custom_strassen_multiplication, a, b, leaf_size)
+
+    m, k = a.shape[0] // 2, a.shape[1] // 2
+    n = b.shape[1] // 2
+    a11, a12, a21, a22 = a[:m, :k], a[:m, k:], a[m:, :k], a[m:, k:]
+    b11, b12, b21, b22 = b[:k, :n], b[:k, n:], b[k:, :n], b[k:, n:]
+
+    operands = (
+        (a11 + a22, b11 + b22),  # M1
+        (a21 + a22, b11),        # M2
+        (a11, b12 - b22),        # M3
+        (a22, b21 - b11),        # M4
+        (a11 + a12, b22),        # M5
+        (a21 - a11, b11 + b12),  # M6
+        (a12 - a22, b21 + b22),  # M7
+    )
+    return [_submit_strassen_products(x, y, executor, depth - 1, leaf_size) for x, y in operands]
+
+
+def _collect_strassen_products(products, depth):
+    """Дожидается результатов из дерева futures и собирает из M1..M7 итоговую матрицу."""
+    if depth == 0:
+        return products.result()
+
+    m1, m2, m3, m4, m5, m6, m7 = (_collect_strassen_products(product, depth - 1) for product in products)
+    m, n = m1.shape
+    c = np.empty((2 * m, 2 * n), dtype=m1.dtype)
+    c11, c12, c21, c22 = c[:m, :n], c[:m, n:], c[m:, :n], c[m:, n:]
+
+    np.add(m1, m4, out=c11)
+    c11 -= m5
+    c11 += m7
+    np.add(m3, m5, out=c12)
+    np.add(m2, m4, out=c21)
+    np.subtract(m1, m2, out=c22)
+    c22 += m3
+    c22 += m6
+    return c
+
+
+def parallel_strassen_multiplication(a_matrix, b_matrix, workers=None, fan_out_depth=1, leaf_size=None):
+    """
+    Параллельный алгоритм Штрассена.
+    Верхние fan_out_depth уровней рекурсии (7 или 49 задач) раздаются пулу из workers потоков,
+    каждая задача считается последовательным custom_strassen_multiplication.
+    Потоки не упираются в GIL: ядра NumPy/BLAS в листьях его освобождают.
+    """
+    a_matrix = np.asarray(a_matrix)
+    b_matrix = np.asarray(b_matrix)
+    rows, inner = a_matrix.shape
+    if inner != b_matrix.shape[0]:
+        raise ValueError("Число столбцов первой матрицы должно быть равно числу строк второй матрицы.")
+    cols = b_matrix.shape[1]
+    dtype = np.result_type(a_matrix, b_matrix)
+
+    if leaf_size is None:
+        leaf_size = tune_strassen_leaf_size(dtype)
+    if workers is None:
+        workers = os.cpu_count() or 1
 
-    M1 = custom_strassen_multiplication(A11 + A22, B11 + B22)
-    M2 = custom_strassen_multiplication(A21 + A22, B11)
-    M3 = custom_strassen_multiplication(A11, B12 - B22)
-    M4 = custom_strassen_multiplication(A22, B21 - B11)
-    M5 = custom_strassen_multiplication(A11 + A12, B22)
-    M6 = custom_strassen_multiplication(A21 - A11, B11 + B12)
-    M7 = custom_strassen_multiplication(A12 - A22, B21 + B22)
+    fan_out_depth = min(fan_out_depth, strassen_levels(rows, inner, cols, leaf_size))
+    if fan_out_depth == 0:
+        return custom_strassen_multiplication(a_matrix, b_matrix, leaf_size)
 
-    C11 = M1 + M4 - M5 + M7
-    C12 = M3 + M5
-    C21 = M2 + M4
-    C22 = M1 - M2 + M3 + M6
+    step = 2 ** fan_out_depth
+    padded_rows, padded_inner, padded_cols = (-(-size // step) * step for size in (rows, inner, cols))
+    a_padded = pad_matrix(a_matrix.astype(dtype, copy=False), padded_rows, padded_inner)
+    b_padded = pad_matrix(b_matrix.astype(dtype, copy=False), padded_inner, padded_cols)
 
-    C = np.vstack((np.hstack((C11, C12)), np.hstack((C21, C22))))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        products = _submit_strassen_products(a_padded, b_padded, executor, fan_out_depth, leaf_size)
+        result = _collect_strassen_products(products, fan_out_depth)
 
-    return C[:original_size[0], :original_size[1]]
+    return result[:rows, :cols]
 
 
 def read(filename):
@@ -131,137 +455,170 @@ def print_matrix(matrix):
 
 
 def ikj_matrix_product(A, B):
-    n = len(A)
-    C = [[0 for i in range(n)] for j in range(n)]
-    for i in range(n):
-        for k in range(n):
-            for j in range(n):
-                C[i][j] += A[i][k] * B[k][j]
+    """Умножение в порядке i-k-j: строки B складываются в строку результата целиком."""
+    rows, inner, cols = len(A), len(B), len(B[0])
+    C = [[0] * cols for _ in range(rows)]
+    for i in range(rows):
+        a_row = A[i]
+        c_row = C[i]
+        for k in range(inner):
+            c_row[:] = map(add, c_row, map(mul, repeat(a_row[k]), B[k]))
     return C
 
 
-def add(A, B):
-    n = len(A)
-    C = [[0 for j in range(0, n)] for i in range(0, n)]
-    for i in range(0, n):
-        for j in range(0, n):
-            C[i][j] = A[i][j] + B[i][j]
-    return C
+def _flat_apply(operation, rows, cols, x, y, out):
+    """
+    Поэлементная операция над блоками rows x cols плоских буферов.
+    Блок задаётся тройкой (буфер, смещение, шаг строки); out может совпадать с x или y.
+    """
+    x_buffer, x_offset, x_stride = x
+    y_buffer, y_offset, y_stride = y
+    out_buffer, out_offset, out_stride = out
+    for _ in range(rows):
+        out_buffer[out_offset:out_offset + cols] = _buffer_values(
+            out_buffer, map(operation, x_buffer[x_offset:x_offset + cols], y_buffer[y_offset:y_offset + cols])
+        )
+        x_offset += x_stride
+        y_offset += y_stride
+        out_offset += out_stride
 
 
-def subtract(A, B):
-    n = len(A)
-    C = [[0 for j in range(0, n)] for i in range(0, n)]
-    for i in range(0, n):
-        for j in range(0, n):
-            C[i][j] = A[i][j] - B[i][j]
-    return C
+def _buffer_values(buffer, values):
+    """values в виде, пригодном для записи в срез buffer: array того же типа или список."""
+    return array(buffer.typecode, values) if isinstance(buffer, array) else list(values)
 
 
-def strassenR(A, B):
-    n = len(A)
+def _flat_rows(block, rows, cols):
+    buffer, offset, stride = block
+    return [buffer[offset + i * stride:offset + i * stride + cols] for i in range(rows)]
 
-    if n <= 2:
-        return ikj_matrix_product(A, B)
-    else:
-        # initializing the new sub-matrices
-        new_size = n // 2
-        a11 = [[0 for j in range(0, new_size)] for i in range(0, new_size)]
-        a12 = [[0 for j in range(0, new_size)] for i in range(0, new_size)]
-        a21 = [[0 for j in range(0, new_size)] for i in range(0, new_size)]
-        a22 = [[0 for j in range(0, new_size)] for i in range(0, new_size)]
-
-        b11 = [[0 for j in range(0, new_size)] for i in range(0, new_size)]
-        b12 = [[0 for j in range(0, new_size)] for i in range(0, new_size)]
-        b21 = [[0 for j in range(0, new_size)] for i in range(0, new_size)]
-        b22 = [[0 for j in range(0, new_size)] for i in range(0, new_size)]
-
-        aResult = [[0 for j in range(0, new_size)] for i in range(0, new_size)]
-        bResult = [[0 for j in range(0, new_size)] for i in range(0, new_size)]
-
-        # dividing the matrices in 4 sub-matrices:
-        for i in range(0, new_size):
-            for j in range(0, new_size):
-                a11[i][j] = A[i][j]  # top left
-                a12[i][j] = A[i][j + new_size]  # top right
-                a21[i][j] = A[i + new_size][j]  # bottom left
-                a22[i][j] = A[i + new_size][j + new_size]  # bottom right
-
-                b11[i][j] = B[i][j]  # top left
-                b12[i][j] = B[i][j + new_size]  # top right
-                b21[i][j] = B[i + new_size][j]  # bottom left
-                b22[i][j] = B[i + new_size][j + new_size]  # bottom right
-
-        # Calculating p1 to p7:
-        aResult = add(a11, a22)
-        bResult = add(b11, b22)
-        p1 = strassenR(aResult, bResult)  # p1 = (a11+a22) * (b11+b22)
-
-        aResult = add(a21, a22)  # a21 + a22
-        p2 = strassenR(aResult, b11)  # p2 = (a21+a22) * (b11)
-
-        bResult = subtract(b12, b22)  # b12 - b22
-        p3 = strassenR(a11, bResult)  # p3 = (a11) * (b12 - b22)
-
-        bResult = subtract(b21, b11)  # b21 - b11
-        p4 = strassenR(a22, bResult)  # p4 = (a22) * (b21 - b11)
-
-        aResult = add(a11, a12)  # a11 + a12
-        p5 = strassenR(aResult, b22)  # p5 = (a11+a12) * (b22)
-
-        aResult = subtract(a21, a11)  # a21 - a11
-        bResult = add(b11, b12)  # b11 + b12
-        p6 = strassenR(aResult, bResult)  # p6 = (a21-a11) * (b11+b12)
-
-        aResult = subtract(a12, a22)  # a12 - a22
-        bResult = add(b21, b22)  # b21 + b22
-        p7 = strassenR(aResult, bResult)  # p7 = (a12-a22) * (b21+b22)
-
-        # calculating c21, c21, c11 e c22:
-        c12 = add(p3, p5)  # c12 = p3 + p5
-        c21 = add(p2, p4)  # c21 = p2 + p4
-
-        aResult = add(p1, p4)  # p1 + p4
-        bResult = add(aResult, p7)  # p1 + p4 + p7
-        c11 = subtract(bResult, p5)  # c11 = p1 + p4 - p5 + p7
-
-        aResult = add(p1, p3)  # p1 + p3
-        bResult = add(aResult, p6)  # p1 + p3 + p6
-        c22 = subtract(bResult, p2)  # c22 = p1 + p3 - p2 + p6
-
-        # Grouping the results obtained in a single matrix:
-        C = [[0 for j in range(0, n)] for i in range(0, n)]
-        for i in range(0, new_size):
-            for j in range(0, new_size):
-                C[i][j] = c11[i][j]
-                C[i][j + new_size] = c12[i][j]
-                C[i + new_size][j] = c21[i][j]
-                C[i + new_size][j + new_size] = c22[i][j]
-        return C
-
-
-def strassen_multiplication(A, B):
-    # print("A", A)
-    # print("B", B)
-    # print(type(A), type(B))
-    assert type(A) == list and type(B) == list
-    assert len(A) == len(A[0]) == len(B) == len(B[0])
-
-    # Make the matrices bigger so that you can apply the strassen
-    # algorithm recursively without having to deal with odd
-    # matrix sizes
-    nextPowerOfTwo = lambda n: 2 ** int(ceil(log(n, 2)))
-    n = len(A)
-    m = nextPowerOfTwo(n)
-    APrep = [[0 for i in range(m)] for j in range(m)]
-    BPrep = [[0 for i in range(m)] for j in range(m)]
-    for i in range(n):
-        for j in range(n):
-            APrep[i][j] = A[i][j]
-            BPrep[i][j] = B[i][j]
-    CPrep = strassenR(APrep, BPrep)
-    C = [[0 for i in range(n)] for j in range(n)]
-    for i in range(n):
-        for j in range(n):
-            C[i][j] = CPrep[i][j]
-    return C
+
+def _flat_leaf_product(rows, inner, cols, x, y, out):
+    """Умножение блоков-листьев через ikj_matrix_product с записью результата в out."""
+    out_buffer, out_offset, out_stride = out
+    product = ikj_matrix_product(_flat_rows(x, rows, inner), _flat_rows(y, inner, cols))
+    for row in product:
+        out_buffer[out_offset:out_offset + cols] = _buffer_values(out_buffer, row)
+        out_offset += out_stride
+
+
+def _flat_quadrants(block, rows, cols):
+    buffer, offset, stride = block
+    return (
+        (buffer, offset, stride),
+        (buffer, offset + cols, stride),
+        (buffer, offset + rows * stride, stride),
+        (buffer, offset + rows * stride + cols, stride),
+    )
+
+
+def strassenR(a, b, c, rows, inner, cols, workspace, depth=0):
+    """
+    Алгоритм Штрассена-Винограда над блоками плоских буферов array.
+    a, b, c - тройки (буфер, смещение, шаг строки) для блоков rows x inner, inner x cols и rows x cols,
+    результат пишется в c. Временные блоки берутся из workspace[depth];
+    на последнем уровне используется ikj_matrix_product.
+    """
+    if depth == len(workspace):
+        _flat_leaf_product(rows, inner, cols, a, b, c)
+        return
+
+    m, k, n = rows // 2, inner // 2, cols // 2
+    a11, a12, a21, a22 = _flat_quadrants(a, m, k)
+    b11, b12, b21, b22 = _flat_quadrants(b, k, n)
+    c11, c12, c21, c22 = _flat_quadrants(c, m, n)
+    x_buffer, y_buffer, z_buffer = workspace[depth]
+    x, y, z = (x_buffer, 0, k), (y_buffer, 0, n), (z_buffer, 0, n)
+    level = depth + 1
+
+    _flat_apply(sub, m, k, a11, a21, x)                         # S3
+    _flat_apply(sub, k, n, b22, b12, y)                         # T3
+    strassenR(x, y, c21, m, k, n, workspace, level)             # M7
+    _flat_apply(add, m, k, a21, a22, x)                         # S1
+    _flat_apply(sub, k, n, b12, b11, y)                         # T1
+    strassenR(x, y, c22, m, k, n, workspace, level)             # M5
+    _flat_apply(sub, m, k, x, a11, x)                           # S2 = S1 - A11
+    _flat_apply(sub, k, n, b22, y, y)                           # T2 = B22 - T1
+    strassenR(x, y, c12, m, k, n, workspace, level)             # M6
+    _flat_apply(sub, m, k, a12, x, x)                           # S4 = A12 - S2
+    strassenR(x, b22, c11, m, k, n, workspace, level)           # M3
+    strassenR(a11, b11, z, m, k, n, workspace, level)           # M1
+
+    _flat_apply(add, m, n, c12, z, c12)                         # U2 = M1 + M6
+    _flat_apply(add, m, n, c21, c12, c21)                       # U3 = U2 + M7
+    _flat_apply(add, m, n, c12, c22, c12)                       # U4 = U2 + M5
+    _flat_apply(add, m, n, c22, c21, c22)                       # C22 = U3 + M5
+    _flat_apply(add, m, n, c12, c11, c12)                       # C12 = U4 + M3
+
+    _flat_apply(sub, k, n, y, b21, y)                           # T4 = T2 - B21
+    strassenR(a22, y, c11, m, k, n, workspace, level)           # M4
+    _flat_apply(sub, m, n, c21, c11, c21)                       # C21 = U3 - M4
+    strassenR(a12, b21, c11, m, k, n, workspace, level)         # M2
+    _flat_apply(add, m, n, c11, z, c11)                         # C11 = M1 + M2
+
+
+STRASSEN_LIST_LEAF_SIZE = 64
+INT64_MAX = 2 ** 63 - 1
+
+
+def _zero_buffer(typecode, size):
+    if typecode is None:
+        return [0] * size
+    return array(typecode, bytes(size * array(typecode).itemsize))
+
+
+def _strassen_typecode(A, B, inner, levels):
+    """
+    Тип буферов для strassen_multiplication: 'q', если целые входы и все промежуточные значения
+    заведомо помещаются в int64, 'd' для чисел с плавающей точкой, иначе None - списки объектов Python.
+    Каждый уровень Штрассена-Винограда складывает до четырёх блоков в каждом множителе,
+    поэтому модули значений не превосходят 4 * inner * 16**levels * max|A| * max|B|.
+    """
+    values = list(chain.from_iterable(chain(A, B)))
+    if all(isinstance(value, Integral) for value in values):
+        a_max = max((abs(value) for row in A for value in row), default=0)
+        b_max = max((abs(value) for row in B for value in row), default=0)
+        bound = 4 * inner * 16 ** levels * a_max * b_max
+        return "q" if max(a_max, b_max, bound) <= INT64_MAX else None
+    if all(isinstance(value, (Integral, float)) for value in values):
+        return "d"
+    return None
+
+
+def strassen_multiplication(A, B, leaf_size=STRASSEN_LIST_LEAF_SIZE):
+    """
+    Алгоритм Штрассена на чистом Python для матриц произвольной формы m x k и k x n.
+    Матрицы копируются в плоские буферы array ('q' для целых, 'd' для чисел с плавающей точкой);
+    целые, промежуточные значения которых могут не поместиться в int64, и прочие числа
+    (Fraction, Decimal) обрабатываются в списках объектов Python (см. _strassen_typecode).
+    Каждая сторона дополняется нулями только до кратной 2**levels, а не до степени двойки.
+    Рекурсия адресует блоки смещением и шагом без копирования,
+    блоки со стороной не больше leaf_size умножаются через ikj_matrix_product.
+    """
+    rows, inner, cols = len(A), len(B), len(B[0])
+    if len(A[0]) != inner:
+        raise ValueError("Число столбцов первой матрицы должно быть равно числу строк второй матрицы.")
+
+    levels = strassen_levels(rows, inner, cols, leaf_size)
+    step = 2 ** levels
+    padded_rows, padded_inner, padded_cols = (-(-size // step) * step for size in (rows, inner, cols))
+    typecode = _strassen_typecode(A, B, padded_inner, levels)
+
+    a_buffer = _zero_buffer(typecode, padded_rows * padded_inner)
+    b_buffer = _zero_buffer(typecode, padded_inner * padded_cols)
+    for i in range(rows):
+        a_buffer[i * padded_inner:i * padded_inner + inner] = _buffer_values(a_buffer, A[i])
+    for i in range(inner):
+        b_buffer[i * padded_cols:i * padded_cols + cols] = _buffer_values(b_buffer, B[i])
+
+    workspace = []
+    for depth in range(1, levels + 1):
+        m, k, n = padded_rows >> depth, padded_inner >> depth, padded_cols >> depth
+        workspace.append((_zero_buffer(typecode, m * k), _zero_buffer(typecode, k * n), _zero_buffer(typecode, m * n)))
+
+    c_buffer = _zero_buffer(typecode, padded_rows * padded_cols)
+    strassenR(
+        (a_buffer, 0, padded_inner), (b_buffer, 0, padded_cols), (c_buffer, 0, padded_cols),
+        padded_rows, padded_inner, padded_cols, workspace,
+    )
+    return [list(c_buffer[i * padded_cols:i * padded_cols + cols]) for i in range(rows)]
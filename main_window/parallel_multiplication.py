@@ -0,0 +1,177 @@
+import multiprocessing
+import multiprocessing.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .bignum import (
+    KARATSUBA_LIMB_CUTOFF,
+    add_polynomials,
+    coefficients_to_int,
+    combine_karatsuba,
+    int_to_limbs,
+    karatsuba_limbs,
+    limb_karatsuba_multiplication,
+)
+
+# Множители короче этого числа лимбов умножаются в текущем процессе: выигрыш не окупает пересылку
+PARALLEL_LIMB_THRESHOLD = 16 * KARATSUBA_LIMB_CUTOFF
+INT64_BYTES = np.dtype(np.int64).itemsize
+
+_process_pools = {}
+
+
+def get_process_pool(workers):
+    """
+    Пул процессов на workers исполнителей; создаётся один раз, чтобы запуск процессов не входил в замер.
+    Процессы запускаются через spawn: fork из процесса с потоками может унаследовать захваченную блокировку.
+    """
+    if workers not in _process_pools:
+        _process_pools[workers] = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    return _process_pools[workers]
+
+
+def shutdown_process_pools():
+    for pool in _process_pools.values():
+        pool.shutdown()
+    _process_pools.clear()
+
+
+# В дочерних процессах multiprocessing обработчики atexit не вызываются, а процессы пула
+# дожидаются перед выходом. Финализатор выполняется раньше этого ожидания, а его приоритет
+# выше, чем у финализаторов очередей (10), которые пул использует для остановки процессов.
+multiprocessing.util.Finalize(None, shutdown_process_pools, exitpriority=100)
+
+
+def attach_shared_block(name):
+    """
+    Подключение к общему блоку памяти, созданному другим процессом. Блок удаляет создатель,
+    поэтому начиная с Python 3.13 подключение не ставится на учёт resource_tracker;
+    в более ранних версиях процессы пула делят трекер с создателем, и повторный учёт безвреден.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def shared_array(block, offset, length):
+    return np.ndarray(length, dtype=np.int64, buffer=block.buf, offset=offset * INT64_BYTES)
+
+
+def multiply_shared_task(operands_name, results_name, task):
+    """
+    Задача процесса пула: свёртка двух срезов блока операндов алгоритмом Карацубы.
+    Результат записывается в свой участок блока результатов, а не передаётся через pickle.
+    """
+    a_offset, a_length, b_offset, b_length, result_offset = task
+    operands = attach_shared_block(operands_name)
+    results = attach_shared_block(results_name)
+    try:
+        a = shared_array(operands, a_offset, a_length)
+        b = shared_array(operands, b_offset, b_length)
+        product = karatsuba_limbs(a, b)
+        shared_array(results, result_offset, len(product))[:] = product
+        # Представления буферов должны быть освобождены до close()
+        del a, b
+    finally:
+        operands.close()
+        results.close()
+
+
+def split_karatsuba(a, b, depth, leaves):
+    """
+    Раскрывает depth верхних уровней алгоритма Карацубы.
+    Пары операндов листьев добавляются в leaves; возвращается дерево сборки:
+    индекс листа или (m, длина свёртки, узел z0, узел z1, узел z2).
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    m = len(a) // 2
+    if depth == 0 or len(b) <= m or len(b) <= KARATSUBA_LIMB_CUTOFF:
+        leaves.append((a, b))
+        return len(leaves) - 1
+
+    a0, a1 = a[:m], a[m:]
+    b0, b1 = b[:m], b[m:]
+    return (
+        m,
+        len(a) + len(b) - 1,
+        split_karatsuba(a0, b0, depth - 1, leaves),
+        split_karatsuba(add_polynomials(a0, a1), add_polynomials(b0, b1), depth - 1, leaves),
+        split_karatsuba(a1, b1, depth - 1, leaves),
+    )
+
+
+def combine_tree(node, products):
+    if isinstance(node, int):
+        return products[node]
+    m, length, z0, z1, z2 = node
+    return combine_karatsuba(
+        combine_tree(z0, products), combine_tree(z1, products), combine_tree(z2, products), m, length
+    )
+
+
+def default_split_depth(workers):
+    """Наименьшая глубина, на которой листьев (3**depth) не меньше числа процессов."""
+    depth = 1
+    while 3 ** depth < workers:
+        depth += 1
+    return depth
+
+
+def parallel_karatsuba_limbs(a, b, workers, depth=None):
+    """
+    Свёртка массивов лимбов: верхние уровни Карацубы раскрываются здесь, листья
+    умножаются в пуле процессов через общую память, а сборка идёт в текущем процессе.
+    """
+    if depth is None:
+        depth = default_split_depth(workers)
+    leaves = []
+    tree = split_karatsuba(a, b, depth, leaves)
+
+    operand_offsets = np.cumsum([0] + [len(part) for pair in leaves for part in pair])
+    result_offsets = np.cumsum([0] + [len(a_part) + len(b_part) - 1 for a_part, b_part in leaves])
+    operands = shared_memory.SharedMemory(create=True, size=max(1, int(operand_offsets[-1])) * INT64_BYTES)
+    results = shared_memory.SharedMemory(create=True, size=max(1, int(result_offsets[-1])) * INT64_BYTES)
+    try:
+        tasks = []
+        for index, (a_part, b_part) in enumerate(leaves):
+            a_offset, b_offset = int(operand_offsets[2 * index]), int(operand_offsets[2 * index + 1])
+            shared_array(operands, a_offset, len(a_part))[:] = a_part
+            shared_array(operands, b_offset, len(b_part))[:] = b_part
+            tasks.append((a_offset, len(a_part), b_offset, len(b_part), int(result_offsets[index])))
+
+        pool = get_process_pool(workers)
+        futures = [pool.submit(multiply_shared_task, operands.name, results.name, task) for task in tasks]
+        for future in futures:
+            future.result()
+
+        products = []
+        for start, end in zip(result_offsets[:-1], result_offsets[1:]):
+            products.append(shared_array(results, int(start), int(end - start)).copy())
+        return combine_tree(tree, products)
+    finally:
+        operands.close()
+        operands.unlink()
+        results.close()
+        results.unlink()
+
+
+def parallel_karatsuba_multiplication(x, y, workers=None, depth=None):
+    """
+    Параллельный алгоритм Карацубы над лимбами.
+    Переносы выполняются один раз, при сборке итоговой свёртки в int.
+    workers - число процессов (по умолчанию os.cpu_count()).
+    """
+    workers = workers or os.cpu_count() or 1
+    if x == 0 or y == 0:
+        return 0
+    a = int_to_limbs(abs(x))
+    b = int_to_limbs(abs(y))
+    if min(len(a), len(b)) < PARALLEL_LIMB_THRESHOLD:
+        return limb_karatsuba_multiplication(x, y)
+    product = coefficients_to_int(parallel_karatsuba_limbs(a, b, workers, depth))
+    return -product if (x < 0) != (y < 0) else product
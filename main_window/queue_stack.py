@@ -1,3 +1,8 @@
+from array import array
+
+import numpy as np
+
+
 class StackArray:
     def __init__(self):
         self.stack = []
@@ -18,24 +23,113 @@ class StackArray:
 
 
 class QueueArray:
-    def __init__(self, size_limit):
-        self.size_limit = size_limit
-        self.queue = [None] * size_limit
+    """
+    Очередь на кольцевом буфере. Ёмкость удваивается при заполнении и уменьшается вдвое,
+    когда занято не больше четверти, но не ниже начальной size_limit.
+    По умолчанию элементы хранятся в списке; typecode (например, "q" или "d") включает
+    компактное хранилище array.array, dtype - массив NumPy. Массовые операции enqueue_many
+    и dequeue_many переносят элементы срезами, то есть циклом на C, а не на Python.
+    """
+
+    MIN_CAPACITY = 8
+
+    def __init__(self, size_limit=MIN_CAPACITY, typecode=None, dtype=None):
+        if typecode is not None and dtype is not None:
+            raise ValueError("Укажите либо typecode, либо dtype")
+        self.typecode = typecode
+        self.dtype = dtype
+        self.min_capacity = max(size_limit, self.MIN_CAPACITY)
+        self.size_limit = self.min_capacity
+        self.queue = self._allocate(self.size_limit)
         self.enqueue_index = 0
         self.dequeue_index = 0
         self.current_size = 0
 
+    def _allocate(self, capacity):
+        if self.typecode is not None:
+            return array(self.typecode, bytes(capacity * array(self.typecode).itemsize))
+        if self.dtype is not None:
+            return np.zeros(capacity, dtype=self.dtype)
+        return [None] * capacity
+
+    def _convert(self, items):
+        """Элементы в виде последовательности того же типа, что и хранилище (для присваивания срезу)."""
+        if self.typecode is not None:
+            return items if isinstance(items, array) and items.typecode == self.typecode else array(self.typecode, items)
+        if self.dtype is not None:
+            return np.asarray(items, dtype=self.dtype)
+        return items if isinstance(items, list) else list(items)
+
+    def _concatenate(self, first, second):
+        if self.dtype is not None:
+            return np.concatenate((first, second))
+        return first + second
+
+    def _resize(self, capacity):
+        """Переносит элементы в новое хранилище: два среза вместо поэлементного копирования."""
+        store = self._allocate(capacity)
+        head = min(self.current_size, self.size_limit - self.dequeue_index)
+        store[:head] = self.queue[self.dequeue_index:self.dequeue_index + head]
+        store[head:self.current_size] = self.queue[:self.current_size - head]
+        self.queue = store
+        self.size_limit = capacity
+        self.dequeue_index = 0
+        self.enqueue_index = self.current_size % capacity
+
+    def _shrink_if_sparse(self):
+        if self.size_limit > self.min_capacity and self.current_size <= self.size_limit // 4:
+            self._resize(max(self.size_limit // 2, self.min_capacity))
+
     def enqueue(self, item):
-        if self.current_size < self.size_limit:
-            self.queue[self.enqueue_index] = item
-            self.enqueue_index = (self.enqueue_index + 1) % self.size_limit
-            self.current_size += 1
+        if self.current_size == self.size_limit:
+            self._resize(self.size_limit * 2)
+        self.queue[self.enqueue_index] = item
+        self.enqueue_index = (self.enqueue_index + 1) % self.size_limit
+        self.current_size += 1
 
     def dequeue(self):
-        if self.current_size > 0:
+        if self.current_size == 0:
+            return None
+        item = self.queue[self.dequeue_index]
+        if self.typecode is None and self.dtype is None:
             self.queue[self.dequeue_index] = None
-            self.dequeue_index = (self.dequeue_index + 1) % self.size_limit
-            self.current_size -= 1
+        self.dequeue_index = (self.dequeue_index + 1) % self.size_limit
+        self.current_size -= 1
+        self._shrink_if_sparse()
+        return item
+
+    def enqueue_many(self, items):
+        items = self._convert(items)
+        count = len(items)
+        required = self.current_size + count
+        if required > self.size_limit:
+            capacity = self.size_limit
+            while capacity < required:
+                capacity *= 2
+            self._resize(capacity)
+
+        first = min(count, self.size_limit - self.enqueue_index)
+        self.queue[self.enqueue_index:self.enqueue_index + first] = items[:first]
+        self.queue[:count - first] = items[first:]
+        self.enqueue_index = (self.enqueue_index + count) % self.size_limit
+        self.current_size += count
+
+    def dequeue_many(self, count=None):
+        """Извлекает до count элементов (по умолчанию все); возвращает последовательность типа хранилища."""
+        count = self.current_size if count is None else min(count, self.current_size)
+        first = min(count, self.size_limit - self.dequeue_index)
+        head = self.queue[self.dequeue_index:self.dequeue_index + first]
+        tail = self.queue[:count - first]
+        if self.typecode is None and self.dtype is None:
+            self.queue[self.dequeue_index:self.dequeue_index + first] = [None] * first
+            self.queue[:count - first] = [None] * (count - first)
+        items = self._concatenate(head, tail) if count > first else head
+        if self.dtype is not None:
+            items = items.copy()
+        self.dequeue_index = (self.dequeue_index + count) % self.size_limit
+        self.current_size -= count
+        self._shrink_if_sparse()
+        return items
 
     def is_empty(self):
         return self.current_size == 0
@@ -45,27 +139,69 @@ class QueueArray:
 
 
 class Node:
+    __slots__ = ("value", "next")
+
     def __init__(self, value):
         self.value = value
         self.next = None
 
 
+class NodePool:
+    """
+    Список свободных узлов: извлечённые узлы не удаляются, а переиспользуются следующими
+    вставками, поэтому при постоянном обороте элементов узлы почти не выделяются и не
+    попадают к сборщику мусора. max_size ограничивает число хранимых узлов (None - без ограничения).
+    """
+
+    __slots__ = ("free", "free_count", "max_size")
+
+    def __init__(self, max_size=None):
+        self.free = None
+        self.free_count = 0
+        self.max_size = max_size
+
+    def acquire(self, value):
+        node = self.free
+        if node is None:
+            return Node(value)
+        self.free = node.next
+        self.free_count -= 1
+        node.value = value
+        node.next = None
+        return node
+
+    def release(self, node):
+        if self.max_size is not None and self.free_count >= self.max_size:
+            return
+        # Узел не должен удерживать значение, пока лежит в пуле
+        node.value = None
+        node.next = self.free
+        self.free = node
+        self.free_count += 1
+
+
 class StackLinkedList:
-    def __init__(self):
+    """Стек на односвязном списке; с pool=NodePool() извлечённые узлы переиспользуются."""
+
+    def __init__(self, pool=None):
         self.head = None
         self.size = 0
+        self.pool = pool
 
     def push(self, item):
-        new_node = Node(item)
+        new_node = Node(item) if self.pool is None else self.pool.acquire(item)
         new_node.next = self.head
         self.head = new_node
         self.size += 1
 
     def pop(self):
         if not self.is_empty():
-            popped = self.head.value
-            self.head = self.head.next
+            node = self.head
+            popped = node.value
+            self.head = node.next
             self.size -= 1
+            if self.pool is not None:
+                self.pool.release(node)
             return popped
         return None
 
@@ -77,13 +213,16 @@ class StackLinkedList:
 
 
 class QueueLinkedList:
-    def __init__(self):
+    """Очередь на односвязном списке; с pool=NodePool() извлечённые узлы переиспользуются."""
+
+    def __init__(self, pool=None):
         self.head = None
         self.tail = None
         self.size = 0
+        self.pool = pool
 
     def enqueue(self, item):
-        new_node = Node(item)
+        new_node = Node(item) if self.pool is None else self.pool.acquire(item)
         if self.tail:
             self.tail.next = new_node
         self.tail = new_node
@@ -93,11 +232,14 @@ class QueueLinkedList:
 
     def dequeue(self):
         if not self.is_empty():
-            dequeued = self.head.value
-            self.head = self.head.next
+            node = self.head
+            dequeued = node.value
+            self.head = node.next
             if self.head is None:
                 self.tail = None
             self.size -= 1
+            if self.pool is not None:
+                self.pool.release(node)
             return dequeued
         return None
 
@@ -106,3 +248,102 @@ class QueueLinkedList:
 
     def get_size(self):
         return self.size
+
+
+class UnrolledNode:
+    """Узел развёрнутого списка: до node_capacity элементов в одном списке Python."""
+
+    __slots__ = ("items", "next")
+
+    def __init__(self):
+        self.items = []
+        self.next = None
+
+
+class StackUnrolledList:
+    """
+    Стек на развёрнутом связном списке: узел хранит до node_capacity элементов,
+    поэтому на элемент приходится один указатель, а узел выделяется раз в node_capacity вставок.
+    """
+
+    NODE_CAPACITY = 64
+
+    def __init__(self, node_capacity=NODE_CAPACITY):
+        self.node_capacity = node_capacity
+        self.head = None
+        self.size = 0
+
+    def push(self, item):
+        head = self.head
+        if head is None or len(head.items) == self.node_capacity:
+            head = UnrolledNode()
+            head.next = self.head
+            self.head = head
+        head.items.append(item)
+        self.size += 1
+
+    def pop(self):
+        head = self.head
+        if head is None:
+            return None
+        popped = head.items.pop()
+        if not head.items:
+            self.head = head.next
+        self.size -= 1
+        return popped
+
+    def is_empty(self):
+        return self.head is None
+
+    def get_size(self):
+        return self.size
+
+
+class QueueUnrolledList:
+    """
+    Очередь на развёрнутом связном списке: вставка в список хвостового узла, извлечение
+    по индексу head_index в головном узле (без сдвига элементов, как у list.pop(0)).
+    """
+
+    NODE_CAPACITY = 64
+
+    def __init__(self, node_capacity=NODE_CAPACITY):
+        self.node_capacity = node_capacity
+        self.head = None
+        self.tail = None
+        self.head_index = 0
+        self.size = 0
+
+    def enqueue(self, item):
+        tail = self.tail
+        if tail is None or len(tail.items) == self.node_capacity:
+            tail = UnrolledNode()
+            if self.tail is None:
+                self.head = tail
+            else:
+                self.tail.next = tail
+            self.tail = tail
+        tail.items.append(item)
+        self.size += 1
+
+    def dequeue(self):
+        head = self.head
+        if head is None:
+            return None
+        items = head.items
+        dequeued = items[self.head_index]
+        items[self.head_index] = None
+        self.head_index += 1
+        self.size -= 1
+        if self.head_index == len(items):
+            self.head = head.next
+            self.head_index = 0
+            if self.head is None:
+                self.tail = None
+        return dequeued
+
+    def is_empty(self):
+        return self.head is None
+
+    def get_size(self):
+        return self.size
@@ -0,0 +1,164 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .bignum import int_to_limbs, limbs_to_int
+
+# Куски не длиннее LEAF_DIGITS цифр переводятся встроенными str/int: на них квадратичный
+# алгоритм CPython быстрее рекурсии, и они заведомо меньше ограничения int_max_str_digits
+LEAF_DIGITS = 512
+RECIPROCAL_CUTOFF_BITS = 2048
+LOG10_2 = 0.30102999566398120
+
+
+def native_multiplication(x, y):
+    return x * y
+
+
+def reciprocal(divisor, multiply=native_multiplication):
+    """
+    floor(4**n / divisor), где n - битовая длина divisor, итерацией Ньютона.
+    Приближение для старшей половины битов вычисляется рекурсивно, один шаг Ньютона
+    удваивает точность, поэтому стоимость - несколько умножений, а не деление.
+    """
+    n = divisor.bit_length()
+    if n <= RECIPROCAL_CUTOFF_BITS:
+        return (1 << (2 * n)) // divisor
+
+    h = n // 2 + 1
+    x = reciprocal(divisor >> (n - h), multiply) << (n - h)
+    error = (1 << (2 * n)) - multiply(divisor, x)
+    x += multiply(x, error) >> (2 * n)
+
+    remainder = (1 << (2 * n)) - multiply(divisor, x)
+    while remainder < 0:
+        x -= 1
+        remainder += divisor
+    while remainder >= divisor:
+        x += 1
+        remainder -= divisor
+    return x
+
+
+def barrett_divmod(x, divisor, inverse, multiply=native_multiplication):
+    """
+    divmod(x, divisor) для 0 <= x < divisor**2 по заранее вычисленному inverse = reciprocal(divisor):
+    два умножения и не больше пары поправок вместо деления.
+    """
+    shift = 2 * divisor.bit_length()
+    quotient = multiply(x, inverse) >> shift
+    remainder = x - multiply(quotient, divisor)
+    while remainder < 0:
+        quotient -= 1
+        remainder += divisor
+    while remainder >= divisor:
+        quotient += 1
+        remainder -= divisor
+    return quotient, remainder
+
+
+@lru_cache(maxsize=128)
+def decimal_power(exponent):
+    return 10 ** exponent
+
+
+@lru_cache(maxsize=None)
+def conversion_power(level):
+    """
+    Степень 10**(LEAF_DIGITS * 2**level) и её обратная для barrett_divmod.
+    Каждая степень - квадрат предыдущей, все вычисляются один раз за сеанс.
+    """
+    if level == 0:
+        power = decimal_power(LEAF_DIGITS)
+    else:
+        previous, _ = conversion_power(level - 1)
+        power = previous * previous
+    return power, reciprocal(power)
+
+
+def decimal_length(x):
+    """Число десятичных цифр |x| без перевода в строку: оценка по битовой длине и одно сравнение."""
+    x = abs(x)
+    if x == 0:
+        return 1
+    digits = int((x.bit_length() - 1) * LOG10_2) + 1
+    return digits + 1 if x >= decimal_power(digits) else digits
+
+
+def _int_to_decimal(x, level, width, parts, multiply):
+    """Добавляет в parts цифры x < 10**(LEAF_DIGITS * 2**(level+1)); width - число цифр с ведущими нулями (0 - без)."""
+    if level < 0:
+        text = str(x)
+        parts.append(text.zfill(width) if width else text)
+        return
+    power, inverse = conversion_power(level)
+    low_width = LEAF_DIGITS << level
+    high, low = barrett_divmod(x, power, inverse, multiply)
+    if width or high:
+        _int_to_decimal(high, level - 1, max(width - low_width, 0) if width else 0, parts, multiply)
+        _int_to_decimal(low, level - 1, low_width, parts, multiply)
+    else:
+        _int_to_decimal(low, level - 1, 0, parts, multiply)
+
+
+def int_to_decimal(x, multiply=native_multiplication):
+    """
+    Десятичная запись целого разделяй-и-властвуй: деление на кешированные 10**(k * 2**i)
+    через обратные по Ньютону, то есть за O(M(n) log n) вместо квадратичного str(int);
+    multiply - ядро умножения.
+    """
+    if x < 0:
+        return "-" + int_to_decimal(-x, multiply)
+    if x < decimal_power(LEAF_DIGITS):
+        return str(x)
+    level = 0
+    while (LEAF_DIGITS << (level + 1)) < decimal_length(x):
+        level += 1
+    parts = []
+    _int_to_decimal(x, level, 0, parts, multiply)
+    return "".join(parts)
+
+
+def _decimal_to_int(text, multiply):
+    if len(text) <= LEAF_DIGITS:
+        return int(text)
+    level = 0
+    while (LEAF_DIGITS << (level + 1)) < len(text):
+        level += 1
+    power, _ = conversion_power(level)
+    split = len(text) - (LEAF_DIGITS << level)
+    return multiply(_decimal_to_int(text[:split], multiply), power) + _decimal_to_int(text[split:], multiply)
+
+
+def decimal_to_int(text, multiply=native_multiplication):
+    """
+    Целое из десятичной строки разделяй-и-властвуй: int(старшие) * 10**k + int(младшие)
+    с кешированными степенями; multiply - ядро умножения (например, auto_multiplication).
+    """
+    text = text.strip()
+    if text.startswith("-"):
+        return -decimal_to_int(text[1:], multiply)
+    return _decimal_to_int(text.lstrip("+"), multiply)
+
+
+def random_operand_limbs(length, rng=np.random):
+    """
+    Случайное число ровно из length десятичных цифр сразу в виде массива лимбов:
+    равномерное значение меньше 9 * 10**(length-1) из случайных байтов (с отбраковкой)
+    плюс 10**(length-1). Десятичная запись при этом не строится.
+    """
+    low = decimal_power(length - 1)
+    span = 9 * low
+    bits = span.bit_length()
+    size = (bits + 7) // 8
+    while True:
+        limbs = rng.randint(0, 256, size, dtype=np.uint8)
+        limbs[-1] &= (1 << (bits - 8 * (size - 1))) - 1
+        value = limbs_to_int(limbs)
+        if value < span:
+            return int_to_limbs(value + low)
+
+
+def random_operand(length):
+    """Случайное целое из length десятичных цифр (см. random_operand_limbs)."""
+    return limbs_to_int(random_operand_limbs(length))
@@ -0,0 +1,919 @@
+import random
+from bisect import bisect_left, bisect_right
+
+from .avl_tree import AVLTree
+from .benchmark import measure
+
+
+def binary_tree_height(root, nil=None):
+    """Число уровней двоичного дерева (обход по уровням, без рекурсии); nil - пустое поддерево."""
+    height = 0
+    level = [root] if root is not nil else []
+    while level:
+        height += 1
+        level = [child for node in level for child in (node.left, node.right) if child is not nil]
+    return height
+
+
+def binary_tree_keys(root, nil=None):
+    stack = []
+    node = root
+    while stack or node is not nil:
+        while node is not nil:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node.key
+        node = node.right
+
+
+class RedBlackNode:
+    __slots__ = ("key", "red", "left", "right", "parent")
+
+    def __init__(self, key, nil):
+        self.key = key
+        self.red = True
+        self.left = nil
+        self.right = nil
+        self.parent = nil
+
+
+class RedBlackTree:
+    """
+    Красно-чёрное дерево (Кормен и др.) с узлом-стражем nil вместо None. Высота до 2 log n -
+    выше, чем у AVL, зато вставка делает не больше двух поворотов, а удаление - не больше трёх.
+    """
+
+    def __init__(self):
+        self.nil = RedBlackNode(None, None)
+        self.nil.red = False
+        self.nil.left = self.nil.right = self.nil.parent = self.nil
+        self.root = self.nil
+        self.count = 0
+        self.rotation_count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return binary_tree_keys(self.root, self.nil)
+
+    def find_node(self, key):
+        node = self.root
+        while node is not self.nil:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def contains(self, key):
+        return self.find_node(key) is not None
+
+    __contains__ = contains
+
+    def height(self):
+        return binary_tree_height(self.root, self.nil)
+
+    def left_rotate(self, x):
+        y = x.right
+        x.right = y.left
+        if y.left is not self.nil:
+            y.left.parent = x
+        y.parent = x.parent
+        if x.parent is self.nil:
+            self.root = y
+        elif x is x.parent.left:
+            x.parent.left = y
+        else:
+            x.parent.right = y
+        y.left = x
+        x.parent = y
+        self.rotation_count += 1
+
+    def right_rotate(self, x):
+        y = x.left
+        x.left = y.right
+        if y.right is not self.nil:
+            y.right.parent = x
+        y.parent = x.parent
+        if x.parent is self.nil:
+            self.root = y
+        elif x is x.parent.right:
+            x.parent.right = y
+        else:
+            x.parent.left = y
+        y.right = x
+        x.parent = y
+        self.rotation_count += 1
+
+    def insert_key(self, key):
+        parent = self.nil
+        node = self.root
+        while node is not self.nil:
+            parent = node
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return
+
+        node = RedBlackNode(key, self.nil)
+        node.parent = parent
+        if parent is self.nil:
+            self.root = node
+        elif key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        self.count += 1
+        self.insert_fixup(node)
+
+    def insert_fixup(self, node):
+        while node.parent.red:
+            parent = node.parent
+            grandparent = parent.parent
+            if parent is grandparent.left:
+                uncle = grandparent.right
+                if uncle.red:
+                    parent.red = uncle.red = False
+                    grandparent.red = True
+                    node = grandparent
+                    continue
+                if node is parent.right:
+                    node = parent
+                    self.left_rotate(node)
+                    parent = node.parent
+                parent.red = False
+                grandparent.red = True
+                self.right_rotate(grandparent)
+            else:
+                uncle = grandparent.left
+                if uncle.red:
+                    parent.red = uncle.red = False
+                    grandparent.red = True
+                    node = grandparent
+                    continue
+                if node is parent.left:
+                    node = parent
+                    self.right_rotate(node)
+                    parent = node.parent
+                parent.red = False
+                grandparent.red = True
+                self.left_rotate(grandparent)
+        self.root.red = False
+
+    def transplant(self, old, new):
+        if old.parent is self.nil:
+            self.root = new
+        elif old is old.parent.left:
+            old.parent.left = new
+        else:
+            old.parent.right = new
+        new.parent = old.parent
+
+    def delete_key(self, key):
+        node = self.find_node(key)
+        if node is None:
+            return
+        nil = self.nil
+        removed_red = node.red
+        if node.left is nil:
+            child = node.right
+            self.transplant(node, child)
+        elif node.right is nil:
+            child = node.left
+            self.transplant(node, child)
+        else:
+            successor = node.right
+            while successor.left is not nil:
+                successor = successor.left
+            removed_red = successor.red
+            child = successor.right
+            if successor.parent is node:
+                child.parent = successor
+            else:
+                self.transplant(successor, successor.right)
+                successor.right = node.right
+                successor.right.parent = successor
+            self.transplant(node, successor)
+            successor.left = node.left
+            successor.left.parent = successor
+            successor.red = node.red
+        self.count -= 1
+        if not removed_red:
+            self.delete_fixup(child)
+        # Страж мог получить родителя в transplant; возвращаем его в исходное состояние
+        nil.parent = nil
+
+    def delete_fixup(self, node):
+        while node is not self.root and not node.red:
+            parent = node.parent
+            if node is parent.left:
+                sibling = parent.right
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self.left_rotate(parent)
+                    sibling = parent.right
+                if not sibling.left.red and not sibling.right.red:
+                    sibling.red = True
+                    node = parent
+                    continue
+                if not sibling.right.red:
+                    sibling.left.red = False
+                    sibling.red = True
+                    self.right_rotate(sibling)
+                    sibling = parent.right
+                sibling.red = parent.red
+                parent.red = False
+                sibling.right.red = False
+                self.left_rotate(parent)
+            else:
+                sibling = parent.left
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self.right_rotate(parent)
+                    sibling = parent.left
+                if not sibling.right.red and not sibling.left.red:
+                    sibling.red = True
+                    node = parent
+                    continue
+                if not sibling.left.red:
+                    sibling.right.red = False
+                    sibling.red = True
+                    self.left_rotate(sibling)
+                    sibling = parent.left
+                sibling.red = parent.red
+                parent.red = False
+                sibling.left.red = False
+                self.right_rotate(parent)
+            node = self.root
+        node.red = False
+
+
+class BTreeNode:
+    __slots__ = ("keys", "children")
+
+    def __init__(self, keys=None, children=None):
+        self.keys = keys if keys is not None else []
+        self.children = children if children is not None else []
+
+    def is_leaf(self):
+        return not self.children
+
+
+class BTree:
+    """
+    B-дерево минимальной степени min_degree: в узле от min_degree - 1 до 2 * min_degree - 1
+    ключей в отсортированном списке. Широкий узел - это один двоичный поиск bisect внутри
+    списка вместо log2(ширины) переходов по указателям. Вставка заранее расщепляет полные
+    узлы на пути вниз, удаление заранее пополняет узлы с минимумом ключей - обе операции за один проход.
+    """
+
+    MIN_DEGREE = 32
+
+    def __init__(self, min_degree=MIN_DEGREE):
+        if min_degree < 2:
+            raise ValueError("Минимальная степень B-дерева должна быть не меньше 2")
+        self.min_degree = min_degree
+        self.root = BTreeNode()
+        self.count = 0
+        self.split_count = 0
+        self.merge_count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        stack = [(self.root, 0)]
+        while stack:
+            node, index = stack.pop()
+            if node.is_leaf():
+                yield from node.keys
+                continue
+            if index < len(node.children):
+                if index > 0:
+                    yield node.keys[index - 1]
+                stack.append((node, index + 1))
+                stack.append((node.children[index], 0))
+
+    def contains(self, key):
+        node = self.root
+        while True:
+            index = bisect_left(node.keys, key)
+            if index < len(node.keys) and node.keys[index] == key:
+                return True
+            if node.is_leaf():
+                return False
+            node = node.children[index]
+
+    __contains__ = contains
+
+    def height(self):
+        height = 1
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[0]
+            height += 1
+        return height
+
+    def split_child(self, parent, index):
+        t = self.min_degree
+        child = parent.children[index]
+        right = BTreeNode(child.keys[t:], child.children[t:] if child.children else [])
+        parent.keys.insert(index, child.keys[t - 1])
+        parent.children.insert(index + 1, right)
+        del child.keys[t - 1:]
+        if child.children:
+            del child.children[t:]
+        self.split_count += 1
+
+    def insert_key(self, key):
+        limit = 2 * self.min_degree - 1
+        if len(self.root.keys) == limit:
+            self.root = BTreeNode([], [self.root])
+            self.split_child(self.root, 0)
+
+        node = self.root
+        while True:
+            index = bisect_left(node.keys, key)
+            if index < len(node.keys) and node.keys[index] == key:
+                return
+            if node.is_leaf():
+                node.keys.insert(index, key)
+                self.count += 1
+                return
+            if len(node.children[index].keys) == limit:
+                self.split_child(node, index)
+                if key == node.keys[index]:
+                    return
+                if key > node.keys[index]:
+                    index += 1
+            node = node.children[index]
+
+    def merge_children(self, node, index):
+        """Сливает children[index], разделитель keys[index] и children[index + 1]."""
+        left = node.children[index]
+        right = node.children.pop(index + 1)
+        left.keys.append(node.keys.pop(index))
+        left.keys.extend(right.keys)
+        left.children.extend(right.children)
+        self.merge_count += 1
+        return left
+
+    def fill_child(self, node, index):
+        """Доводит children[index] до min_degree ключей займом у соседа или слиянием; возвращает этот узел."""
+        t = self.min_degree
+        child = node.children[index]
+        if index > 0 and len(node.children[index - 1].keys) >= t:
+            left = node.children[index - 1]
+            child.keys.insert(0, node.keys[index - 1])
+            node.keys[index - 1] = left.keys.pop()
+            if left.children:
+                child.children.insert(0, left.children.pop())
+            return child
+        if index + 1 < len(node.children) and len(node.children[index + 1].keys) >= t:
+            right = node.children[index + 1]
+            child.keys.append(node.keys[index])
+            node.keys[index] = right.keys.pop(0)
+            if right.children:
+                child.children.append(right.children.pop(0))
+            return child
+        if index + 1 < len(node.children):
+            return self.merge_children(node, index)
+        return self.merge_children(node, index - 1)
+
+    def delete_key(self, key):
+        t = self.min_degree
+        node = self.root
+        found = False
+        while True:
+            index = bisect_left(node.keys, key)
+            if index < len(node.keys) and node.keys[index] == key:
+                found = True
+                if node.is_leaf():
+                    node.keys.pop(index)
+                    break
+                left, right = node.children[index], node.children[index + 1]
+                if len(left.keys) >= t:
+                    # Ключ заменяется предшественником, который затем удаляется из левого поддерева
+                    predecessor = left
+                    while not predecessor.is_leaf():
+                        predecessor = predecessor.children[-1]
+                    key = node.keys[index] = predecessor.keys[-1]
+                    next_node = left
+                elif len(right.keys) >= t:
+                    successor = right
+                    while not successor.is_leaf():
+                        successor = successor.children[0]
+                    key = node.keys[index] = successor.keys[0]
+                    next_node = right
+                else:
+                    next_node = self.merge_children(node, index)
+            else:
+                if node.is_leaf():
+                    break
+                next_node = node.children[index]
+                if len(next_node.keys) < t:
+                    next_node = self.fill_child(node, index)
+
+            if node is self.root and not node.keys:
+                self.root = next_node
+            node = next_node
+
+        if found:
+            self.count -= 1
+
+
+class BPlusNode:
+    __slots__ = ("keys", "children", "next")
+
+    def __init__(self, keys=None, children=None):
+        self.keys = keys if keys is not None else []
+        # У листа children is None; next связывает листья по возрастанию ключей
+        self.children = children
+        self.next = None
+
+    def is_leaf(self):
+        return self.children is None
+
+
+class BPlusTree:
+    """
+    B+-дерево порядка order: ключи хранятся только в листьях (до order ключей), внутренние
+    узлы содержат разделители (до order сыновей), листья связаны в список - просмотр
+    диапазона идёт по листьям подряд, без возврата к корню.
+    Разделитель keys[i] внутреннего узла не больше всех ключей сына i + 1 и больше всех ключей сына i.
+    """
+
+    ORDER = 64
+
+    def __init__(self, order=ORDER):
+        if order < 3:
+            raise ValueError("Порядок B+-дерева должен быть не меньше 3")
+        self.order = order
+        # Не меньше половины (с округлением вверх): после слияния двух неполных узлов получается не больше order
+        self.min_keys = (order + 1) // 2
+        self.root = BPlusNode()
+        self.count = 0
+        self.split_count = 0
+        self.merge_count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def find_leaf(self, key, path=None):
+        node = self.root
+        while not node.is_leaf():
+            index = bisect_right(node.keys, key)
+            if path is not None:
+                path.append((node, index))
+            node = node.children[index]
+        return node
+
+    def contains(self, key):
+        leaf = self.find_leaf(key)
+        index = bisect_left(leaf.keys, key)
+        return index < len(leaf.keys) and leaf.keys[index] == key
+
+    __contains__ = contains
+
+    def iter_range(self, low=None, high=None):
+        """Ключи из [low, high] по возрастанию: спуск к первому листу и проход по списку листьев."""
+        if low is None:
+            leaf = self.root
+            while not leaf.is_leaf():
+                leaf = leaf.children[0]
+            index = 0
+        else:
+            leaf = self.find_leaf(low)
+            index = bisect_left(leaf.keys, low)
+        while leaf is not None:
+            keys = leaf.keys
+            while index < len(keys):
+                if high is not None and keys[index] > high:
+                    return
+                yield keys[index]
+                index += 1
+            leaf = leaf.next
+            index = 0
+
+    def height(self):
+        height = 1
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[0]
+            height += 1
+        return height
+
+    def insert_key(self, key):
+        path = []
+        leaf = self.find_leaf(key, path)
+        index = bisect_left(leaf.keys, key)
+        if index < len(leaf.keys) and leaf.keys[index] == key:
+            return
+        leaf.keys.insert(index, key)
+        self.count += 1
+        if len(leaf.keys) <= self.order:
+            return
+
+        # Расщепление листа, затем, пока нужно, - предков по сохранённому пути
+        middle = len(leaf.keys) // 2
+        right = BPlusNode(leaf.keys[middle:])
+        del leaf.keys[middle:]
+        right.next = leaf.next
+        leaf.next = right
+        separator = right.keys[0]
+        self.split_count += 1
+
+        while path:
+            parent, index = path.pop()
+            parent.keys.insert(index, separator)
+            parent.children.insert(index + 1, right)
+            if len(parent.children) <= self.order:
+                return
+            middle = len(parent.keys) // 2
+            separator = parent.keys[middle]
+            right = BPlusNode(parent.keys[middle + 1:], parent.children[middle + 1:])
+            del parent.keys[middle:]
+            del parent.children[middle + 1:]
+            self.split_count += 1
+
+        self.root = BPlusNode([separator], [self.root, right])
+
+    def delete_key(self, key):
+        path = []
+        leaf = self.find_leaf(key, path)
+        index = bisect_left(leaf.keys, key)
+        if index == len(leaf.keys) or leaf.keys[index] != key:
+            return
+        leaf.keys.pop(index)
+        self.count -= 1
+
+        node = leaf
+        while path and self.underflows(node):
+            parent, index = path.pop()
+            self.rebalance_child(parent, index)
+            node = parent
+
+        if not self.root.is_leaf() and len(self.root.children) == 1:
+            self.root = self.root.children[0]
+
+    def underflows(self, node):
+        if node.is_leaf():
+            return len(node.keys) < self.min_keys
+        return len(node.children) < self.min_keys
+
+    def rebalance_child(self, parent, index):
+        """Пополняет children[index] займом у соседа через разделитель или сливает с соседом."""
+        child = parent.children[index]
+        left = parent.children[index - 1] if index > 0 else None
+        right = parent.children[index + 1] if index + 1 < len(parent.children) else None
+
+        if child.is_leaf():
+            if left is not None and len(left.keys) > self.min_keys:
+                child.keys.insert(0, left.keys.pop())
+                parent.keys[index - 1] = child.keys[0]
+                return
+            if right is not None and len(right.keys) > self.min_keys:
+                child.keys.append(right.keys.pop(0))
+                parent.keys[index] = right.keys[0]
+                return
+            if left is not None:
+                child, right, index = left, child, index - 1
+            left_leaf, right_leaf = child, right
+            left_leaf.keys.extend(right_leaf.keys)
+            left_leaf.next = right_leaf.next
+        else:
+            if left is not None and len(left.children) > self.min_keys:
+                child.keys.insert(0, parent.keys[index - 1])
+                parent.keys[index - 1] = left.keys.pop()
+                child.children.insert(0, left.children.pop())
+                return
+            if right is not None and len(right.children) > self.min_keys:
+                child.keys.append(parent.keys[index])
+                parent.keys[index] = right.keys.pop(0)
+                child.children.append(right.children.pop(0))
+                return
+            if left is not None:
+                child, right, index = left, child, index - 1
+            child.keys.append(parent.keys[index])
+            child.keys.extend(right.keys)
+            child.children.extend(right.children)
+
+        parent.keys.pop(index)
+        parent.children.pop(index + 1)
+        self.merge_count += 1
+
+
+class TreapNode:
+    __slots__ = ("key", "priority", "left", "right")
+
+    def __init__(self, key, priority):
+        self.key = key
+        self.priority = priority
+        self.left = None
+        self.right = None
+
+
+class Treap:
+    """
+    Декартово дерево: дерево поиска по ключам и куча по случайным приоритетам,
+    поэтому ожидаемая высота O(log n) при любом порядке вставок. Вставка поднимает
+    новый узел поворотами, удаление опускает узел поворотами до листа.
+    """
+
+    def __init__(self, seed=None):
+        self.root = None
+        self.count = 0
+        self.rotation_count = 0
+        self.random = random.Random(seed)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return binary_tree_keys(self.root)
+
+    def contains(self, key):
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return True
+        return False
+
+    __contains__ = contains
+
+    def height(self):
+        return binary_tree_height(self.root)
+
+    def replace_child(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def insert_key(self, key):
+        path = []
+        node = self.root
+        while node is not None:
+            if key == node.key:
+                return
+            path.append(node)
+            node = node.left if key < node.key else node.right
+
+        node = TreapNode(key, self.random.random())
+        if not path:
+            self.root = node
+        elif key < path[-1].key:
+            path[-1].left = node
+        else:
+            path[-1].right = node
+        self.count += 1
+
+        while path and path[-1].priority < node.priority:
+            parent = path.pop()
+            if parent.left is node:
+                parent.left = node.right
+                node.right = parent
+            else:
+                parent.right = node.left
+                node.left = parent
+            self.replace_child(path[-1] if path else None, parent, node)
+            self.rotation_count += 1
+
+    def delete_key(self, key):
+        parent = None
+        node = self.root
+        while node is not None and node.key != key:
+            parent = node
+            node = node.left if key < node.key else node.right
+        if node is None:
+            return
+
+        # Опускаем узел, поднимая сына с большим приоритетом, пока у узла два сына
+        while node.left is not None and node.right is not None:
+            if node.left.priority > node.right.priority:
+                child = node.left
+                node.left = child.right
+                child.right = node
+            else:
+                child = node.right
+                node.right = child.left
+                child.left = node
+            self.replace_child(parent, node, child)
+            self.rotation_count += 1
+            parent = child
+
+        self.replace_child(parent, node, node.left if node.left is not None else node.right)
+        self.count -= 1
+
+
+class SkipListNode:
+    __slots__ = ("key", "forward")
+
+    def __init__(self, key, level):
+        self.key = key
+        self.forward = [None] * level
+
+
+class SkipList:
+    """
+    Список с пропусками: узел попадает на каждый следующий уровень с вероятностью 1/2,
+    поиск спускается с верхнего уровня. Перестроений нет; height() - число занятых уровней.
+    """
+
+    MAX_LEVEL = 32
+
+    def __init__(self, seed=None):
+        self.head = SkipListNode(None, self.MAX_LEVEL)
+        self.level = 1
+        self.count = 0
+        self.random = random.Random(seed)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        node = self.head.forward[0]
+        while node is not None:
+            yield node.key
+            node = node.forward[0]
+
+    def random_level(self):
+        # Номер младшего единичного бита случайного числа распределён геометрически с p = 1/2
+        bits = self.random.getrandbits(self.MAX_LEVEL - 1) | (1 << (self.MAX_LEVEL - 1))
+        return (bits & -bits).bit_length()
+
+    def find_predecessors(self, key):
+        update = [self.head] * self.MAX_LEVEL
+        node = self.head
+        for level in range(self.level - 1, -1, -1):
+            following = node.forward[level]
+            while following is not None and following.key < key:
+                node = following
+                following = node.forward[level]
+            update[level] = node
+        return update
+
+    def contains(self, key):
+        node = self.head
+        for level in range(self.level - 1, -1, -1):
+            following = node.forward[level]
+            while following is not None and following.key < key:
+                node = following
+                following = node.forward[level]
+        node = node.forward[0]
+        return node is not None and node.key == key
+
+    __contains__ = contains
+
+    def height(self):
+        return self.level
+
+    def insert_key(self, key):
+        update = self.find_predecessors(key)
+        following = update[0].forward[0]
+        if following is not None and following.key == key:
+            return
+        level = self.random_level()
+        if level > self.level:
+            self.level = level
+        node = SkipListNode(key, level)
+        for index in range(level):
+            node.forward[index] = update[index].forward[index]
+            update[index].forward[index] = node
+        self.count += 1
+
+    def delete_key(self, key):
+        update = self.find_predecessors(key)
+        node = update[0].forward[0]
+        if node is None or node.key != key:
+            return
+        for index in range(len(node.forward)):
+            update[index].forward[index] = node.forward[index]
+        while self.level > 1 and self.head.forward[self.level - 1] is None:
+            self.level -= 1
+        self.count -= 1
+
+
+class TreeEngine:
+    """
+    Структура для сравнения на вкладке деревьев: factory() создаёт пустое дерево с методами
+    insert_key, delete_key, contains и height; counter - имя счётчика перестроений
+    (поворотов или расщеплений) или None, если их нет.
+    """
+
+    def __init__(self, name, label, factory, counter=None):
+        self.name = name
+        self.label = label
+        self.factory = factory
+        self.counter = counter
+
+    def restructures(self, tree):
+        return getattr(tree, self.counter) if self.counter else 0
+
+
+TREE_ENGINES = {}
+
+
+def register_tree_engine(engine):
+    TREE_ENGINES[engine.name] = engine
+    return engine
+
+
+register_tree_engine(TreeEngine("avl", "AVL-дерево", AVLTree, "rotation_count"))
+register_tree_engine(TreeEngine("red_black", "Красно-чёрное дерево", RedBlackTree, "rotation_count"))
+register_tree_engine(TreeEngine("btree", "B-дерево", BTree, "split_count"))
+register_tree_engine(TreeEngine("bplus", "B+-дерево", BPlusTree, "split_count"))
+register_tree_engine(TreeEngine("treap", "Декартово дерево", Treap, "rotation_count"))
+register_tree_engine(TreeEngine("skip_list", "Список с пропусками", SkipList))
+
+
+# Доли вставок, удалений и поисков в смешанной нагрузке
+WORKLOADS = (
+    ("чтение 80%", (10, 10, 80)),
+    ("поровну", (34, 33, 33)),
+    ("запись 90%", (45, 45, 10)),
+)
+KEY_ORDERS = (("random", "случайные ключи"), ("sorted", "возрастающие ключи"))
+
+
+def workload_keys(size, order, seed=0):
+    """
+    Ключи начального заполнения и вставок нагрузки: при order="sorted" - по возрастанию,
+    иначе - случайная перестановка. Удаления и поиски берут случайные ключи из того же диапазона.
+    """
+    keys = list(range(2 * size))
+    if order != "sorted":
+        random.Random(seed).shuffle(keys)
+    return keys[:size], keys[size:]
+
+
+def workload_operations(tree, mix, inserted_keys, size, seed=0):
+    """size операций (метод, ключ) над tree в пропорции mix = (вставки, удаления, поиски)."""
+    rng = random.Random(seed)
+    insert_weight, delete_weight, _ = mix
+    total = sum(mix)
+    new_keys = iter(inserted_keys)
+    key_space = 2 * size
+    operations = []
+    for _ in range(size):
+        choice = rng.randrange(total)
+        if choice < insert_weight:
+            operations.append((tree.insert_key, next(new_keys)))
+        elif choice < insert_weight + delete_weight:
+            operations.append((tree.delete_key, rng.randrange(key_space)))
+        else:
+            operations.append((tree.contains, rng.randrange(key_space)))
+    return operations
+
+
+def run_operations(operations):
+    for function, key in operations:
+        function(key)
+
+
+def benchmark_tree_engine(name, size, repeat=3, seed=0):
+    """
+    Смешанные нагрузки для структуры TREE_ENGINES[name]: для каждой доли операций и порядка ключей
+    дерево заполняется size ключами (вне замера) и выполняет size операций.
+    Возвращает {(нагрузка, порядок ключей): (Measurement, высота, перестроения за нагрузку)}.
+    """
+    engine = TREE_ENGINES[name]
+    results = {}
+    for order, order_label in KEY_ORDERS:
+        initial_keys, inserted_keys = workload_keys(size, order, seed)
+        for workload_label, mix in WORKLOADS:
+            state = {}
+
+            def setup():
+                tree = engine.factory()
+                for key in initial_keys:
+                    tree.insert_key(key)
+                state["tree"] = tree
+                state["restructures"] = engine.restructures(tree)
+                return (workload_operations(tree, mix, inserted_keys, size, seed),)
+
+            measurement = measure(run_operations, setup=setup, repeat=repeat)
+            tree = state["tree"]
+            results[(workload_label, order_label)] = (
+                measurement,
+                tree.height(),
+                engine.restructures(tree) - state["restructures"],
+            )
+    return results
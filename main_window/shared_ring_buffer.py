@@ -0,0 +1,285 @@
+import multiprocessing
+import platform
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .benchmark import measure
+from .parallel_multiplication import attach_shared_block
+
+# Голова и хвост лежат в разных строках кеша, чтобы производитель и потребитель не делили одну
+HEADER_BYTES = 128
+HEAD = 0
+TAIL = 8
+# На x86 записи в память видны другим процессорам в порядке выполнения (TSO), см. SharedRingBuffer
+ORDERED_STORES = platform.machine().lower() in ("x86_64", "amd64", "i386", "i686", "x86")
+
+
+class SharedRingBuffer:
+    """
+    Кольцевой буфер в общей памяти (multiprocessing.shared_memory) с фиксированными ячейками:
+    каждая ячейка - массив NumPy формы shape и типа dtype, записи копируются в ячейку и из неё
+    без pickle, а reserve/commit и peek/release дают прямой доступ к ячейке без копирования.
+
+    head и tail - счётчики int64 в начале блока. Каждый из них изменяет только одна сторона
+    (tail - производитель, head - потребитель), а запись выровненного 8-байтового слова атомарна,
+    поэтому один производитель и один потребитель обходятся без блокировок. Для нескольких
+    производителей или потребителей соответствующая сторона берёт межпроцессную блокировку.
+
+    Без блокировок запись публикуется тем, что сначала копируется содержимое ячейки, а затем
+    обновляется tail (у потребителя - чтение ячейки, затем head). Ни Python, ни NumPy не дают
+    барьеров памяти, и этот порядок виден другому процессу только на платформах с упорядоченными
+    записями - x86 (ORDERED_STORES). Поэтому lock_free по умолчанию включён только там; иначе обе
+    стороны и reserve/commit, peek/release берут одну общую блокировку, захват и освобождение
+    которой служат барьерами. reserve/commit и peek/release рассчитаны на одного производителя
+    и одного потребителя.
+
+    Экземпляр передаётся в дочерний процесс как аргумент Process: там он подключается к тому же
+    блоку по имени. Блок удаляет только создатель - вызовом unlink().
+    """
+
+    def __init__(self, capacity, shape=(), dtype=np.float64, multi_producer=False, multi_consumer=False,
+                 lock_free=None):
+        if capacity <= 0:
+            raise ValueError("Ёмкость буфера должна быть положительной")
+        self.capacity = capacity
+        self.shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        self.dtype = np.dtype(dtype)
+        record_bytes = int(np.prod(self.shape, dtype=np.int64)) * self.dtype.itemsize
+        self.block = shared_memory.SharedMemory(create=True, size=HEADER_BYTES + capacity * record_bytes)
+        self.owner = True
+        context = multiprocessing.get_context("spawn")
+        if lock_free is None:
+            lock_free = ORDERED_STORES
+        if lock_free:
+            self.ordering_lock = None
+            self.producer_lock = context.Lock() if multi_producer else None
+            self.consumer_lock = context.Lock() if multi_consumer else None
+        else:
+            self.ordering_lock = context.Lock()
+            self.producer_lock = self.consumer_lock = self.ordering_lock
+        self._map()
+        self.indices[HEAD] = 0
+        self.indices[TAIL] = 0
+
+    def _map(self):
+        self.indices = np.ndarray(HEADER_BYTES // 8, dtype=np.int64, buffer=self.block.buf)
+        self.slots = np.ndarray(
+            (self.capacity,) + self.shape, dtype=self.dtype, buffer=self.block.buf, offset=HEADER_BYTES
+        )
+
+    def __getstate__(self):
+        return {
+            "name": self.block.name,
+            "capacity": self.capacity,
+            "shape": self.shape,
+            "dtype": self.dtype,
+            "producer_lock": self.producer_lock,
+            "consumer_lock": self.consumer_lock,
+            "ordering_lock": self.ordering_lock,
+        }
+
+    def __setstate__(self, state):
+        self.capacity = state["capacity"]
+        self.shape = state["shape"]
+        self.dtype = state["dtype"]
+        self.producer_lock = state["producer_lock"]
+        self.consumer_lock = state["consumer_lock"]
+        self.ordering_lock = state["ordering_lock"]
+        self.block = attach_shared_block(state["name"])
+        self.owner = False
+        self._map()
+
+    def size(self):
+        return int(self.indices[TAIL] - self.indices[HEAD])
+
+    def is_empty(self):
+        return self.size() == 0
+
+    def _slot(self, counter):
+        """Представление ячейки для счётчика counter (в том числе нульмерное для shape=())."""
+        index = counter % self.capacity
+        return self.slots[index:index + 1].reshape(self.shape)
+
+    def _reserve(self):
+        tail = int(self.indices[TAIL])
+        if tail - int(self.indices[HEAD]) >= self.capacity:
+            return None
+        return self._slot(tail)
+
+    def _commit(self):
+        self.indices[TAIL] = self.indices[TAIL] + 1
+
+    def _peek(self):
+        head = int(self.indices[HEAD])
+        if head == int(self.indices[TAIL]):
+            return None
+        return self._slot(head)
+
+    def _release(self):
+        self.indices[HEAD] = self.indices[HEAD] + 1
+
+    def _ordered(self, operation):
+        if self.ordering_lock is None:
+            return operation()
+        with self.ordering_lock:
+            return operation()
+
+    def reserve(self):
+        """Ячейка для следующей записи или None, если буфер полон; запись публикуется вызовом commit()."""
+        return self._ordered(self._reserve)
+
+    def commit(self):
+        self._ordered(self._commit)
+
+    def peek(self):
+        """Ячейка с первой записью (без копирования) или None; освобождается вызовом release()."""
+        return self._ordered(self._peek)
+
+    def release(self):
+        self._ordered(self._release)
+
+    def _enqueue(self, item):
+        tail = int(self.indices[TAIL])
+        if tail - int(self.indices[HEAD]) >= self.capacity:
+            return False
+        self.slots[tail % self.capacity] = item
+        self.indices[TAIL] = tail + 1
+        return True
+
+    def _dequeue(self):
+        head = int(self.indices[HEAD])
+        if head == int(self.indices[TAIL]):
+            return None
+        item = self.slots[head % self.capacity].copy()
+        self.indices[HEAD] = head + 1
+        return item
+
+    def enqueue(self, item):
+        """Копирует item в буфер; возвращает False, если буфер полон."""
+        if self.producer_lock is None:
+            return self._enqueue(item)
+        with self.producer_lock:
+            return self._enqueue(item)
+
+    def dequeue(self):
+        """Копия первой записи или None, если буфер пуст."""
+        if self.consumer_lock is None:
+            return self._dequeue()
+        with self.consumer_lock:
+            return self._dequeue()
+
+    def _enqueue_many(self, items):
+        tail = int(self.indices[TAIL])
+        count = min(len(items), self.capacity - (tail - int(self.indices[HEAD])))
+        start = tail % self.capacity
+        first = min(count, self.capacity - start)
+        self.slots[start:start + first] = items[:first]
+        self.slots[:count - first] = items[first:count]
+        self.indices[TAIL] = tail + count
+        return count
+
+    def _dequeue_many(self, count):
+        head = int(self.indices[HEAD])
+        available = int(self.indices[TAIL]) - head
+        count = available if count is None else min(count, available)
+        start = head % self.capacity
+        first = min(count, self.capacity - start)
+        items = np.concatenate((self.slots[start:start + first], self.slots[:count - first]))
+        self.indices[HEAD] = head + count
+        return items
+
+    def enqueue_many(self, items):
+        """Записывает столько записей из массива items формы (k,) + shape, сколько помещается; возвращает их число."""
+        items = np.asarray(items, dtype=self.dtype)
+        if self.producer_lock is None:
+            return self._enqueue_many(items)
+        with self.producer_lock:
+            return self._enqueue_many(items)
+
+    def dequeue_many(self, count=None):
+        """Массив из не более чем count первых записей (по умолчанию всех)."""
+        if self.consumer_lock is None:
+            return self._dequeue_many(count)
+        with self.consumer_lock:
+            return self._dequeue_many(count)
+
+    def put(self, item, timeout=None):
+        """Блокирующий enqueue: опрашивает буфер, пока не освободится ячейка, иначе queue.Full по timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.enqueue(item):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise queue.Full
+            time.sleep(0)
+
+    def get(self, timeout=None):
+        """Блокирующий dequeue: опрашивает буфер, пока не появится запись, иначе queue.Empty по timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            item = self.dequeue()
+            if item is not None:
+                return item
+            if deadline is not None and time.monotonic() >= deadline:
+                raise queue.Empty
+            time.sleep(0)
+
+    def close(self):
+        # Представления буфера должны быть освобождены до close()
+        self.indices = None
+        self.slots = None
+        self.block.close()
+
+    def unlink(self):
+        if self.owner:
+            self.block.unlink()
+
+
+def produce_records(channel, ready, start, count, shape, dtype):
+    """Производитель для замера: сообщает ready и после start отправляет в channel count записей формы shape."""
+    record = np.ones(shape, dtype=dtype)
+    ready.set()
+    start.wait()
+    for _ in range(count):
+        channel.put(record)
+
+
+def consume_records(process, start, channel, count):
+    start.set()
+    for _ in range(count):
+        channel.get()
+    process.join()
+
+
+def transfer_throughput(channel, count, shape, dtype=np.float64):
+    """
+    Замер передачи count записей из дочернего процесса через channel с методами put/get
+    (SharedRingBuffer или multiprocessing.Queue). Процесс-производитель запускается вне замера,
+    а замер начинается, когда он готов (ready), так что в него входит только передача.
+    """
+    context = multiprocessing.get_context("spawn")
+
+    def start_producer():
+        ready = context.Event()
+        start = context.Event()
+        process = context.Process(target=produce_records, args=(channel, ready, start, count, shape, dtype))
+        process.start()
+        ready.wait()
+        return process, start, channel, count
+
+    return measure(consume_records, setup=start_producer, repeat=3)
+
+
+def compare_with_multiprocessing_queue(count, shape, capacity=1024, dtype=np.float64):
+    """Медианы transfer_throughput для SharedRingBuffer и multiprocessing.Queue одной ёмкости."""
+    ring = SharedRingBuffer(capacity, shape, dtype)
+    try:
+        ring_time = transfer_throughput(ring, count, shape, dtype)
+    finally:
+        ring.close()
+        ring.unlink()
+    mp_queue = multiprocessing.get_context("spawn").Queue(capacity)
+    queue_time = transfer_throughput(mp_queue, count, shape, dtype)
+    mp_queue.close()
+    return ring_time, queue_time
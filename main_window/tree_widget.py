@@ -1,123 +1,29 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel,
-                             QPushButton, QGraphicsView,
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel,
+                             QPushButton, QGraphicsView, QTextEdit,
                              QGraphicsScene, QLineEdit, QMessageBox)
 from PyQt5.QtGui import QPainter, QPen, QColor
 from PyQt5.QtCore import Qt, QPointF
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+import os
 import random
 
-
-class AVLNode:
-    def __init__(self, key):
-        self.key = key
-        self.height = 1
-        self.left = None
-        self.right = None
-
-
-class AVLTree:
-    def __init__(self):
-        self.root = None
-        self.rotation_count = 0
-
-    def get_height(self, node):
-        return node.height if node else 0
-
-    def update_height(self, node):
-        if node:
-            node.height = max(self.get_height(node.left), self.get_height(node.right)) + 1
-
-    def get_balance(self, node):
-        return self.get_height(node.left) - self.get_height(node.right) if node else 0
-
-    def left_rotate(self, z):
-        y = z.right
-        T2 = y.left
-        y.left = z
-        z.right = T2
-        self.update_height(z)
-        self.update_height(y)
-        self.rotation_count += 1
-        return y
-
-    def right_rotate(self, z):
-        y = z.left
-        T3 = y.right
-        y.right = z
-        z.left = T3
-        self.update_height(z)
-        self.update_height(y)
-        self.rotation_count += 1
-        return y
-
-    def balance(self, node):
-        self.update_height(node)
-        balance = self.get_balance(node)
-
-        if balance > 1 and self.get_balance(node.left) >= 0:
-            return self.right_rotate(node)
-
-        if balance > 1 and self.get_balance(node.left) < 0:
-            node.left = self.left_rotate(node.left)
-            return self.right_rotate(node)
-
-        if balance < -1 and self.get_balance(node.right) <= 0:
-            return self.left_rotate(node)
-
-        if balance < -1 and self.get_balance(node.right) > 0:
-            node.right = self.right_rotate(node.right)
-            return self.left_rotate(node)
-
-        return node
-
-    def insert(self, node, key):
-        if not node:
-            return AVLNode(key)
-
-        if key < node.key:
-            node.left = self.insert(node.left, key)
-        elif key > node.key:
-            node.right = self.insert(node.right, key)
-        else:
-            return node
-
-        return self.balance(node)
-
-    def insert_key(self, key):
-        self.root = self.insert(self.root, key)
-
-    def find_min(self, node):
-        current = node
-        while current.left is not None:
-            current = current.left
-        return current
-
-    def delete(self, node, key):
-        if not node:
-            return node
-
-        if key < node.key:
-            node.left = self.delete(node.left, key)
-        elif key > node.key:
-            node.right = self.delete(node.right, key)
-        else:
-            if not node.left:
-                return node.right
-            elif not node.right:
-                return node.left
-
-            temp = self.find_min(node.right)
-            node.key = temp.key
-            node.right = self.delete(node.right, temp.key)
-
-        return self.balance(node)
-
-    def delete_key(self, key):
-        self.root = self.delete(self.root, key)
+from .avl_tree import AVLNode, AVLTree
+from .benchmark import measure
+from .benchmark_executor import BenchmarkJob
+from .disk_bplus_tree import benchmark_disk_index
+from .search_trees import KEY_ORDERS, TREE_ENGINES, WORKLOADS, benchmark_tree_engine
 
 
 class TreesTabWidget(QWidget):
-    def __init__(self, parent=None):
+    """
+    Вкладка деревьев. start_benchmark - функция запуска замеров в фоне
+    (MainWindow.start_benchmark); без неё замеры недоступны.
+    """
+
+    def __init__(self, parent=None, start_benchmark=None):
         super().__init__(parent)
+        self.start_benchmark = start_benchmark
         self.avl_tree = AVLTree()
         for _ in range(20):
             self.avl_tree.insert_key(random.randint(1, 100))
@@ -126,6 +32,7 @@ class TreesTabWidget(QWidget):
         self.update_tree_view()
 
     def init_ui(self):
+        main_layout = QHBoxLayout()
         layout = QVBoxLayout()
         self.label = QLabel("Реализация AVL-дерева с балансировкой.")
         layout.addWidget(self.label)
@@ -142,11 +49,199 @@ class TreesTabWidget(QWidget):
         self.delete_button.clicked.connect(self.delete_element)
         layout.addWidget(self.delete_button)
 
+        self.find_button = QPushButton("Найти элемент")
+        self.find_button.clicked.connect(self.find_element)
+        layout.addWidget(self.find_button)
+
         self.scene = QGraphicsScene()
         self.graphics_view = QGraphicsView(self.scene)
         layout.addWidget(self.graphics_view)
 
-        self.setLayout(layout)
+        main_layout.addLayout(layout, 1)
+        main_layout.addLayout(self.create_benchmark_panel(), 1)
+        self.setLayout(main_layout)
+
+    def create_benchmark_panel(self):
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Операции над множествами на основе join и split"))
+
+        form = QFormLayout()
+        self.first_size_input = QLineEdit("100000")
+        self.second_size_input = QLineEdit("100000")
+        form.addRow(QLabel("Ключей в первом дереве:"), self.first_size_input)
+        form.addRow(QLabel("Ключей во втором дереве:"), self.second_size_input)
+        layout.addLayout(form)
+
+        self.set_operations_button = QPushButton("Сравнить с поэлементной вставкой")
+        self.set_operations_button.clicked.connect(self.run_set_operations_benchmark)
+        self.set_operations_button.setEnabled(self.start_benchmark is not None)
+        layout.addWidget(self.set_operations_button)
+
+        layout.addWidget(QLabel("Сравнение структур на смешанной нагрузке"))
+        engines_form = QFormLayout()
+        self.workload_size_input = QLineEdit("20000")
+        engines_form.addRow(QLabel("Ключей и операций в нагрузке:"), self.workload_size_input)
+        layout.addLayout(engines_form)
+
+        self.engines_button = QPushButton("Сравнить структуры")
+        self.engines_button.clicked.connect(self.run_engines_benchmark)
+        self.engines_button.setEnabled(self.start_benchmark is not None)
+        layout.addWidget(self.engines_button)
+
+        layout.addWidget(QLabel("Индекс на диске: B+-дерево в mmap-файле с LRU-кешем страниц"))
+        disk_form = QFormLayout()
+        self.disk_size_input = QLineEdit("200000")
+        disk_form.addRow(QLabel("Ключей в индексе:"), self.disk_size_input)
+        layout.addLayout(disk_form)
+
+        self.disk_index_button = QPushButton("Сравнить индекс в памяти и на диске")
+        self.disk_index_button.clicked.connect(self.run_disk_index_benchmark)
+        self.disk_index_button.setEnabled(self.start_benchmark is not None)
+        layout.addWidget(self.disk_index_button)
+
+        self.benchmark_output = QTextEdit()
+        self.benchmark_output.setReadOnly(True)
+        layout.addWidget(self.benchmark_output, 1)
+
+        self.engines_figure = Figure(figsize=(6, 3))
+        self.engines_canvas = FigureCanvas(self.engines_figure)
+        layout.addWidget(self.engines_canvas, 2)
+        # График нужен только сравнению структур, остальные замеры выводят текст на всю высоту
+        self.engines_canvas.setVisible(False)
+        self.engine_results = {}
+        return layout
+
+    def run_set_operations_benchmark(self):
+        first_text, second_text = self.first_size_input.text(), self.second_size_input.text()
+        if not (first_text.isdigit() and second_text.isdigit()):
+            QMessageBox.warning(self, "Ошибка", "Введите размеры деревьев целыми числами")
+            return
+        first_size, second_size = int(first_text), int(second_text)
+        job = BenchmarkJob(
+            "операций над множествами", first_size, self.test_set_operations,
+            (first_size, second_size, os.cpu_count() or 1), return_value=True,
+        )
+        self.benchmark_output.clear()
+        self.engines_canvas.setVisible(False)
+        self.start_benchmark([job], self.add_benchmark_result)
+
+    def add_benchmark_result(self, result):
+        text = result.value if result.error is None else f"  Ошибка: {result.error}\n"
+        self.benchmark_output.append(f"Деревья из {result.job.size} и {result.job.arguments[1]} ключей:\n{text}")
+
+    def run_engines_benchmark(self):
+        size_text = self.workload_size_input.text()
+        if not size_text.isdigit() or int(size_text) == 0:
+            QMessageBox.warning(self, "Ошибка", "Введите размер нагрузки положительным целым числом")
+            return
+        size = int(size_text)
+        jobs = [
+            BenchmarkJob(engine.label, size, benchmark_tree_engine, (engine.name, size), return_value=True)
+            for engine in TREE_ENGINES.values()
+        ]
+        self.benchmark_output.clear()
+        self.engine_results = {}
+        self.engines_canvas.setVisible(True)
+        points = "; ".join(
+            f"{number} - {workload}, {order}" for number, (workload, order) in enumerate(self.engine_cases(), 1)
+        )
+        self.benchmark_output.append(f"Точки на графиках: {points}")
+        self.start_benchmark(jobs, self.add_engine_result)
+
+    def add_engine_result(self, result):
+        if result.error is not None:
+            self.benchmark_output.append(f"{result.job.series}: ошибка: {result.error}")
+            return
+        self.engine_results[result.job.series] = result.value
+        lines = [f"{result.job.series}:"]
+        for (workload, order), (measurement, height, restructures) in result.value.items():
+            lines.append(
+                f"  {workload}, {order}: {result.job.size / measurement.median:.0f} оп/с, "
+                f"высота {height}, перестроений {restructures}"
+            )
+        self.benchmark_output.append("\n".join(lines))
+        self.plot_engine_results(result.job.size)
+
+    @staticmethod
+    def engine_cases():
+        """Сочетания нагрузки и порядка ключей в порядке точек на графиках."""
+        return [(workload, order) for _, order in KEY_ORDERS for workload, _ in WORKLOADS]
+
+    def plot_engine_results(self, size):
+        """Пропускная способность, высота и число перестроений по нагрузкам для каждой структуры."""
+        self.engines_figure.clear()
+        cases = self.engine_cases()
+        labels = [str(number) for number in range(1, len(cases) + 1)]
+        axes = self.engines_figure.subplots(1, 3)
+        titles = ("Тыс. операций в секунду", "Высота", "Перестроения")
+        for label, results in self.engine_results.items():
+            values = [results[case] for case in cases]
+            axes[0].plot(labels, [size / measurement.median / 1000 for measurement, _, _ in values], marker="o", label=label)
+            axes[1].plot(labels, [height for _, height, _ in values], marker="o")
+            axes[2].plot(labels, [restructures for _, _, restructures in values], marker="o")
+        for ax, title in zip(axes, titles):
+            ax.set_title(title, fontsize=8)
+            ax.tick_params(labelsize=6)
+        self.engines_figure.legend(loc="upper center", ncol=6, fontsize=5)
+        self.engines_figure.tight_layout(rect=(0, 0, 1, 0.9))
+        self.engines_canvas.draw()
+
+    def run_disk_index_benchmark(self):
+        size_text = self.disk_size_input.text()
+        if not size_text.isdigit() or int(size_text) == 0:
+            QMessageBox.warning(self, "Ошибка", "Введите число ключей положительным целым числом")
+            return
+        size = int(size_text)
+        job = BenchmarkJob("индекс на диске", size, self.test_disk_index, (size,), return_value=True)
+        self.benchmark_output.clear()
+        self.engines_canvas.setVisible(False)
+        self.start_benchmark([job], self.add_disk_index_result)
+
+    def add_disk_index_result(self, result):
+        text = result.value if result.error is None else f"  Ошибка: {result.error}\n"
+        self.benchmark_output.append(f"Индекс из {result.job.size} ключей:\n{text}")
+
+    @staticmethod
+    def test_disk_index(size):
+        """AVLTree в памяти против DiskBPlusTree с малым и большим кешем страниц."""
+        times, memory, file_bytes = benchmark_disk_index(size)
+        result = f"  Файл индекса: {file_bytes // 1024} КБ\n"
+        for label, operations in times.items():
+            result += f"  {label}, память Python-объектов {memory[label] // 1024} КБ:\n"
+            for operation, measurement in operations.items():
+                result += f"    {operation}: {measurement}\n"
+        return result
+
+    @staticmethod
+    def test_set_operations(first_size, second_size, workers):
+        """Объединение, пересечение и разность через join против поэлементных insert_key/delete_key."""
+        key_range = 4 * (first_size + second_size) + 1
+        first_keys = sorted(random.sample(range(key_range), first_size))
+        second_keys = sorted(random.sample(range(key_range), second_size))
+
+        def make_trees():
+            return AVLTree(first_keys), AVLTree(second_keys)
+
+        def insert_each(first, second):
+            for key in second:
+                first.insert_key(key)
+
+        def delete_each(first, second):
+            for key in second:
+                first.delete_key(key)
+
+        cases = (
+            ("insert_key по одному ключу", insert_each),
+            ("union_update", lambda first, second: first.union_update(second)),
+            (f"union_update (потоков: {workers})", lambda first, second: first.union_update(second, workers)),
+            ("intersection_update", lambda first, second: first.intersection_update(second)),
+            ("delete_key по одному ключу", delete_each),
+            ("difference_update", lambda first, second: first.difference_update(second)),
+        )
+        result = ""
+        for label, function in cases:
+            result += f"  {label}: {measure(function, setup=make_trees)}\n"
+        return result
 
     def insert_element(self):
         try:
@@ -166,6 +261,19 @@ class TreesTabWidget(QWidget):
         except ValueError:
             QMessageBox.warning(self, "Ошибка", "Введите целое число")
 
+    def find_element(self):
+        try:
+            key = int(self.input_field.text())
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка", "Введите целое число")
+            return
+        rank = self.avl_tree.rank(key)
+        if self.avl_tree.contains(key):
+            message = f"Элемент {key} найден: {rank + 1}-й по возрастанию из {len(self.avl_tree)}"
+        else:
+            message = f"Элемента {key} нет в дереве; меньших элементов: {rank}"
+        QMessageBox.information(self, "Поиск", message)
+
     def update_tree_view(self):
         self.scene.clear()
         if self.avl_tree.root:
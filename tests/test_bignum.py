@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from main_window import bignum
+
+
+def test_ntt_primes_have_roots_of_max_size():
+    for prime, root in bignum.NTT_PRIMES:
+        assert (prime - 1) % bignum.NTT_MAX_SIZE == 0
+        w = pow(root, (prime - 1) // bignum.NTT_MAX_SIZE, prime)
+        assert pow(w, bignum.NTT_MAX_SIZE // 2, prime) == prime - 1
+
+
+def test_ntt_convolution_rejects_transform_longer_than_root_order(monkeypatch):
+    # 97 - 1 = 3 * 2**5: корня порядка 64 нет
+    monkeypatch.setattr(bignum, "NTT_PRIMES", ((97, 5), (193, 5)))
+    digits = [1] * 20
+    with pytest.raises(ValueError):
+        bignum.ntt_convolution(digits, digits)
+
+
+@pytest.mark.parametrize("bits", [2000, 5000, 100_000])
+def test_ntt_multiplication_above_size_limit(monkeypatch, bits):
+    monkeypatch.setattr(bignum, "NTT_MAX_SIZE", 64)
+    monkeypatch.setattr(bignum, "NTT_MAX_DIGITS", 20)
+    rng = random.Random(bits)
+    x = rng.getrandbits(bits)
+    y = rng.getrandbits(2 * bits // 3)
+    assert not bignum.ntt_fits(x, x)
+    assert bignum.limb_ntt_multiplication(x, -y) == -x * y
+    assert bignum.limb_ntt_multiplication(y, x) == x * y
+    assert bignum.limb_ntt_square(x) == x * x